@@ -0,0 +1,256 @@
+"""Measure how fast the web-app dashboards open in headless Chromium.
+
+Serves ``web-apps/`` from a local HTTP server and loads each
+``chNN/dashboard.html`` in a fresh browser context several times. The
+third-party scripts the pages load from CDNs (Plotly, Prism) are downloaded
+once into ``web-apps/.cache/vendor/`` and answered from there, and every
+other outside request (web fonts) is blocked, so a run measures the page and
+not the network. Per load it records:
+
+- ``parse_ms``: time spent in ``JSON.parse`` (payload, segments), and the
+  characters parsed,
+- ``first_chart_ms``: time from navigation start to the first Plotly chart
+  in the DOM,
+- ``dom_ready_ms`` and ``load_ms`` from the navigation timing,
+- ``long_tasks``, ``long_task_ms`` and ``tbt_ms`` (total blocking time:
+  the part of each long task over 50 ms) until the first chart has settled,
+- ``heap_mb``: live JS heap after a garbage collection.
+
+The median over ``--runs`` loads (after ``--warmup`` discarded ones) is
+printed next to the previous entry of the history file, and appended to it
+(``web-apps/.cache/bench/history.jsonl`` by default) with the git commit,
+the browser version and the settings, so a payload or template change can be
+judged on numbers.
+
+Usage:
+    python3 scripts/bench_dashboards.py                  # every dashboard, 5 runs
+    python3 scripts/bench_dashboards.py ch05 ch10 --runs 10
+    python3 scripts/bench_dashboards.py --cpu-throttle 4  # a slow laptop
+    python3 scripts/bench_dashboards.py --no-save        # do not add to history
+
+Needs Playwright and its Chromium (``pip install playwright`` then
+``playwright install chromium``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import re
+import statistics
+import subprocess
+import threading
+import urllib.request
+from datetime import datetime, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+WEB_APPS = ROOT / "web-apps"
+VENDOR_DIR = WEB_APPS / ".cache" / "vendor"
+HISTORY = WEB_APPS / ".cache" / "bench" / "history.jsonl"
+
+_EXTERNAL_SCRIPT = re.compile(r'<script src="(https://[^"]+)"')
+METRICS = ("parse_ms", "first_chart_ms", "dom_ready_ms", "load_ms",
+           "long_tasks", "long_task_ms", "tbt_ms", "heap_mb", "parse_kchars")
+
+# Installed before any page script runs: times JSON.parse, watches for the
+# first chart and collects long tasks.
+INIT_SCRIPT = """
+(() => {
+  const bench = window.__bench = {parseMs: 0, parseChars: 0, firstChart: null, longTasks: []};
+  const parse = JSON.parse;
+  JSON.parse = function (text, reviver) {
+    const t0 = performance.now();
+    try { return parse.call(this, text, reviver); }
+    finally { bench.parseMs += performance.now() - t0; bench.parseChars += String(text).length; }
+  };
+  new PerformanceObserver(list => {
+    for (const e of list.getEntries()) bench.longTasks.push(e.duration);
+  }).observe({type: "longtask", buffered: true});
+  new MutationObserver((records, observer) => {
+    if (document.querySelector(".main-svg")) {
+      bench.firstChart = performance.now();
+      observer.disconnect();
+    }
+  }).observe(document, {childList: true, subtree: true});
+})();
+"""
+
+COLLECT = """
+() => {
+  window.gc && window.gc();
+  const nav = performance.getEntriesByType("navigation")[0];
+  const b = window.__bench;
+  return {
+    parse_ms: b.parseMs,
+    parse_kchars: b.parseChars / 1000,
+    first_chart_ms: b.firstChart,
+    dom_ready_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    long_tasks: b.longTasks.length,
+    long_task_ms: b.longTasks.reduce((s, d) => s + d, 0),
+    tbt_ms: b.longTasks.reduce((s, d) => s + Math.max(0, d - 50), 0),
+    heap_mb: performance.memory.usedJSHeapSize / 1048576,
+  };
+}
+"""
+
+
+def discover() -> list[str]:
+    return sorted(p.parent.name for p in WEB_APPS.glob("ch[0-9][0-9]/dashboard.html"))
+
+
+def vendor(chapters: list[str]) -> dict[str, Path]:
+    """Local copies of the CDN scripts the dashboards load, fetched once."""
+    urls = set()
+    for chapter in chapters:
+        urls.update(_EXTERNAL_SCRIPT.findall(
+            (WEB_APPS / chapter / "dashboard.html").read_text(encoding="utf-8")))
+    local = {}
+    for url in sorted(urls):
+        path = VENDOR_DIR / url.split("://", 1)[1]
+        if not path.exists():
+            print(f"[vendor] {url}")
+            req = urllib.request.Request(url, headers={"User-Agent": "metricsai/1.0"})
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                body = resp.read()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+        local[url] = path
+    return local
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+def serve() -> ThreadingHTTPServer:
+    """``web-apps/`` over HTTP on a free local port, in a background thread."""
+    handler = functools.partial(_QuietHandler, directory=str(WEB_APPS))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_once(browser, url: str, local: dict[str, Path], throttle: float, timeout: float) -> dict:
+    """Open ``url`` in a new context (cold cache) and read the page's metrics."""
+    context = browser.new_context()
+    origin = url.split("/", 3)[:3]
+
+    def route(r) -> None:
+        if r.request.url in local:
+            r.fulfill(path=str(local[r.request.url]), content_type="application/javascript")
+        elif r.request.url.split("/", 3)[:3] == origin:
+            r.continue_()
+        else:
+            r.abort()
+
+    try:
+        context.route("**/*", route)
+        context.add_init_script(INIT_SCRIPT)
+        page = context.new_page()
+        if throttle > 1:
+            cdp = context.new_cdp_session(page)
+            cdp.send("Emulation.setCPUThrottlingRate", {"rate": throttle})
+        page.goto(url, wait_until="load", timeout=timeout)
+        page.wait_for_function("window.__bench.firstChart !== null", timeout=timeout)
+        # Let the work the first chart triggers finish, so its long tasks count.
+        page.wait_for_timeout(500)
+        return page.evaluate(COLLECT)
+    finally:
+        context.close()
+
+
+def git_commit() -> dict:
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], capture_output=True, text=True, cwd=ROOT).stdout.strip()
+
+    return {"commit": git("rev-parse", "--short", "HEAD"),
+            "dirty": bool(git("status", "--porcelain", "--", "web-apps"))}
+
+
+def load_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def print_table(results: dict, previous: dict | None) -> None:
+    cols = ("parse_ms", "first_chart_ms", "tbt_ms", "long_tasks", "heap_mb")
+    print(f"{'chapter':<9}" + "".join(f"{c:>22}" for c in cols))
+    for chapter, stats in results.items():
+        cells = []
+        for c in cols:
+            cell = f"{stats[c]:.1f}"
+            old = (previous or {}).get(chapter, {}).get(c)
+            if old:
+                cell += f" ({(stats[c] - old) / old:+.0%})"
+            cells.append(f"{cell:>22}")
+        print(f"{chapter:<9}" + "".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("chapters", nargs="*", help="chapters to load (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="measured loads per dashboard (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="discarded loads first (default: 1)")
+    parser.add_argument("--cpu-throttle", type=float, default=1,
+                        help="CPU slowdown factor, e.g. 4 for a low-end laptop (default: none)")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for a page")
+    parser.add_argument("--history", type=Path, default=HISTORY, help="JSONL file of past results")
+    parser.add_argument("--label", default="", help="note stored with this entry")
+    parser.add_argument("--no-save", action="store_true", help="do not append to the history")
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        raise SystemExit("Playwright is required: pip install playwright && playwright install chromium")
+
+    chapters = discover()
+    unknown = sorted(set(args.chapters) - set(chapters))
+    if unknown:
+        raise SystemExit(f"Unknown chapter(s) or missing dashboard.html: {', '.join(unknown)}")
+    if args.chapters:
+        chapters = [c for c in chapters if c in args.chapters]
+
+    local = vendor(chapters)
+    server = serve()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    results = {}
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(args=["--enable-precise-memory-info", "--js-flags=--expose-gc"])
+            version = browser.version
+            for chapter in chapters:
+                url = f"{base}/{chapter}/dashboard.html"
+                runs = [load_once(browser, url, local, args.cpu_throttle, args.timeout * 1000)
+                        for _ in range(args.warmup + args.runs)][args.warmup:]
+                results[chapter] = {m: statistics.median(r[m] for r in runs) for m in METRICS}
+                results[chapter]["first_chart_min_ms"] = min(r["first_chart_ms"] for r in runs)
+                print(f"[ok] {chapter}: first chart {results[chapter]['first_chart_ms']:.0f} ms, "
+                      f"JSON.parse {results[chapter]['parse_ms']:.1f} ms")
+            browser.close()
+    finally:
+        server.shutdown()
+
+    settings = {"browser": version, "runs": args.runs, "cpu_throttle": args.cpu_throttle}
+    history = load_history(args.history)
+    # Compare with the last entry measured the same way.
+    previous = next((h["results"] for h in reversed(history)
+                     if all(h.get(k) == v for k, v in settings.items())), None)
+    print_table(results, previous)
+    if not args.no_save:
+        entry = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                 **git_commit(), **settings, "label": args.label, "results": results}
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"[saved] {args.history}")
+
+
+if __name__ == "__main__":
+    main()
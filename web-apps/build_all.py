@@ -0,0 +1,391 @@
+"""Rebuild the chapter dashboards that are out of date, in parallel.
+
+Discovers every ``chNN/build.py`` and works out what each chapter depends on:
+
+- its ``build.py`` and ``template.html``,
+- every file under ``data/`` whose name appears as a string literal in the
+  build script (``"AED_HOUSE.DTA"``, ``"mendez2020_convergence.csv"``, ...),
+- the ``common/`` modules it imports, followed through their own imports,
+- the ``data/`` file behind each shared bundle the build script passes to
+  ``ref()`` or ``frame()`` (``common/bundles.py``'s ``BUNDLES``),
+- the ``common/js/`` files its ``shared_js()`` call can ship.
+
+A content digest of each input is recorded in ``web-apps/.cache/builds.json``
+after a successful build, together with a digest of the ``dashboard.html``
+it wrote. A chapter is stale when any input digest differs, when it has no
+record, or when its dashboard is missing or was edited by hand. Stale chapters
+run as separate ``build.py`` processes, up to ``--jobs`` at a time. Touching
+one dataset therefore rebuilds only the chapters that read it.
+
+Shared data bundles (``common/bundles.py``) are written to ``web-apps/bundles``
+by the builds; a chapter is also stale if a bundle its dashboard loads is
+missing. After a run, bundle files no dashboard refers to are deleted.
+``--inline`` embeds the bundles in each dashboard instead, for single-file
+offline copies. Templates are minified as they are written
+(``common/render.py``); a change of ``METRICSAI_MINIFY`` also makes a
+chapter stale.
+
+After a run every dashboard's bytes are broken down by template section
+(markup, style, inline script, payload, segments, inline bundles) and by
+top-level payload key, raw and gzipped, into
+``web-apps/.cache/payload_report.json``; ``--report`` prints the breakdown.
+``web-apps/budgets.json`` caps them: ``page_kb``, ``gzip_kb``, ``payload_kb``
+and per-key ``keys`` limits, plus ``growth``, the largest fractional increase
+of a page over its last accepted build. A ``default`` entry applies to every
+chapter and ``chapters`` overrides it. A dashboard over budget fails the run
+and stays stale until it fits; ``--allow-growth`` accepts an intended
+increase.
+
+Usage:
+    python3 web-apps/build_all.py              # rebuild what is stale
+    python3 web-apps/build_all.py ch05 ch10    # limit to some chapters
+    python3 web-apps/build_all.py --dry-run    # list stale chapters and why
+    python3 web-apps/build_all.py --force      # rebuild everything
+    python3 web-apps/build_all.py --inline     # self-contained dashboards
+    python3 web-apps/build_all.py --report     # bytes by section and payload key
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import gzip
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+DATA_DIR = ROOT / "data"
+COMMON_DIR = HERE / "common"
+BUNDLE_DIR = HERE / "bundles"
+MANIFEST = HERE / ".cache" / "builds.json"
+REPORT = HERE / ".cache" / "payload_report.json"
+BUDGETS = HERE / "budgets.json"
+
+_DATA_NAME = re.compile(r"""["']([\w.-]+\.(?:DTA|dta|csv))["']""")
+_COMMON_IMPORT = re.compile(r"^\s*from\s+common(?:\.(\w+))?\s+import\s+([\w, ]+)", re.M)
+_RELATIVE_IMPORT = re.compile(r"^\s*from\s+\.(\w+)\s+import", re.M)
+_BUNDLE_USE = re.compile(r"""\b(?:ref|frame)\(\s*["'](\w+)["']""")
+_SHARED_JS = re.compile(r"\bshared_js\(([^)]*)\)")
+_BUNDLE_SRC = re.compile(r'<script src="\.\./bundles/([\w.-]+\.js)"></script>')
+_SECTION = re.compile(r"<script\b([^>]*)>(.*?)</script>|<style\b[^>]*>.*?</style>", re.S | re.I)
+_DATA_ID = re.compile(r'id="[\w-]*data"')
+
+
+def digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def discover() -> list[str]:
+    """Chapter directories with a build script, in order."""
+    return sorted(p.parent.name for p in HERE.glob("ch[0-9][0-9]/build.py"))
+
+
+def _common_closure(names: set[str]) -> set[str]:
+    """``common`` modules in ``names`` plus everything they import relatively."""
+    seen, todo = set(), list(names)
+    while todo:
+        name = todo.pop()
+        path = COMMON_DIR / f"{name}.py"
+        if name in seen or not path.exists():
+            continue
+        seen.add(name)
+        todo.extend(_RELATIVE_IMPORT.findall(path.read_text(encoding="utf-8")))
+    return seen
+
+
+@functools.lru_cache(maxsize=None)
+def bundle_sources() -> dict[str, Path]:
+    """The ``data/`` file behind each shared bundle."""
+    sys.path.insert(0, str(HERE))
+    from common.bundles import BUNDLES, source
+
+    return {name: source(name) for name in BUNDLES}
+
+
+def inputs(chapter: str) -> list[Path]:
+    """Every file the chapter's dashboard is built from."""
+    src_dir = HERE / chapter
+    build = src_dir / "build.py"
+    source = build.read_text(encoding="utf-8")
+    modules = set()
+    for module, names in _COMMON_IMPORT.findall(source):
+        modules.update([module] if module else [n.strip() for n in names.split(",")])
+    common = {COMMON_DIR / f"{m}.py" for m in _common_closure(modules)}
+    data = {DATA_DIR / name for name in _DATA_NAME.findall(source)}
+    bundles = set(_BUNDLE_USE.findall(source))
+    if bundles:
+        sources = bundle_sources()
+        data.update(sources[name] for name in bundles if name in sources)
+    data = {path for path in data if path.is_file()}
+    js = set()
+    for args in _SHARED_JS.findall(source):
+        names = ["load", "decode", *re.findall(r"""["'](\w+)["']""", args)]
+        js.update(COMMON_DIR / "js" / f"{name}.js" for name in names)
+    return [build, src_dir / "template.html", *sorted(data), *sorted(common), *sorted(js)]
+
+
+def bundles_used(chapter: str) -> set[str]:
+    """Bundle files the chapter's dashboard loads by ``<script src>``."""
+    out = HERE / chapter / "dashboard.html"
+    if not out.exists():
+        return set()
+    return set(_BUNDLE_SRC.findall(out.read_text(encoding="utf-8")))
+
+
+def prune_bundles() -> list[str]:
+    """Delete bundle files that no dashboard loads any more."""
+    if not BUNDLE_DIR.is_dir():
+        return []
+    used = set().union(*(bundles_used(c) for c in discover()))
+    stale = sorted(p for p in BUNDLE_DIR.glob("*.js") if p.name not in used)
+    for path in stale:
+        path.unlink()
+    return [p.name for p in stale]
+
+
+def _rel(path: Path) -> str:
+    return path.relative_to(ROOT).as_posix()
+
+
+def load_manifest() -> dict:
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    return {}
+
+
+def save_manifest(manifest: dict) -> None:
+    MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, MANIFEST)
+
+
+def staleness(chapter: str, record: dict | None, inline: bool = False) -> tuple[dict, list[str]]:
+    """Current input digests and the reasons (if any) the chapter needs a rebuild."""
+    current = {_rel(p): digest(p) for p in inputs(chapter)}
+    current["bundles"] = "inline" if inline else "shared"
+    current["minify"] = "off" if os.environ.get("METRICSAI_MINIFY", "1") == "0" else "on"
+    out = HERE / chapter / "dashboard.html"
+    if record is None:
+        return current, ["no build record"]
+    modes = {"bundles": "bundle mode", "minify": "minification"}
+    reasons = [f"{modes[k]} now {v}" if k in modes else f"changed {k}"
+               for k, v in current.items() if record["inputs"].get(k) != v]
+    reasons += [f"no longer uses {k}" for k in record["inputs"] if k not in current]
+    if record.get("over_budget"):
+        reasons.append("over budget at last build")
+    if not out.exists():
+        reasons.append("dashboard.html missing")
+    elif digest(out) != record.get("output"):
+        reasons.append("dashboard.html edited since last build")
+    reasons += [f"bundle {name} missing" for name in sorted(bundles_used(chapter))
+                if not (BUNDLE_DIR / name).exists()]
+    return current, reasons
+
+
+def _sizes(text: str) -> dict:
+    raw = text.encode("utf-8")
+    return {"raw": len(raw), "gzip": len(gzip.compress(raw, compresslevel=9, mtime=0))}
+
+
+def payload_report(chapter: str) -> dict:
+    """Bytes of a dashboard by template section and by top-level payload key.
+
+    Sections are ``markup``, ``style``, ``script`` (inline code), ``payload``
+    (the JSON data block), ``segments`` (other JSON blocks, see
+    ``common/segments.py``) and ``bundles`` (inline bundle scripts). Shared
+    bundle files the page loads are listed under ``shared`` and are not part
+    of the page total. Each entry has ``raw`` and ``gzip`` byte counts; a key's gzip size is for the key on its
+    own, so those do not add up to the payload's.
+    """
+    html = (HERE / chapter / "dashboard.html").read_text(encoding="utf-8")
+    parts: dict[str, list[str]] = {s: [] for s in
+                                   ("markup", "style", "script", "payload", "segments", "bundles")}
+    keys = {}
+    pos = 0
+    for m in _SECTION.finditer(html):
+        parts["markup"].append(html[pos:m.start()])
+        pos = m.end()
+        attrs, body = m.group(1), m.group(2)
+        if attrs is None:
+            parts["style"].append(m.group(0))
+        elif "application/json" in attrs and _DATA_ID.search(attrs):
+            parts["payload"].append(m.group(0))
+            data = json.loads(body)
+            if isinstance(data, dict):
+                keys = {k: _sizes(json.dumps(v, separators=(",", ":"), ensure_ascii=False))
+                        for k, v in data.items()}
+        elif "application/json" in attrs:
+            parts["segments"].append(m.group(0))
+        elif body.startswith("(window.METRICSAI_BUNDLES"):
+            parts["bundles"].append(m.group(0))
+        elif "src=" not in attrs:
+            parts["script"].append(m.group(0))
+        else:
+            parts["markup"].append(m.group(0))
+    parts["markup"].append(html[pos:])
+    return {
+        "page": _sizes(html),
+        "sections": {s: _sizes("".join(texts)) for s, texts in parts.items() if texts},
+        "keys": dict(sorted(keys.items(), key=lambda kv: -kv[1]["raw"])),
+        "shared": {name: _sizes((BUNDLE_DIR / name).read_text(encoding="utf-8"))
+                   for name in sorted(bundles_used(chapter)) if (BUNDLE_DIR / name).exists()},
+    }
+
+
+def load_budgets() -> dict:
+    """Per-chapter size budgets: ``default`` merged with the chapter's own entry."""
+    if not BUDGETS.exists():
+        return {}
+    spec = json.loads(BUDGETS.read_text(encoding="utf-8"))
+    return {c: {**spec.get("default", {}), **spec.get("chapters", {}).get(c, {})}
+            for c in discover()}
+
+
+def over_budget(report: dict, budget: dict, previous: int | None = None) -> list[str]:
+    """The ways ``report`` breaks ``budget``; ``previous`` is the last page size."""
+    def kb(n: int) -> str:
+        return f"{n / 1024:.1f} KB"
+
+    problems = []
+    for name, size in (("page_kb", report["page"]["raw"]), ("gzip_kb", report["page"]["gzip"]),
+                       ("payload_kb", report["sections"].get("payload", {}).get("raw", 0))):
+        if name in budget and size > budget[name] * 1024:
+            problems.append(f"{name[:-3]} {kb(size)} > {budget[name]} KB")
+    for key, limit in budget.get("keys", {}).items():
+        size = report["keys"].get(key, {}).get("raw", 0)
+        if size > limit * 1024:
+            problems.append(f"payload key {key!r} {kb(size)} > {limit} KB")
+    growth = budget.get("growth")
+    if growth is not None and previous:
+        ratio = report["page"]["raw"] / previous - 1
+        if ratio > growth:
+            problems.append(f"page grew {ratio:.0%} ({kb(previous)} -> {kb(report['page']['raw'])}), "
+                            f"more than {growth:.0%}")
+    return problems
+
+
+def print_report(chapter: str, report: dict, top: int = 8) -> None:
+    def row(label: str, size: dict) -> None:
+        print(f"  {label:<36}{size['raw'] / 1024:>9.1f}{size['gzip'] / 1024:>9.1f}")
+
+    print(f"[size] {chapter:<35}{'KB':>9}{'gzip KB':>9}")
+    row("page", report["page"])
+    for name, size in report["sections"].items():
+        row(name, size)
+        if name == "payload":
+            for key, ksize in list(report["keys"].items())[:top]:
+                row(f"  .{key}", ksize)
+            if len(report["keys"]) > top:
+                print(f"    ... {len(report['keys']) - top} more keys")
+    for name, size in report["shared"].items():
+        row(f"shared {name}", size)
+
+
+def run_build(chapter: str, inline: bool = False) -> tuple[str, int, float, str]:
+    """Run one chapter's build script in its own process."""
+    start = time.perf_counter()
+    env = dict(os.environ, METRICSAI_INLINE_BUNDLES="1" if inline else "0")
+    proc = subprocess.run([sys.executable, str(HERE / chapter / "build.py")],
+                          capture_output=True, text=True, cwd=ROOT, env=env)
+    return chapter, proc.returncode, time.perf_counter() - start, proc.stdout + proc.stderr
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("chapters", nargs="*", help="chapters to consider (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="parallel builds (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="list stale chapters without building")
+    parser.add_argument("--inline", action="store_true",
+                        help="embed shared data bundles in each dashboard (single-file mode)")
+    parser.add_argument("--report", action="store_true",
+                        help="print each dashboard's bytes by section and payload key")
+    parser.add_argument("--allow-growth", action="store_true",
+                        help="accept dashboards that grew past the budget's growth limit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each build's output")
+    args = parser.parse_args()
+
+    chapters = discover()
+    unknown = sorted(set(args.chapters) - set(chapters))
+    if unknown:
+        raise SystemExit(f"Unknown chapter(s): {', '.join(unknown)}")
+    if args.chapters:
+        chapters = [c for c in chapters if c in args.chapters]
+
+    manifest = load_manifest()
+    todo, digests = [], {}
+    for chapter in chapters:
+        digests[chapter], reasons = staleness(chapter, manifest.get(chapter), args.inline)
+        if args.force:
+            reasons = reasons or ["--force"]
+        if reasons:
+            todo.append(chapter)
+            print(f"[stale] {chapter}: {'; '.join(reasons)}")
+    print(f"[plan] {len(todo)} of {len(chapters)} dashboards to rebuild")
+    if args.dry_run:
+        return
+
+    budgets = load_budgets()
+    reports: dict[str, dict] = {}
+    failed, over = [], []
+    if todo:
+        start = time.perf_counter()
+        # Threads only wait on the build subprocesses, which do the work in parallel.
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            for future in as_completed([pool.submit(run_build, c, args.inline) for c in todo]):
+                chapter, code, secs, output = future.result()
+                if code != 0:
+                    failed.append(chapter)
+                    print(f"[fail] {chapter} (exit {code})\n{output.rstrip()}")
+                    continue
+                print(f"[ok] {chapter} ({secs:.1f}s)")
+                if args.verbose:
+                    print(output.rstrip())
+                reports[chapter] = report = payload_report(chapter)
+                previous = None if args.allow_growth else manifest.get(chapter, {}).get("bytes")
+                problems = over_budget(report, budgets.get(chapter, {}), previous)
+                record = {"inputs": digests[chapter],
+                          "output": digest(HERE / chapter / "dashboard.html"),
+                          "bytes": report["page"]["raw"]}
+                if problems:
+                    # Keeps the chapter stale, and its last accepted size, until it fits.
+                    over.append(chapter)
+                    print(f"[over budget] {chapter}: {'; '.join(problems)}")
+                    record.update(over_budget=problems, bytes=manifest.get(chapter, {}).get("bytes"))
+                manifest[chapter] = record
+                save_manifest(manifest)
+        print(f"[done] {len(todo) - len(failed)} built, {len(failed)} failed in {time.perf_counter() - start:.1f}s")
+        for name in prune_bundles():
+            print(f"[prune] bundles/{name}")
+
+    # Up-to-date dashboards are held to the budgets too, in case those changed.
+    for chapter in chapters:
+        if chapter in reports or chapter in failed or not (HERE / chapter / "dashboard.html").exists():
+            continue
+        reports[chapter] = payload_report(chapter)
+        problems = over_budget(reports[chapter], budgets.get(chapter, {}))
+        if problems:
+            over.append(chapter)
+            print(f"[over budget] {chapter}: {'; '.join(problems)}")
+    if args.report:
+        for chapter in sorted(reports):
+            print_report(chapter, reports[chapter])
+    saved = json.loads(REPORT.read_text(encoding="utf-8")) if REPORT.exists() else {}
+    REPORT.parent.mkdir(parents=True, exist_ok=True)
+    REPORT.write_text(json.dumps(dict(sorted({**saved, **reports}.items())), indent=1), encoding="utf-8")
+    if failed or over:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+(window.METRICSAI_BUNDLES = window.METRICSAI_BUNDLES || {})["aed_earnings"] = {"earnings":[25000,40000,25000,38000,28800,31000,25000,20000,83000,10800,22000,24000,15000,19000,25000,105000,25000,36000,23000,75000,85000,60000,24000,20000,85000,62000,16000,13000,20000,39000,41000,32000,42000,45500,33000,40000,71000,29300,24000,38000,24500,32000,25000,40000,54000,19000,44800,53000,45000,17000,27000,36000,42000,24000,25000,21500,41000,27000,45000,9000,30000,30000,72000,50000,12000,32000,24000,65000,39000,54000,28000,56000,33720,30000,42000,47000,60000,25000,43000,27000,12000,24000,110000,45000,45000,84000,28000,34000,36000,41000,1050,24000,42000,28000,40800,38000,17000,28000,97000,10000,42000,75000,31000,80000,14900,90000,80000,140000,36000,65000,45000,24500,32000,27000,67000,40000,30000,20000,68000,30000,16000,28000,78000,85000,65000,21100,172000,30000,39000,37000,55000,45300,83000,47700,45000,58000,40000,25000,38000,48000,20000,84000,35000,25000,110000,80000,40000,22000,27000,20000,14000,12000,12000,30000,15600,32000,50000,68000,37500,75000,15000,24000,50000,40000,26200,85000,75000,30000,12000,40000,30000],"education":[14,12,13,13,12,16,12,12,16,3,12,11,12,13,9,16,14,12,13,16,20,13,13,14,13,16,13,13,13,12,16,16,12,18,16,16,16,12,16,16,12,16,13,16,18,12,16,12,16,13,14,13,16,12,14,14,16,16,18,14,16,13,16,13,13,13,12,18,16,18,12,18,16,18,13,18,14,12,16,13,12,14,20,16,18,18,13,14,11,14,11,12,18,16,18,12,9,13,20,6,12,16,12,18,12,18,18,16,12,18,16,12,6,14,13,16,13,12,14,12,16,16,16,16,13,14,18,14,18,20,18,18,16,18,13,16,18,13,18,18,12,18,12,12,14,16,12,16,12,12,14,13,12,13,13,16,18,16,12,18,12,12,18,14,12,16,18,18,13,16,12],"age":[30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30],"gender":[0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0]};
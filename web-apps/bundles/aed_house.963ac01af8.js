@@ -0,0 +1 @@
+(window.METRICSAI_BUNDLES = window.METRICSAI_BUNDLES || {})["aed_house"] = {"price":[204000,212000,213000,220000,224500,229000,230000,233000,235000,235000,236500,238000,239500,241000,244000,245000,249000,253000,255000,258500,270000,270000,272000,273000,278500,279900,310000,340000,375000],"size":[1400,1600,1800,1600,2100,1700,2100,1700,1700,1600,1600,1900,1600,1600,2000,1400,1900,2100,1500,1600,1800,2000,1800,1900,2600,2000,2300,2400,3300],"bedrooms":[3,3,3,3,4,4,4,3,4,3,3,4,3,4,4,4,4,4,4,3,4,4,4,5,6,4,4,4,4],"bathrooms":[2.0,3.0,2.0,2.0,2.5,2.5,2.0,2.0,2.0,2.0,2.0,2.0,2.0,2.0,2.0,2.0,3.0,2.0,2.0,2.0,2.0,2.5,2.5,2.0,2.0,2.0,2.5,3.0,2.5],"lotsize":[1,2,2,1,2,2,2,1,2,3,3,2,3,2,1,2,3,3,3,1,3,3,2,2,3,2,2,2,2],"age":[31.0,33.0,51.0,49.0,47.0,35.0,34.0,40.0,29.0,35.0,23.0,29.0,34.0,34.0,29.0,30.0,37.0,47.0,47.0,39.0,31.0,39.0,46.0,37.0,38.0,31.0,28.0,34.0,39.0],"monthsold":[7,5,4,4,6,3,8,6,7,5,8,7,6,8,7,8,6,6,7,8,3,5,3,7,8,7,5,6,3]};
@@ -0,0 +1 @@
+(window.METRICSAI_BUNDLES = window.METRICSAI_BUNDLES || {})["aed_realgdppc"] = {"dates":["1959-01-01","1959-04-01","1959-07-01","1959-10-01","1960-01-01","1960-04-01","1960-07-01","1960-10-01","1961-01-01","1961-04-01","1961-07-01","1961-10-01","1962-01-01","1962-04-01","1962-07-01","1962-10-01","1963-01-01","1963-04-01","1963-07-01","1963-10-01","1964-01-01","1964-04-01","1964-07-01","1964-10-01","1965-01-01","1965-04-01","1965-07-01","1965-10-01","1966-01-01","1966-04-01","1966-07-01","1966-10-01","1967-01-01","1967-04-01","1967-07-01","1967-10-01","1968-01-01","1968-04-01","1968-07-01","1968-10-01","1969-01-01","1969-04-01","1969-07-01","1969-10-01","1970-01-01","1970-04-01","1970-07-01","1970-10-01","1971-01-01","1971-04-01","1971-07-01","1971-10-01","1972-01-01","1972-04-01","1972-07-01","1972-10-01","1973-01-01","1973-04-01","1973-07-01","1973-10-01","1974-01-01","1974-04-01","1974-07-01","1974-10-01","1975-01-01","1975-04-01","1975-07-01","1975-10-01","1976-01-01","1976-04-01","1976-07-01","1976-10-01","1977-01-01","1977-04-01","1977-07-01","1977-10-01","1978-01-01","1978-04-01","1978-07-01","1978-10-01","1979-01-01","1979-04-01","1979-07-01","1979-10-01","1980-01-01","1980-04-01","1980-07-01","1980-10-01","1981-01-01","1981-04-01","1981-07-01","1981-10-01","1982-01-01","1982-04-01","1982-07-01","1982-10-01","1983-01-01","1983-04-01","1983-07-01","1983-10-01","1984-01-01","1984-04-01","1984-07-01","1984-10-01","1985-01-01","1985-04-01","1985-07-01","1985-10-01","1986-01-01","1986-04-01","1986-07-01","1986-10-01","1987-01-01","1987-04-01","1987-07-01","1987-10-01","1988-01-01","1988-04-01","1988-07-01","1988-10-01","1989-01-01","1989-04-01","1989-07-01","1989-10-01","1990-01-01","1990-04-01","1990-07-01","1990-10-01","1991-01-01","1991-04-01","1991-07-01","1991-10-01","1992-01-01","1992-04-01","1992-07-01","1992-10-01","1993-01-01","1993-04-01","1993-07-01","1993-10-01","1994-01-01","1994-04-01","1994-07-01","1994-10-01","1995-01-01","1995-04-01","1995-07-01","1995-10-01","1996-01-01","1996-04-01","1996-07-01","1996-10-01","1997-01-01","1997-04-01","1997-07-01","1997-10-01","1998-01-01","1998-04-01","1998-07-01","1998-10-01","1999-01-01","1999-04-01","1999-07-01","1999-10-01","2000-01-01","2000-04-01","2000-07-01","2000-10-01","2001-01-01","2001-04-01","2001-07-01","2001-10-01","2002-01-01","2002-04-01","2002-07-01","2002-10-01","2003-01-01","2003-04-01","2003-07-01","2003-10-01","2004-01-01","2004-04-01","2004-07-01","2004-10-01","2005-01-01","2005-04-01","2005-07-01","2005-10-01","2006-01-01","2006-04-01","2006-07-01","2006-10-01","2007-01-01","2007-04-01","2007-07-01","2007-10-01","2008-01-01","2008-04-01","2008-07-01","2008-10-01","2009-01-01","2009-04-01","2009-07-01","2009-10-01","2010-01-01","2010-04-01","2010-07-01","2010-10-01","2011-01-01","2011-04-01","2011-07-01","2011-10-01","2012-01-01","2012-04-01","2012-07-01","2012-10-01","2013-01-01","2013-04-01","2013-07-01","2013-10-01","2014-01-01","2014-04-01","2014-07-01","2014-10-01","2015-01-01","2015-04-01","2015-07-01","2015-10-01","2016-01-01","2016-04-01","2016-07-01","2016-10-01","2017-01-01","2017-04-01","2017-07-01","2017-10-01","2018-01-01","2018-04-01","2018-07-01","2018-10-01","2019-01-01","2019-04-01","2019-07-01","2019-10-01","2020-01-01"],"realgdppc":[17733.26,18063.82,17999.76,17972.02,18267.26,18060.56,18058.1,17756.37,17816.17,18048.6,18318.67,18597.79,18862.28,18967.36,19125.99,19111.7,19256.43,19410.03,19760.5,19814.47,20168.85,20323.96,20566.38,20557.53,20996.88,21204.37,21604.23,22029.83,22510.84,22528.19,22649.5,22765.92,22911.0,22868.21,23020.45,23128.65,23550.12,23890.08,24009.21,24038.94,24365.21,24382.75,24475.58,24284.99,24188.87,24148.0,24288.18,23944.42,24519.37,24580.55,24707.22,24689.33,25083.52,25592.11,25766.97,26129.08,26718.19,26949.2,26740.36,26929.15,26642.24,26648.46,26329.47,26159.59,25789.04,25911.03,26277.24,26562.72,27101.09,27242.57,27321.04,27446.67,27706.05,28177.11,28605.02,28524.47,28548.66,29577.21,29787.32,30099.53,30077.54,30031.08,30162.21,30144.45,30154.62,29450.48,29328.07,29793.82,30315.69,30023.5,30300.07,29891.45,29364.72,29433.71,29246.82,29186.13,29510.69,30120.29,30646.84,31213.07,31762.51,32245.89,32477.84,32664.5,32920.18,33139.94,33559.66,33724.82,33972.27,34052.96,34294.63,34396.07,34585.22,34884.58,35100.37,35615.03,35728.11,36122.06,36239.13,36630.39,36929.01,37126.91,37299.3,37271.14,37593.1,37612.41,37504.68,37032.46,36745.59,36914.1,36969.03,36970.91,37303.87,37582.84,37814.73,38077.56,38028.66,38134.67,38185.8,38581.96,38852.07,39263.41,39365.38,39694.69,39729.28,39734.98,39944.03,40092.34,40291.83,40847.77,41080.32,41374.54,41531.82,42101.34,42487.31,42718.52,43035.26,43314.98,43721.05,44293.35,44599.3,44820.19,45262.79,45894.25,45944.03,46669.27,46604.66,46771.0,46531.04,46693.24,46377.72,46386.14,46689.78,46868.59,46957.63,46915.86,47078.19,47377.96,48062.93,48498.73,48663.13,48926.9,49267.11,49637.1,50080.48,50204.24,50523.0,50714.79,51276.73,51281.22,51227.98,51532.44,51539.5,51718.78,51865.96,52049.19,51636.68,51789.66,51384.03,50154.64,49491.08,49318.17,49384.07,49811.22,49903.22,50272.32,50544.69,50698.4,50494.66,50772.68,50660.1,51149.56,51468.39,51606.72,51577.98,51539.05,51920.64,51905.62,52211.98,52526.48,52292.7,52912.74,53452.49,53646.52,53982.6,54294.77,54367.68,54279.38,54464.35,54632.94,54826.94,55004.87,55240.33,55458.43,55806.21,56210.34,56502.69,56926.64,57257.65,57336.43,57718.67,57945.78,58166.55,58392.45,57589.3],"growth":[null,null,null,null,3.0113,-0.018,0.3241,-1.1999,-2.4694,-0.0662,1.443,4.7387,5.8717,5.0905,4.4071,2.7633,2.0896,2.3339,3.3175,3.6772,4.7383,4.7086,4.0783,3.7501,4.1055,4.3319,5.0463,7.1619,7.2104,6.2431,4.8383,3.3413,1.7776,1.5093,1.6378,1.5933,2.7896,4.4685,4.2952,3.9358,3.4611,2.0622,1.9425,1.0236,-0.7237,-0.9627,-0.7657,-1.4024,1.3663,1.7912,1.7253,3.111,2.3009,4.1153,4.2892,5.8315,6.5169,5.3028,3.7777,3.062,-0.2843,-1.1159,-1.5366,-2.8577,-3.2024,-2.7672,-0.1984,1.541,5.0876,5.1389,3.9723,3.3278,2.2322,3.4304,4.6996,3.9269,3.0412,4.9689,4.1332,5.5218,5.3554,1.5345,1.2586,0.1493,0.2563,-1.9333,-2.7655,-1.1632,0.5342,1.9457,3.3142,0.3277,-3.1369,-1.9644,-3.4761,-2.3596,0.4971,2.3326,4.7869,6.9449,7.6305,7.057,5.9745,4.6501,3.6447,2.7726,3.3309,3.2461,3.1959,2.755,2.19,1.9904,1.8043,2.4422,2.3495,3.5439,3.3046,3.5474,3.2443,2.851,3.3612,2.7818,2.9255,1.7492,1.7983,1.3077,0.5506,-0.6404,-2.2544,-1.8566,-1.4282,-0.1662,1.5193,1.8116,2.2876,2.9933,1.943,1.4683,0.9813,1.3247,2.1652,2.9599,3.089,2.8841,2.2578,1.201,1.4699,1.0018,1.416,2.8005,2.8447,3.1981,3.0775,3.0689,3.425,3.2483,3.62,2.8826,2.9038,3.6865,3.6343,3.475,3.5263,3.6143,3.0151,4.1256,2.9646,1.9104,1.2777,0.0514,-0.4869,-0.8229,0.3411,0.3755,1.2504,1.142,0.8319,1.0868,2.3538,3.3739,3.3666,3.2693,2.5054,2.3472,2.9126,2.6107,2.5492,2.1711,2.3887,2.1452,1.3954,1.6123,0.5124,0.8532,1.2454,1.0028,0.1886,0.1371,-0.9292,-3.6399,-4.1552,-4.7722,-3.8922,-0.6847,0.8327,1.9347,2.3502,1.7811,1.1852,0.9953,0.2283,0.8899,1.9284,1.6427,1.8118,0.7615,0.8787,0.5792,1.2292,1.9159,0.7166,1.9403,2.3759,2.1323,3.2316,2.6119,1.7122,1.1797,0.8924,0.6228,0.8447,1.3366,1.4247,1.511,1.7861,2.1916,2.2852,2.6474,2.6009,2.0033,2.1521,1.7903,1.5874,1.8418,-0.2241]};
@@ -0,0 +1 @@
+(window.METRICSAI_BUNDLES = window.METRICSAI_BUNDLES || {})["convergence_2014"] = {"country":["Albania","Algeria","Argentina","Armenia","Australia","Austria","Bangladesh","Belgium","Benin","Bolivia","Brazil","Bulgaria","Burundi","Cambodia","Cameroon","Canada","Central African Republic","Chile","China","Colombia","Congo","Costa Rica","Cote d'Ivoire","Croatia","Czech Republic","Democratic Republic of Congo","Denmark","Dominican Republic","Ecuador","Egypt","El Salvador","Estonia","Finland","France","Germany","Ghana","Greece","Guatemala","Haiti","Honduras","Hong Kong","Hungary","India","Indonesia","Iran","Ireland","Israel","Italy","Jamaica","Japan","Kazakhstan","Kenya","Kyrgyz Republic","Latvia","Lithuania","Malawi","Malaysia","Mali","Mexico","Mongolia","Morocco","Mozambique","Myanmar","Nepal","Netherlands","New Zealand","Nicaragua","Niger","Norway","Pakistan","Panama","Paraguay","Peru","Philippines","Poland","Portugal","Romania","Russia","Rwanda","Saudi Arabia","Senegal","Sierra Leone","Singapore","Slovak Republic","Slovenia","South Africa","South Korea","Spain","Sri Lanka","Sudan","Sweden","Switzerland","Taiwan","Tajikistan","Tanzania","Thailand","Togo","Tunisia","Turkey","Uganda","Ukraine","United Kingdom","United States","Uruguay","Venezuela","Vietnam","Yemen","Zambia"],"GDPpc":[10873.19,12776.72,20007.18,9118.29,43590.28,45158.24,2887.38,38894.31,2102.85,5798.49,14673.54,16768.48,839.62,2983.79,2680.8,42793.58,598.63,21125.28,12275.32,12710.09,4503.03,13356.3,3218.56,20495.07,28953.49,1199.18,43732.85,12630.67,10921.65,10779.8,7964.36,25692.09,37818.23,38169.15,46189.98,3608.04,24385.19,6874.59,1649.73,4317.93,45399.33,22629.37,5386.09,9642.26,15337.32,51224.51,31242.34,34920.18,7197.93,35270.6,23118.91,2956.07,5599.27,22172.02,24980.13,971.41,21391.48,1506.49,15424.44,10918.35,7251.31,1211.41,5567.87,2577.7,47392.05,33713.18,4494.58,868.01,75920.02,4797.65,19792.19,8168.77,10846.81,6603.0,24278.27,26720.04,20018.52,23768.19,1626.85,46772.05,2309.28,1352.99,66050.36,24944.4,27475.38,11962.84,34585.18,32454.11,10729.67,3681.51,42117.14,61570.26,41514.42,3183.64,2309.13,13586.9,1445.93,10535.25,19521.83,1852.92,10256.67,38324.34,51622.96,19573.24,15117.76,5411.61,3491.14,3576.28],"lp":[35555.89,44895.71,47512.86,22805.71,86046.52,86996.02,7778.31,89121.46,5156.19,12344.67,28551.9,33812.24,1843.85,5094.5,6144.69,80886.09,1371.3,48150.78,21055.78,24730.7,12108.09,27164.96,8647.81,58173.92,60225.04,3702.58,87988.3,31120.95,28334.3,34611.97,18730.32,53375.09,79750.49,92574.69,87744.16,7576.96,67270.51,21970.4,4070.78,10167.39,88039.16,53822.25,13672.06,21707.97,51189.81,129313.96,63161.61,88525.78,18682.51,68817.34,46990.32,7783.82,14112.09,54762.08,66454.04,2492.43,46456.98,4638.69,37617.38,26268.07,20031.19,2871.94,9765.79,4821.12,91438.91,64087.06,10704.34,2443.23,142219.97,15999.74,43773.23,17524.61,22812.57,18731.9,59201.82,64024.14,50225.13,47417.29,3359.59,126037.53,7083.87,3662.98,106899.19,61629.46,58707.48,35363.58,66253.02,85240.7,31748.94,14997.95,86007.79,100824.67,87077.97,10903.33,5300.12,23659.23,3366.45,34098.36,61402.06,4872.97,25135.94,79628.32,111077.1,40385.42,36089.37,9585.79,14273.39,13063.56],"kl":[127640.2,155396.63,118698.07,36610.1,329658.97,427737.19,25878.04,469572.78,14164.65,24397.26,128932.8,87473.89,2482.35,10385.95,14058.0,323836.97,8187.3,149675.58,86901.92,76396.9,57985.25,69598.88,20597.63,274616.72,341953.53,3153.94,384622.06,102571.95,100192.09,45623.91,41267.63,238241.73,386086.25,443125.28,356783.88,24872.56,502747.31,58347.86,30523.5,36585.52,440963.75,256326.81,44077.54,119061.42,158795.83,535436.13,202648.41,552395.19,126503.72,280624.31,85119.69,17055.21,15036.79,383185.59,234440.61,8800.49,140713.11,10049.23,129880.92,107471.66,108619.98,5999.2,13527.71,12726.2,401166.72,194352.64,35739.33,11631.07,471053.94,27410.98,115138.7,45154.54,62418.48,59648.47,130951.8,446210.56,208357.78,107192.95,6416.93,465393.72,23944.01,9427.29,472351.28,237987.11,349862.06,121865.38,261647.34,479139.25,85120.62,32888.94,373380.56,380356.88,305468.78,77374.37,24351.28,95264.73,9274.1,160419.8,186852.41,15333.91,86393.27,381477.56,355979.28,156742.94,184725.89,27092.06,35054.76,67122.44],"h":[3.5831,2.9245,3.4741,3.8519,4.0851,3.5438,2.6327,3.8139,2.2797,3.0494,3.1285,4.1496,1.9823,2.3318,2.6358,4.3683,2.03,3.544,3.0726,3.7192,2.5403,2.9918,2.27,4.1491,4.4662,2.0008,4.0196,3.09,2.975,2.9115,3.0613,4.3104,3.6142,3.9188,4.4904,2.7604,3.7658,2.2919,2.3618,2.6003,4.0457,4.1884,2.7034,3.1862,3.4529,4.3238,4.5133,3.5882,3.5959,4.1382,3.9141,2.5328,3.9925,3.8663,3.9697,2.3104,3.8918,1.6273,3.3178,3.5009,2.3904,1.6906,2.3632,2.2251,4.1453,3.6886,2.7999,1.6171,4.0141,2.3045,3.4,2.9118,3.1262,3.199,4.0702,3.0113,3.8666,4.1224,2.2313,3.3574,1.9697,2.288,4.3147,4.613,4.23,3.739,4.3577,3.7001,3.5445,1.8777,4.0365,5.2015,4.0432,3.6566,2.615,3.2337,2.4616,3.0409,2.9034,2.592,3.9691,4.5629,4.6597,3.1218,3.341,2.9603,2.0977,3.043]};
@@ -6,11 +6,10 @@ and injects the payload into template.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
 
 HERE = Path(__file__).resolve().parent
 ROOT = HERE.parent.parent
@@ -18,6 +17,11 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.bundles import bundle_scripts, frame, ref  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+
 
 def summary_stats(values: list[float]) -> dict:
     arr = np.asarray(values, dtype=float)
@@ -45,7 +49,7 @@ def ols(x: np.ndarray, y: np.ndarray) -> dict:
     r2 = 1 - ss_res / ss_tot if ss_tot > 0 else 0.0
     n = len(x)
     se_slope = float(np.sqrt(ss_res / (n - 2) / ((x - mx) ** 2).sum()))
-    residuals = [round(float(v), 2) for v in (y - yhat)]
+    residuals = col((y - yhat), 2)
     return {
         "intercept": round(intercept, 2),
         "slope": round(slope, 4),
@@ -56,40 +60,33 @@ def ols(x: np.ndarray, y: np.ndarray) -> dict:
 
 
 def build_data() -> dict:
-    df = pd.read_stata(DATA_DIR / "AED_HOUSE.DTA")
-
-    price = [int(v) for v in df["price"]]
-    size = [int(v) for v in df["size"]]
-    bedrooms = [int(v) for v in df["bedrooms"]]
-    bathrooms = [float(v) for v in df["bathrooms"]]
-    lotsize = [int(v) for v in df["lotsize"]]
-    age = [round(float(v), 1) for v in df["age"]]
+    df = frame("aed_house")
 
-    price_arr = np.array(price, dtype=float)
+    price_arr = df["price"].to_numpy(dtype=float)
     predictors = {
-        "size": {"values": size, "label": "Size (sq ft)", "short": "Size"},
-        "bedrooms": {"values": bedrooms, "label": "Bedrooms", "short": "Bedrooms"},
-        "bathrooms": {"values": bathrooms, "label": "Bathrooms", "short": "Baths"},
-        "lotsize": {"values": lotsize, "label": "Lot size (units)", "short": "Lot size"},
-        "age": {"values": age, "label": "Age (years)", "short": "Age"},
+        "size": {"label": "Size (sq ft)", "short": "Size"},
+        "bedrooms": {"label": "Bedrooms", "short": "Bedrooms"},
+        "bathrooms": {"label": "Bathrooms", "short": "Baths"},
+        "lotsize": {"label": "Lot size (units)", "short": "Lot size"},
+        "age": {"label": "Age (years)", "short": "Age"},
     }
 
     regressions = {}
     for key, info in predictors.items():
-        x = np.array(info["values"], dtype=float)
+        x = df[key].to_numpy(dtype=float)
         reg = ols(x, price_arr)
         regressions[key] = {**reg, "label": info["label"], "short": info["short"]}
 
     return {
-        "price": price,
-        "predictors": {k: v["values"] for k, v in predictors.items()},
+        "price": ref("aed_house", "price"),
+        "predictors": ref("aed_house", list(predictors)),
         "predictor_labels": {k: v["label"] for k, v in predictors.items()},
         "predictor_short": {k: v["short"] for k, v in predictors.items()},
         "regressions": regressions,
         "summary": {
-            "price": summary_stats(price),
-            "size": summary_stats(size),
-            "bedrooms": summary_stats(bedrooms),
+            "price": summary_stats(df["price"]),
+            "size": summary_stats(df["size"]),
+            "bedrooms": summary_stats(df["bedrooms"]),
         },
         "meta": {
             "chapter": "Chapter 1: Analysis of Economics Data",
@@ -104,14 +101,11 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     r = data["regressions"]["size"]
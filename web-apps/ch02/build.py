@@ -7,7 +7,7 @@ HTML file to web-apps/ch02/dashboard.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -19,19 +19,19 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
-
-def iso_dates(series: pd.Series) -> list[str]:
-    return [d.strftime("%Y-%m-%d") for d in pd.to_datetime(series)]
+sys.path.insert(0, str(HERE.parent))
+from common.bundles import bundle_scripts, frame, ref  # noqa: E402
+from common.kde import kde  # noqa: E402
+from common.lttb import date_axis, pyramid, step_axis  # noqa: E402
+from common.payload import col, decode, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
 
 
 def load_earnings() -> list[int]:
-    df = pd.read_stata(DATA_DIR / "AED_EARNINGS.DTA")
-    return [int(x) for x in df["earnings"].tolist()]
+    return [int(x) for x in frame("aed_earnings")["earnings"].tolist()]
 
 
 def load_gdp() -> dict:
-    df = pd.read_stata(DATA_DIR / "AED_REALGDPPC.DTA")
-    df = df.dropna(subset=["realgdppc"]).reset_index(drop=True)
     # NBER recession quarters covered by this sample (start, end as YYYY-MM-DD).
     recessions = [
         ["1960-04-01", "1961-02-01"],
@@ -44,11 +44,7 @@ def load_gdp() -> dict:
         ["2007-12-01", "2009-06-01"],
         ["2020-02-01", "2020-04-01"],
     ]
-    return {
-        "dates": iso_dates(df["daten"]),
-        "values": [round(float(v), 2) for v in df["realgdppc"]],
-        "recessions": recessions,
-    }
+    return ref("aed_realgdppc", {"dates": "dates", "values": "realgdppc"}, recessions=recessions)
 
 
 def load_health() -> dict:
@@ -105,8 +101,9 @@ def load_maddison_us() -> dict:
             years.append(int(row["year"]))
             values.append(round(float(row["gdppc"]), 1))
     return {
-        "years": years,
+        "axis": step_axis(years, 1),
         "values": values,
+        "lod": pyramid(years, [values]),
         "source": "Maddison Project 2023 (Bolt & van Zanden)",
     }
 
@@ -115,11 +112,13 @@ def load_home_sales() -> dict:
     df = pd.read_stata(DATA_DIR / "AED_MONTHLYHOMESALES.DTA")
     df = df.sort_values("daten").reset_index(drop=True)
 
-    def clean(col: str) -> list[float | None]:
-        return [None if pd.isna(v) else round(float(v), 1) for v in df[col]]
+    def clean(name: str):
+        return col(df[name], 1)
 
+    axis = date_axis(df["daten"], "month")
     return {
-        "dates": iso_dates(df["daten"]),
+        "axis": axis,
+        "lod": pyramid(decode(axis["offset"]), [df["exsales"], df["exsales_sa"]]),
         "original": clean("exsales"),
         "ma11": clean("exsales_ma11"),
         "sa": clean("exsales_sa"),
@@ -148,20 +147,47 @@ def summary_stats(values: list[float]) -> dict:
     }
 
 
+def density_overlays(series: dict, grid_size: int = 512, keep: int = 4) -> dict:
+    """KDE overlays for every series: {Silverman, Sheather-Jones} x {raw, ln scale}.
+
+    Each entry sends its grid end points (the grid is linear, or
+    exponential for ``log``), the bandwidth and every ``keep``-th density.
+    """
+    out: dict = {name: {} for name in series}
+    for bw in ("silverman", "sj"):
+        for log in (False, True):
+            fits = kde(series, bw=bw, grid_size=grid_size, log=log)
+            for name, fit in fits.items():
+                grid = fit["grid"][::keep]
+                out[name][bw + ("_log" if log else "")] = {
+                    "lo": float(f"{grid[0]:.6g}"),
+                    "hi": float(f"{grid[-1]:.6g}"),
+                    "log": log,
+                    "bw": float(f"{fit['bw']:.4g}"),
+                    "density": [float(f"{v:.4g}") for v in fit["density"][::keep]],
+                }
+    return out
+
+
 def build_data() -> dict:
     earnings = load_earnings()
-    gdp = load_gdp()
+    gdp_values = col(frame("aed_realgdppc")["realgdppc"], 2)
     home_sales = load_home_sales()
     return {
-        "earnings": earnings,
-        "gdp": gdp,
+        "earnings": ref("aed_earnings", "earnings"),
+        "gdp": load_gdp(),
         "gdp_long": load_maddison_us(),
         "health": load_health(),
         "fishing": load_fishing(),
         "home_sales": home_sales,
+        "kde": density_overlays({
+            "earnings": earnings,
+            "gdp": gdp_values,
+            "home_sales": [v for v in home_sales["original"] if v is not None],
+        }),
         "summary": {
             "earnings": summary_stats(earnings),
-            "gdp": summary_stats(gdp["values"]),
+            "gdp": summary_stats(gdp_values),
             "home_sales": summary_stats([v for v in home_sales["original"] if v is not None]),
         },
         "meta": {
@@ -177,14 +203,11 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data, "lod"),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     s = data["summary"]["earnings"]
@@ -195,10 +218,16 @@ def main() -> None:
         f"median={s['median']:.0f} std={s['std']:.0f} "
         f"skew={s['skew']:.2f} kurt={s['kurt']:.2f}"
     )
+    k = data["kde"]["earnings"]
+    print(
+        f"[check] earnings KDE bandwidth: silverman={k['silverman']['bw']:,.0f} "
+        f"sheather-jones={k['sj']['bw']:,.0f} (ln scale: {k['sj_log']['bw']:.3f})"
+    )
+    years = gl["axis"]["start"] + decode(gl["axis"]["offset"])
     print(
-        f"[check] maddison US: n={len(gl['years'])} "
-        f"{gl['years'][0]}=${gl['values'][0]:,.0f} → "
-        f"{gl['years'][-1]}=${gl['values'][-1]:,.0f}"
+        f"[check] maddison US: n={len(gl['values'])} "
+        f"{years[0]:.0f}=${gl['values'][0]:,.0f} → "
+        f"{years[-1]:.0f}=${gl['values'][-1]:,.0f}"
     )
 
 
@@ -7,7 +7,7 @@ writing the final self-contained HTML file to web-apps/ch03/dashboard.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -19,15 +19,21 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.kde import kde  # noqa: E402
+from common.moments import Moments  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+
 
 def summary_stats(values: list[float]) -> dict:
-    arr = np.asarray([v for v in values if v is not None], dtype=float)
+    arr = np.fromiter((v for v in values if v is not None), dtype=float)
+    acc = Moments().update(arr)
     n = len(arr)
-    m = float(arr.mean())
-    s = float(arr.std(ddof=1))
-    centered = arr - m
-    skew = float(((centered**3).mean()) / (s**3)) if s > 0 else 0.0
-    kurt = float(((centered**4).mean()) / (s**4) - 3) if s > 0 else 0.0
+    m = acc.mean
+    s = acc.std(ddof=1)
+    skew = acc.central(3) / s**3 if s > 0 else 0.0
+    kurt = acc.central(4) / s**4 - 3 if s > 0 else 0.0
     return {
         "n": n,
         "mean": round(m, 6),
@@ -44,8 +50,8 @@ def summary_stats(values: list[float]) -> dict:
 
 def load_coin_tosses() -> dict:
     df = pd.read_stata(DATA_DIR / "AED_COINTOSSMEANS.DTA")
-    xbar = [round(float(x), 6) for x in df["xbar"]]
-    stdev = [round(float(x), 6) for x in df["stdev"]]
+    xbar = col(df["xbar"], 6)
+    stdev = col(df["stdev"], 6)
     return {
         "xbar": xbar,
         "stdev": stdev,
@@ -57,9 +63,9 @@ def load_coin_tosses() -> dict:
 
 def load_census_ages() -> dict:
     df = pd.read_stata(DATA_DIR / "AED_CENSUSAGEMEANS.DTA")
-    col = "mean" if "mean" in df.columns else "xmean"
-    means = [round(float(x), 6) for x in df[col]]
-    stdevs = [round(float(x), 6) for x in df["stdev"]]
+    mean_col = "mean" if "mean" in df.columns else "xmean"
+    means = col(df[mean_col], 6)
+    stdevs = col(df["stdev"], 6)
     return {
         "mean": means,
         "stdev": stdevs,
@@ -69,12 +75,28 @@ def load_census_ages() -> dict:
     }
 
 
+def density_overlays(series: dict, grid_size: int = 512, keep: int = 4) -> dict:
+    """Silverman-bandwidth KDE of each series of sample means, as {x, y, bw}.
+
+    Sheather-Jones would chase the 1/30 lattice of the coin-toss means.
+    """
+    out = {}
+    for name, fit in kde(series, bw="silverman", grid_size=grid_size).items():
+        out[name] = {
+            "x": col(fit["grid"][::keep], 6),
+            "y": [float(f"{v:.4g}") for v in fit["density"][::keep]],
+            "bw": round(fit["bw"], 6),
+        }
+    return out
+
+
 def build_data() -> dict:
     coin = load_coin_tosses()
     census = load_census_ages()
     return {
         "coin": coin,
         "census": census,
+        "kde": density_overlays({"coin": coin["xbar"], "census": census["mean"]}),
         "summary": {
             "coin_xbar": summary_stats(coin["xbar"]),
             "census_mean": summary_stats(census["mean"]),
@@ -92,14 +114,10 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     cs = data["summary"]["coin_xbar"]
@@ -113,6 +131,11 @@ def main() -> None:
         f"[check] census mean: n={ce['n']} mean={ce['mean']:.2f} "
         f"std={ce['std']:.2f} (theoretical SE={18.61 / 25**0.5:.2f})"
     )
+    k = data["kde"]
+    print(
+        f"[check] KDE bandwidth (Silverman): coin={k['coin']['bw']:.4f} "
+        f"census={k['census']['bw']:.3f}"
+    )
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@ template.html, writing the final self-contained HTML to dashboard.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -19,6 +19,11 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.bundles import bundle_scripts, frame, ref  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+
 
 def summary_stats(values: list[float]) -> dict:
     arr = np.asarray([v for v in values if v is not None], dtype=float)
@@ -37,14 +42,13 @@ def summary_stats(values: list[float]) -> dict:
 
 
 def load_earnings() -> list[int]:
-    df = pd.read_stata(DATA_DIR / "AED_EARNINGS.DTA")
-    return [int(x) for x in df["earnings"]]
+    return [int(x) for x in frame("aed_earnings")["earnings"]]
 
 
 def load_gas() -> dict:
     df = pd.read_stata(DATA_DIR / "AED_GASPRICE.DTA")
     return {
-        "prices": [round(float(x), 4) for x in df["price"]],
+        "prices": col(df["price"], 4),
         "ca_avg": 3.81,
     }
 
@@ -55,9 +59,8 @@ def load_earnings_male() -> list[int]:
 
 
 def load_gdp_growth() -> list[float]:
-    df = pd.read_stata(DATA_DIR / "AED_REALGDPPC.DTA")
-    growth = df["growth"].dropna()
-    return [round(float(x), 4) for x in growth]
+    growth = frame("aed_realgdppc")["growth"].dropna()
+    return col(growth, 4)
 
 
 def build_data() -> dict:
@@ -66,7 +69,7 @@ def build_data() -> dict:
     earnings_male = load_earnings_male()
     gdp_growth = load_gdp_growth()
     return {
-        "earnings": earnings,
+        "earnings": ref("aed_earnings", "earnings"),
         "gas": gas,
         "earnings_male": earnings_male,
         "gdp_growth": gdp_growth,
@@ -89,14 +92,11 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     se = data["summary"]["earnings"]
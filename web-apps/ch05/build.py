@@ -7,11 +7,10 @@ into template.html → dashboard.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
 from scipy import stats as sp_stats
 
 HERE = Path(__file__).resolve().parent
@@ -20,15 +19,23 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.bundles import bundle_scripts, frame, ref  # noqa: E402
+from common.kernel import nw_smooth  # noqa: E402
+from common.lowess import lowess_multi  # noqa: E402
+from common.memo import memoize  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+from common.segments import Segments  # noqa: E402
+
+KERNEL_BW_MULTS = [50, 100, 150, 200, 300]
+HOUSE_COLUMNS = ["price", "size", "bedrooms", "bathrooms", "lotsize", "age"]
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def clean_list(series, decimals: int = 2) -> list[float]:
-    return [round(float(v), decimals) for v in series]
-
-
 def ols(x: np.ndarray, y: np.ndarray) -> dict:
     slope, intercept, r, _, _ = sp_stats.linregress(x, y)
     fitted = intercept + slope * x
@@ -44,8 +51,8 @@ def ols(x: np.ndarray, y: np.ndarray) -> dict:
         "r": round(r, 4),
         "r_squared": round(r ** 2, 4),
         "se": round(se, 2),
-        "fitted": [round(float(v), 2) for v in fitted],
-        "residuals": [round(float(v), 2) for v in residuals],
+        "fitted": col(fitted, 2),
+        "residuals": col(residuals, 2),
         "tss": round(tss, 2),
         "ess": round(ess, 2),
         "rss": round(rss, 2),
@@ -53,44 +60,13 @@ def ols(x: np.ndarray, y: np.ndarray) -> dict:
     }
 
 
-def lowess_fit(x: np.ndarray, y: np.ndarray, frac: float) -> dict:
-    """LOWESS using statsmodels."""
-    import statsmodels.api as sm
-    result = sm.nonparametric.lowess(y, x, frac=frac)
-    return {
-        "x": [round(float(v), 2) for v in result[:, 0]],
-        "y": [round(float(v), 2) for v in result[:, 1]],
-    }
-
-
-def kernel_smooth(x: np.ndarray, y: np.ndarray, bw: float) -> dict:
-    """Nadaraya-Watson kernel regression with Gaussian kernel."""
-    x_sorted = np.sort(x)
-    x_grid = np.linspace(x_sorted[0], x_sorted[-1], 100)
-    y_hat = np.zeros(len(x_grid))
-    for i, xg in enumerate(x_grid):
-        weights = np.exp(-0.5 * ((x - xg) / bw) ** 2)
-        y_hat[i] = np.sum(weights * y) / np.sum(weights)
-    return {
-        "x": [round(float(v), 2) for v in x_grid],
-        "y": [round(float(v), 2) for v in y_hat],
-    }
-
-
 # ---------------------------------------------------------------------------
 # Dataset loaders
 # ---------------------------------------------------------------------------
 
 def load_house() -> dict:
-    df = pd.read_stata(DATA_DIR / "AED_HOUSE.DTA")
-    return {
-        "price": clean_list(df["price"], 0),
-        "size": clean_list(df["size"], 0),
-        "bedrooms": clean_list(df["bedrooms"], 0),
-        "bathrooms": clean_list(df["bathrooms"], 0),
-        "lotsize": clean_list(df["lotsize"], 2),
-        "age": clean_list(df["age"], 0),
-    }
+    df = frame("aed_house")
+    return {c: df[c].to_numpy(dtype=float) for c in HOUSE_COLUMNS}
 
 
 def compute_regressions(house: dict) -> dict:
@@ -118,73 +94,101 @@ def compute_correlations(house: dict) -> dict:
     return corrs
 
 
-def generate_synthetic_r() -> dict:
-    """Generate 21 synthetic datasets at target r = -1.0, -0.9, ..., 1.0."""
-    np.random.seed(42)
-    n = 30
-    synth = {}
-    for r_target_10 in range(-10, 11):
-        r_target = r_target_10 / 10.0
-        x = np.random.normal(3, 1, n)
-        z = np.random.normal(0, 1, n)
-        x_std = (x - x.mean()) / x.std()
-        if abs(r_target) >= 0.999:
-            y = x_std * (1 if r_target > 0 else -1)
-        else:
-            y = r_target * x_std + np.sqrt(1 - r_target ** 2) * z
-        y = 5 + y  # shift to a reasonable range
-        actual_r = float(np.corrcoef(x, y)[0, 1])
-        synth[str(round(r_target, 1))] = {
-            "x": [round(float(v), 3) for v in x],
-            "y": [round(float(v), 3) for v in y],
-            "actual_r": round(actual_r, 4),
-        }
+def exact_r_samples(targets: np.ndarray, n: int = 30, reps: int = 1,
+                    seed: int = 42) -> tuple[np.ndarray, np.ndarray]:
+    """Draw ``reps`` samples of size n for every target r in one batch.
+
+    The noise is orthogonalised against x within each sample, so the sample
+    correlation equals the target exactly. Returns x, y of shape
+    (len(targets), reps, n).
+    """
+    rng = np.random.default_rng(seed)
+    r = np.asarray(targets, dtype=float)[:, None, None]
+    x = rng.normal(3, 1, (len(targets), reps, n))
+    z = rng.normal(0, 1, x.shape)
+    x_std = (x - x.mean(axis=-1, keepdims=True)) / x.std(axis=-1, keepdims=True)
+    z = z - z.mean(axis=-1, keepdims=True)
+    z -= (z * x_std).mean(axis=-1, keepdims=True) * x_std
+    z /= z.std(axis=-1, keepdims=True)
+    y = 5 + r * x_std + np.sqrt(np.clip(1 - r ** 2, 0, None)) * z
+    return x, y
+
+
+@memoize(deps=[exact_r_samples])
+def generate_synthetic_r(step: float = 0.05) -> Segments:
+    """Synthetic datasets (30 points) at target r = -1.00, -0.95, ..., 1.00.
+
+    The slider shows one at a time, so they ship as segments of five
+    neighbouring targets, parsed when the slider first reaches them.
+    """
+    targets = np.round(np.arange(-1, 1 + step / 2, step), 2)
+    x, y = exact_r_samples(targets)
+    synth = Segments("synthetic_r", chunk=5)
+    for t, xs, ys in zip(targets, x[:, 0], y[:, 0]):
+        xs, ys = np.round(xs, 4), np.round(ys, 4)
+        synth.add(f"{t:.2f}", {
+            "x": xs.tolist(),
+            "y": ys.tolist(),
+            "actual_r": round(float(np.corrcoef(xs, ys)[0, 1]), 4),
+        })
     return synth
 
 
+@memoize(deps=[lowess_multi])
 def compute_lowess_fits(house: dict) -> dict:
+    """LOWESS at frac 0.30, 0.35, ..., 1.00 from one sort and shared windows."""
     x = np.array(house["size"], dtype=float)
     y = np.array(house["price"], dtype=float)
-    sort_idx = np.argsort(x)
-    x_sorted = x[sort_idx]
-    y_sorted = y[sort_idx]
-    fits = {}
-    for frac_pct in range(30, 105, 5):
-        frac = frac_pct / 100.0
-        fits[str(frac_pct)] = lowess_fit(x_sorted, y_sorted, frac)
-    return fits
+    fracs = range(30, 105, 5)
+    res = lowess_multi(x, y, [f / 100.0 for f in fracs])
+    x_sorted = col(res["x"], 2)
+    return {
+        str(frac_pct): {"x": x_sorted, "y": col(fit, 2)}
+        for frac_pct, fit in zip(fracs, res["fits"])
+    }
 
 
+@memoize(deps=[nw_smooth])
 def compute_kernel_fits(house: dict) -> dict:
+    """Nadaraya-Watson fits (Gaussian kernel) for all bandwidths in one call.
+
+    The binned grid has 4x the 100 output points, so every 4th grid point
+    lands on linspace(min, max, 100). ``cv`` holds the leave-one-out score
+    per bandwidth multiplier.
+    """
     x = np.array(house["size"], dtype=float)
     y = np.array(house["price"], dtype=float)
-    x_std = x.std()
+    bws = x.std() * np.array(KERNEL_BW_MULTS) / 100.0
+    res = nw_smooth(x, y, bws, grid_size=397)
+    grid = res["grid"][::4]
     fits = {}
-    for bw_mult in [50, 100, 150, 200, 300]:
-        bw = x_std * bw_mult / 100.0
-        fits[str(bw_mult)] = kernel_smooth(x, y, bw)
-    return fits
+    for bw_mult, fit in zip(KERNEL_BW_MULTS, res["fit"][:, ::4]):
+        fits[str(bw_mult)] = {
+            "x": col(grid, 2),
+            "y": col(fit, 2),
+        }
+    return {"fits": fits, "cv": dict(zip(map(str, KERNEL_BW_MULTS), res["cv"].tolist()))}
 
 
 # ---------------------------------------------------------------------------
 # Assemble JSON payload
 # ---------------------------------------------------------------------------
 
-def build_data() -> dict:
+def build_data() -> tuple[dict, Segments]:
     house = load_house()
     regressions = compute_regressions(house)
     reverse = compute_reverse_regression(house)
     correlations = compute_correlations(house)
     synthetic_r = generate_synthetic_r()
     lowess = compute_lowess_fits(house)
-    kernel = compute_kernel_fits(house)
+    kernel = compute_kernel_fits(house)["fits"]
 
     return {
-        "house": house,
+        "house": ref("aed_house", HOUSE_COLUMNS),
         "regression": regressions,
         "reverse": reverse,
         "correlation": correlations,
-        "synthetic_r": synthetic_r,
+        "synthetic_r": synthetic_r.index(),
         "lowess": lowess,
         "kernel": kernel,
         "meta": {
@@ -192,7 +196,7 @@ def build_data() -> dict:
             "book": "metricsAI: An Introduction to Econometrics with Python and AI in the Cloud",
             "author": "Carlos Mendez",
         },
-    }
+    }, synthetic_r
 
 
 # ---------------------------------------------------------------------------
@@ -203,15 +207,13 @@ def main() -> None:
     if not TEMPLATE.exists():
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
-    data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    data, synthetic_r = build_data()
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "DATA_SEGMENTS": synthetic_r.render(HERE),
+        "SHARED_JS": shared_js(data, "segments"),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     print(f"[ok] wrote {OUT_FILE.relative_to(ROOT)} ({size_kb:.1f} KB)")
@@ -219,8 +221,9 @@ def main() -> None:
     # Sanity checks matching chapter prose
     reg = data["regression"]["size"]
     corr = data["correlation"]["size"]
-    print(f"[check] mean price = ${np.mean(data['house']['price']):,.2f} (chapter: $253,910.34)")
-    print(f"[check] mean size = {np.mean(data['house']['size']):,.2f} sqft (chapter: 1,882.76)")
+    house = load_house()
+    print(f"[check] mean price = ${np.mean(house['price']):,.2f} (chapter: $253,910.34)")
+    print(f"[check] mean size = {np.mean(house['size']):,.2f} sqft (chapter: 1,882.76)")
     print(f"[check] r(price, size) = {corr} (chapter: 0.7858)")
     print(f"[check] slope = {reg['slope']} (chapter: 73.771)")
     print(f"[check] intercept = {reg['intercept']} (chapter: 115,017.28)")
@@ -229,6 +232,8 @@ def main() -> None:
     rev = data["reverse"]
     print(f"[check] reverse slope = {rev['slope']} (chapter: 0.00837)")
     print(f"[check] 1/forward slope = {round(1/reg['slope'], 6)} ≠ reverse slope")
+    cv = compute_kernel_fits(house)["cv"]
+    print(f"[check] kernel LOO-CV best bandwidth = {min(cv, key=cv.get)}% of sd(size)")
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ JSON blob into template.html → dashboard.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -20,11 +20,10 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
-CONVERGENCE_URL = (
-    "https://raw.githubusercontent.com/quarcs-lab/mendez2020-convergence-clubs-code-data"
-    "/master/assets/dat.csv"
-)
-CONVERGENCE_CACHE = DATA_DIR / "mendez2020_convergence.csv"
+sys.path.insert(0, str(HERE.parent))
+from common.bundles import bundle_scripts, frame, ref  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
 
 
 def ols_fit(x: np.ndarray, y: np.ndarray) -> dict:
@@ -60,34 +59,18 @@ def load_generated_data() -> dict:
     """Load the 5-observation generated dataset."""
     df = pd.read_stata(DATA_DIR / "AED_GENERATEDDATA.DTA")
     return {
-        "x": [round(float(v), 4) for v in df["x"]],
-        "y": [round(float(v), 4) for v in df["y"]],
-        "Ey": [round(float(v), 4) for v in df["Eygivenx"]],
+        "x": col(df["x"], 4),
+        "y": col(df["y"], 4),
+        "Ey": col(df["Eygivenx"], 4),
     }
 
 
 def load_convergence_2014() -> dict:
-    """Load convergence-clubs 2014 cross-section (108 countries)."""
-    if CONVERGENCE_CACHE.exists():
-        df = pd.read_csv(CONVERGENCE_CACHE)
-    else:
-        df = pd.read_csv(CONVERGENCE_URL)
-        df.to_csv(CONVERGENCE_CACHE, index=False)
-        print(f"[cache] saved {CONVERGENCE_CACHE.relative_to(ROOT)}")
-
-    df2014 = df[df["year"] == 2014][["country", "GDPpc", "kl"]].dropna().copy()
-    df2014.columns = ["country", "productivity", "capital"]
-
-    x = df2014["capital"].values
-    y = df2014["productivity"].values
-    pop = ols_fit(x, y)
-
-    return {
-        "countries": df2014["country"].tolist(),
-        "productivity": [round(float(v), 2) for v in y],
-        "capital": [round(float(v), 2) for v in x],
-        "popRegression": pop,
-    }
+    """Convergence-clubs 2014 cross-section (108 countries), as a shared bundle."""
+    df = frame("convergence_2014")
+    pop = ols_fit(df["kl"].values, df["GDPpc"].values)
+    return ref("convergence_2014", {"countries": "country", "productivity": "GDPpc", "capital": "kl"},
+               popRegression=pop)
 
 
 def build_data() -> dict:
@@ -129,18 +112,15 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     pop = data["convergence"]["popRegression"]
-    n_countries = len(data["convergence"]["countries"])
+    n_countries = len(frame("convergence_2014"))
     print(f"[ok] wrote {OUT_FILE.relative_to(ROOT)} ({size_kb:.1f} KB)")
     print(f"[check] generated data: {len(data['genData']['x'])} observations")
     print(f"[check] convergence: {n_countries} countries (2014)")
@@ -7,7 +7,7 @@ JSON blob into template.html -> dashboard.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -21,6 +21,15 @@ OUT_FILE = HERE / "dashboard.html"
 
 GITHUB_DATA_URL = "https://raw.githubusercontent.com/quarcs-lab/data-open/master/AED/"
 
+sys.path.insert(0, str(HERE.parent))
+from common.jackknife import Downdater, jackknife  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+from common.rolling import rolling_ols  # noqa: E402
+
+CAPM_WINDOW = 60  # months
+OKUN_WINDOW = 15  # years
+
 
 def ols_fit(x: np.ndarray, y: np.ndarray) -> dict:
     """Compute OLS regression y = b1 + b2*x and return stats."""
@@ -84,17 +93,28 @@ def load_health() -> dict:
     y_hlth_sub = df_sub["hlthpc"].values.astype(float)
     reg_hlth_sub = ols_fit(x_gdp_sub, y_hlth_sub)
 
+    # Delete-one jackknife and greedy influence sweep for the slope,
+    # all from downdates of the full-sample fit
+    dd = Downdater(np.column_stack([np.ones(len(x_gdp)), x_gdp]), y_hlth)
+    jk = jackknife(dd.drop_one()["beta"], dd.beta)
+    sweep = dd.influence_sweep(coef=1, steps=8)
+
     return {
         "codes": [str(c).strip() for c in df["code"].tolist()],
-        "hlthpc": [round(float(v), 2) for v in df["hlthpc"]],
-        "lifeexp": [round(float(v), 2) for v in df["lifeexp"]],
-        "infmort": [round(float(v), 2) for v in df["infmort"]],
-        "gdppc": [round(float(v), 2) for v in df["gdppc"]],
+        "hlthpc": col(df["hlthpc"], 2),
+        "lifeexp": col(df["lifeexp"], 2),
+        "infmort": col(df["infmort"], 2),
+        "gdppc": col(df["gdppc"], 2),
         "regLifeexp": reg_life,
         "regInfmort": reg_inf,
         "regHlthAll": reg_hlth_all,
         "regHlthSub": reg_hlth_sub,
         "outlierCodes": ["USA", "LUX"],
+        "jackHlth": {
+            "se_b2": round(float(jk["se"][1]), 6),
+            "bias_b2": round(float(jk["bias"][1]), 6),
+            "dropOrder": sweep["dropped"],
+        },
     }
 
 
@@ -105,18 +125,30 @@ def load_capm() -> dict:
     # Market excess return and stock excess returns
     rm_rf = df["rm_rf"].values.astype(float)
 
+    cols = [("rko_rf", "Coca-Cola"), ("rtgt_rf", "Target"), ("rwmt_rf", "Walmart")]
+    # Time-varying betas for all three stocks from one pass of running cross-products
+    Y = df[[name for name, _ in cols]].values.astype(float)
+    rolling = rolling_ols(rm_rf, Y, window=CAPM_WINDOW)
+    expanding = rolling_ols(rm_rf, Y, min_obs=CAPM_WINDOW // 2)
+
     stocks = {}
-    for col, label in [("rko_rf", "Coca-Cola"), ("rtgt_rf", "Target"), ("rwmt_rf", "Walmart")]:
-        y = df[col].values.astype(float)
+    for j, (name, label) in enumerate(cols):
+        y = Y[:, j]
         reg = ols_fit(rm_rf, y)
-        stocks[col] = {
+        stocks[name] = {
             "label": label,
-            "values": [round(float(v), 6) for v in y],
+            "values": col(y, 6),
             "reg": reg,
+            "rolling": {"beta": col(rolling["coef"][:, j, 1], 4),
+                        "se": col(rolling["se"][:, j, 1], 4)},
+            "expanding": {"beta": col(expanding["coef"][:, j, 1], 4),
+                          "se": col(expanding["se"][:, j, 1], 4)},
         }
 
     return {
-        "rm_rf": [round(float(v), 6) for v in rm_rf],
+        "rm_rf": col(rm_rf, 6),
+        "dates": [d.strftime("%Y-%m") for d in df["date"]],
+        "window": CAPM_WINDOW,
         "n": len(rm_rf),
         "stocks": stocks,
     }
@@ -130,12 +162,17 @@ def load_okun() -> dict:
     x = df["uratechange"].values.astype(float)
     y = df["rgdpgrowth"].values.astype(float)
     reg = ols_fit(x, y)
+    rolling = rolling_ols(x, y, window=OKUN_WINDOW)
+    expanding = rolling_ols(x, y, min_obs=10)
 
     return {
         "years": [int(v) for v in df["year"]],
-        "rgdpgrowth": [round(float(v), 4) for v in y],
-        "uratechange": [round(float(v), 4) for v in x],
+        "rgdpgrowth": col(y, 4),
+        "uratechange": col(x, 4),
         "reg": reg,
+        "window": OKUN_WINDOW,
+        "rolling": {"b2": col(rolling["coef"][:, 1], 4), "se": col(rolling["se"][:, 1], 4)},
+        "expanding": {"b2": col(expanding["coef"][:, 1], 4), "se": col(expanding["se"][:, 1], 4)},
     }
 
 
@@ -161,14 +198,10 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     h = data["health"]
@@ -190,6 +223,12 @@ def main() -> None:
     print(
         f"[check] hlth~gdp sub: b2={h['regHlthSub']['b2']:.4f} R2={h['regHlthSub']['R2']:.4f}"
     )
+    jk = h["jackHlth"]
+    print(
+        f"[check] hlth~gdp jackknife: se_b2={jk['se_b2']:.4f} "
+        f"(OLS {h['regHlthAll']['se_b2']:.4f}), bias={jk['bias_b2']:.4f}, "
+        f"most influential: {', '.join(h['codes'][i] for i in jk['dropOrder'][:2])}"
+    )
     ko_reg = c["stocks"]["rko_rf"]["reg"]
     print(
         f"[check] CAPM KO: alpha={ko_reg['b1']:.4f} beta={ko_reg['b2']:.4f} R2={ko_reg['R2']:.4f}"
@@ -197,6 +236,13 @@ def main() -> None:
     print(
         f"[check] Okun: b1={o['reg']['b1']:.4f} b2={o['reg']['b2']:.4f} R2={o['reg']['R2']:.4f}"
     )
+    ko_roll = [v for v in c["stocks"]["rko_rf"]["rolling"]["beta"] if v is not None]
+    print(
+        f"[check] CAPM KO {c['window']}-month rolling beta: {min(ko_roll):.2f} to {max(ko_roll):.2f}; "
+        f"expanding end={c['stocks']['rko_rf']['expanding']['beta'][-1]:.4f}"
+    )
+    ok_roll = [v for v in o["rolling"]["b2"] if v is not None]
+    print(f"[check] Okun {o['window']}-year rolling slope: {min(ok_roll):.2f} to {max(ok_roll):.2f}")
 
 
 if __name__ == "__main__":
@@ -9,7 +9,7 @@ template.html -> dashboard.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -21,11 +21,10 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
-CONVERGENCE_URL = (
-    "https://raw.githubusercontent.com/quarcs-lab/mendez2020-convergence-clubs-code-data"
-    "/master/assets/dat.csv"
-)
-CONVERGENCE_CACHE = DATA_DIR / "mendez2020_convergence.csv"
+sys.path.insert(0, str(HERE.parent))
+from common.bundles import bundle_scripts, frame, ref  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
 
 
 def ols_fit(x: np.ndarray, y: np.ndarray) -> dict:
@@ -62,7 +61,7 @@ def ols_fit(x: np.ndarray, y: np.ndarray) -> dict:
 
 def load_earnings() -> dict:
     """Load earnings-education data and pre-compute 4 model specifications."""
-    df = pd.read_stata(DATA_DIR / "AED_EARNINGS.DTA")
+    df = frame("aed_earnings")
 
     earnings = df["earnings"].values
     education = df["education"].values
@@ -75,18 +74,17 @@ def load_earnings() -> dict:
     m3_loglog = ols_fit(ln_education, ln_earnings)
     m4_linlog = ols_fit(ln_education, earnings)
 
-    return {
-        "education": [round(float(v), 2) for v in education],
-        "earnings": [round(float(v), 2) for v in earnings],
-        "lnEarnings": [round(float(v), 4) for v in ln_earnings],
-        "lnEducation": [round(float(v), 4) for v in ln_education],
-        "models": {
+    return ref(
+        "aed_earnings", ["education", "earnings"],
+        lnEarnings=col(ln_earnings, 4),
+        lnEducation=col(ln_education, 4),
+        models={
             "linlin": m1_linlin,
             "loglin": m2_loglin,
             "loglog": m3_loglog,
             "linlog": m4_linlog,
         },
-    }
+    )
 
 
 def load_sp500() -> dict:
@@ -102,23 +100,15 @@ def load_sp500() -> dict:
 
     return {
         "year": [int(v) for v in year],
-        "sp500": [round(float(v), 2) for v in sp500],
-        "lnsp500": [round(float(v), 4) for v in lnsp500],
+        "sp500": col(sp500, 2),
+        "lnsp500": col(lnsp500, 4),
         "growthReg": growth_reg,
     }
 
 
 def load_convergence() -> dict:
-    """Load convergence clubs 2014 cross-section for case study widget."""
-    if CONVERGENCE_CACHE.exists():
-        df = pd.read_csv(CONVERGENCE_CACHE)
-    else:
-        df = pd.read_csv(CONVERGENCE_URL)
-        df.to_csv(CONVERGENCE_CACHE, index=False)
-        print(f"[cache] saved {CONVERGENCE_CACHE.relative_to(ROOT)}")
-
-    # Use 2014 cross-section
-    df2014 = df[df["year"] == 2014].dropna(subset=["lp", "kl", "h"]).copy()
+    """Convergence clubs 2014 cross-section for case study widget (shared bundle)."""
+    df2014 = frame("convergence_2014")
 
     lp = df2014["lp"].values
     kl = df2014["kl"].values
@@ -131,16 +121,13 @@ def load_convergence() -> dict:
     # Log-linear model: ln(lp) ~ h
     loglin_h = ols_fit(h, ln_lp)
 
-    return {
-        "countries": df2014["country"].tolist(),
-        "lp": [round(float(v), 2) for v in lp],
-        "kl": [round(float(v), 2) for v in kl],
-        "h": [round(float(v), 4) for v in h],
-        "lnLp": [round(float(v), 4) for v in ln_lp],
-        "lnKl": [round(float(v), 4) for v in ln_kl],
-        "loglogKl": loglog_kl,
-        "loglinH": loglin_h,
-    }
+    return ref(
+        "convergence_2014", {"countries": "country", "lp": "lp", "kl": "kl", "h": "h"},
+        lnLp=col(ln_lp, 4),
+        lnKl=col(ln_kl, 4),
+        loglogKl=loglog_kl,
+        loglinH=loglin_h,
+    )
 
 
 def build_data() -> dict:
@@ -164,14 +151,11 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     e = data["earnings"]
@@ -179,7 +163,7 @@ def main() -> None:
     conv = data["convergence"]
     n_earn = e["models"]["linlin"]["n"]
     n_sp = len(sp["year"])
-    n_conv = len(conv["countries"])
+    n_conv = len(frame("convergence_2014"))
 
     print(f"[ok] wrote {OUT_FILE.relative_to(ROOT)} ({size_kb:.1f} KB)")
     print(f"[check] earnings: {n_earn} observations")
@@ -1,20 +1,17 @@
 """Build the Chapter 10 interactive dashboard.
 
-Reads AED_HOUSE.DTA, pre-computes all 63 possible OLS models (6 predictors),
-correlation matrix, VIF values, and FWL demonstration data, then injects
-the JSON payload into template.html → dashboard.html.
+Reads AED_HOUSE.DTA, computes the cross-products from which the template
+fits any of the 63 possible OLS models (6 predictors), the correlation
+matrix and VIF values, then injects the JSON payload into
+template.html → dashboard.html.
 """
 
 from __future__ import annotations
 
-import json
-from itertools import combinations
+import sys
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
-import statsmodels.api as sm
-from scipy import stats as sp_stats
 from statsmodels.stats.outliers_influence import variance_inflation_factor
 
 HERE = Path(__file__).resolve().parent
@@ -24,18 +21,13 @@ TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
 PREDICTORS = ["size", "bedrooms", "bathrooms", "lotsize", "age", "monthsold"]
+HOUSE_COLUMNS = ["price"] + PREDICTORS
 
-
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-def clean_list(series, decimals: int = 2) -> list[float]:
-    return [round(float(v), decimals) for v in series]
-
-
-def model_key(vars_list: list[str]) -> str:
-    return ",".join(sorted(vars_list))
+sys.path.insert(0, str(HERE.parent))
+from common.bundles import bundle_scripts, frame, ref  # noqa: E402
+from common.payload import iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+from common.suffstats import cross_products, subset_ols  # noqa: E402
 
 
 # ---------------------------------------------------------------------------
@@ -43,70 +35,17 @@ def model_key(vars_list: list[str]) -> str:
 # ---------------------------------------------------------------------------
 
 def load_house() -> dict:
-    df = pd.read_stata(DATA_DIR / "AED_HOUSE.DTA")
-    return {
-        "price": clean_list(df["price"], 0),
-        "size": clean_list(df["size"], 0),
-        "bedrooms": clean_list(df["bedrooms"], 0),
-        "bathrooms": clean_list(df["bathrooms"], 1),
-        "lotsize": clean_list(df["lotsize"], 2),
-        "age": clean_list(df["age"], 0),
-        "monthsold": clean_list(df["monthsold"], 0),
-    }
+    df = frame("aed_house")
+    return {c: df[c].to_numpy(dtype=float) for c in HOUSE_COLUMNS}
 
 
 # ---------------------------------------------------------------------------
-# Compute all 63 OLS models
+# Sufficient statistics for all 63 OLS models
 # ---------------------------------------------------------------------------
 
-def compute_all_models(house: dict) -> dict:
-    df = pd.DataFrame(house)
-    y = df["price"].values
-    models = {}
-
-    for k in range(1, len(PREDICTORS) + 1):
-        for combo in combinations(PREDICTORS, k):
-            vars_list = list(combo)
-            key = model_key(vars_list)
-            X = sm.add_constant(df[vars_list])
-            fit = sm.OLS(y, X).fit()
-
-            coefs = {}
-            se = {}
-            tvals = {}
-            pvals = {}
-            ci_lo = {}
-            ci_hi = {}
-            conf = fit.conf_int(alpha=0.05)
-            for i, name in enumerate(fit.model.exog_names):
-                label = name if name != "const" else "const"
-                coefs[label] = round(float(fit.params.iloc[i]), 4)
-                se[label] = round(float(fit.bse.iloc[i]), 4)
-                tvals[label] = round(float(fit.tvalues.iloc[i]), 4)
-                pvals[label] = round(float(fit.pvalues.iloc[i]), 4)
-                ci_lo[label] = round(float(conf.iloc[i, 0]), 2)
-                ci_hi[label] = round(float(conf.iloc[i, 1]), 2)
-
-            models[key] = {
-                "vars": vars_list,
-                "coefs": coefs,
-                "se": se,
-                "tvals": tvals,
-                "pvals": pvals,
-                "ci_lo": ci_lo,
-                "ci_hi": ci_hi,
-                "r2": round(float(fit.rsquared), 4),
-                "adj_r2": round(float(fit.rsquared_adj), 4),
-                "aic": round(float(fit.aic), 2),
-                "bic": round(float(fit.bic), 2),
-                "rmse": round(float(np.sqrt(fit.mse_resid)), 2),
-                "n": int(fit.nobs),
-                "k": len(vars_list) + 1,  # including constant
-                "fitted": [round(float(v), 2) for v in fit.fittedvalues],
-                "residuals": [round(float(v), 2) for v in fit.resid],
-            }
-
-    return models
+def compute_cross_products(house: dict) -> dict:
+    """Means and centred cross-products; the template fits any model from them."""
+    return cross_products(house, "price", PREDICTORS)
 
 
 # ---------------------------------------------------------------------------
@@ -160,13 +99,12 @@ def compute_vif(house: dict) -> dict:
 
 def build_data() -> dict:
     house = load_house()
-    models = compute_all_models(house)
     correlations = compute_correlations(house)
     vif = compute_vif(house)
 
-    return {
-        "house": house,
-        "models": models,
+    data = {
+        "house": ref("aed_house", HOUSE_COLUMNS),
+        "ols": compute_cross_products(house),
         "correlations": correlations,
         "vif": vif,
         "predictors": PREDICTORS,
@@ -176,6 +114,7 @@ def build_data() -> dict:
             "author": "Carlos Mendez",
         },
     }
+    return data
 
 
 # ---------------------------------------------------------------------------
@@ -187,35 +126,34 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data, "ols"),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     print(f"[ok] wrote {OUT_FILE.relative_to(ROOT)} ({size_kb:.1f} KB)")
 
-    # Sanity checks
-    m_size = data["models"]["size"]
-    m_full = data["models"][model_key(PREDICTORS)]
-    m_sb = data["models"][model_key(["size", "bedrooms"])]
-    m_bed = data["models"]["bedrooms"]
+    # Sanity checks, solved from the shipped statistics as the template does
+    ss = data["ols"]
+    m_size = subset_ols(ss, ["size"])
+    m_full = subset_ols(ss, PREDICTORS)
+    m_sb = subset_ols(ss, ["size", "bedrooms"])
+    m_bed = subset_ols(ss, ["bedrooms"])
 
     print(f"[check] n = {m_full['n']} houses")
-    print(f"[check] bivariate bedrooms coef = ${m_bed['coefs']['bedrooms']:,.2f} (chapter: $23,667)")
-    print(f"[check] multiple bedrooms coef (size+bed) = ${m_sb['coefs']['bedrooms']:,.2f} (chapter: $1,553)")
-    print(f"[check] simple R² (size) = {m_size['r2']} (chapter: 0.6175)")
-    print(f"[check] simple adj R² (size) = {m_size['adj_r2']} (chapter: 0.6033)")
-    print(f"[check] full R² = {m_full['r2']} (chapter: 0.6506)")
-    print(f"[check] full adj R² = {m_full['adj_r2']} (chapter: 0.5552)")
-    print(f"[check] full AIC = {m_full['aic']} (chapter: 675.48)")
-    print(f"[check] full BIC = {m_full['bic']} (chapter: 685.05)")
-    print(f"[check] full size coef = ${m_full['coefs']['size']:.2f}/sqft (chapter: $68.37)")
-    print(f"[check] total models pre-computed: {len(data['models'])}")
+    print(f"[check] bivariate bedrooms coef = ${m_bed['coef'][1]:,.2f} (chapter: $23,667)")
+    print(f"[check] multiple bedrooms coef (size+bed) = ${m_sb['coef'][2]:,.2f} (chapter: $1,553)")
+    print(f"[check] simple R² (size) = {m_size['r2']:.4f} (chapter: 0.6175)")
+    print(f"[check] simple adj R² (size) = {m_size['adj_r2']:.4f} (chapter: 0.6033)")
+    print(f"[check] full R² = {m_full['r2']:.4f} (chapter: 0.6506)")
+    print(f"[check] full adj R² = {m_full['adj_r2']:.4f} (chapter: 0.5552)")
+    print(f"[check] full AIC = {m_full['aic']:.2f} (chapter: 675.48)")
+    print(f"[check] full BIC = {m_full['bic']:.2f} (chapter: 685.05)")
+    print(f"[check] full size coef = ${m_full['coef'][1]:.2f}/sqft (chapter: $68.37)")
+    print(f"[check] models the template can fit: {2 ** len(PREDICTORS) - 1} "
+          f"from a {len(ss['cp'])}x{len(ss['cp'])} cross-product matrix")
 
 
 if __name__ == "__main__":
@@ -1,20 +1,19 @@
 """Build the Chapter 12 interactive dashboard.
 
 Reads AED_HOUSE.DTA (29 houses) and AED_REALGDPPC.DTA (GDP growth),
-pre-computes OLS regressions with default and robust SEs, ACF values,
-and prediction interval components, then injects a compact JSON blob
-into template.html -> dashboard.html.
+computes the simple regression, the cross-products from which the
+template fits multiple regressions with default and robust SEs, ACF
+values and prediction interval components, then injects a compact JSON
+blob into template.html -> dashboard.html.
 """
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from statsmodels.formula.api import ols
-from statsmodels.tsa.stattools import acf
 
 HERE = Path(__file__).resolve().parent
 ROOT = HERE.parent.parent
@@ -22,6 +21,14 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.acf import correlogram  # noqa: E402
+from common.bundles import bundle_scripts, frame, ref  # noqa: E402
+from common.lttb import pyramid, step_axis  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+from common.suffstats import cross_products, subset_ols  # noqa: E402
+
 
 def ols_fit(x: np.ndarray, y: np.ndarray) -> dict:
     """Compute OLS regression y = b0 + b1*x and return stats."""
@@ -51,79 +58,24 @@ def ols_fit(x: np.ndarray, y: np.ndarray) -> dict:
 
 def load_house_data() -> dict:
     """Load AED_HOUSE.DTA and compute regressions."""
-    df = pd.read_stata(DATA_DIR / "AED_HOUSE.DTA")
-
-    # Raw data for scatter plots
-    price = [round(float(v), 2) for v in df["price"]]
-    size = [round(float(v), 2) for v in df["size"]]
-    bedrooms = [round(float(v), 2) for v in df["bedrooms"]]
-    bathrooms = [round(float(v), 2) for v in df["bathrooms"]]
-    lotsize = [round(float(v), 2) for v in df["lotsize"]]
-    age = [round(float(v), 2) for v in df["age"]]
-    monthsold = [round(float(v), 2) for v in df["monthsold"]]
+    df = frame("aed_house")
 
     # Simple regression: price ~ size
     simple = ols_fit(df["size"].values, df["price"].values)
 
-    # Multiple regression with default and robust SEs
+    # Multiple regression: the template fits it, with default and robust
+    # SEs, from these cross-products and the bundle's rows
     vars_list = ["size", "bedrooms", "bathrooms", "lotsize", "age", "monthsold"]
-    model_default = ols(
-        "price ~ size + bedrooms + bathrooms + lotsize + age + monthsold",
-        data=df,
-    ).fit()
-    model_robust = ols(
-        "price ~ size + bedrooms + bathrooms + lotsize + age + monthsold",
-        data=df,
-    ).fit(cov_type="HC1")
-
-    # Extract coefficients, default SEs, robust SEs
-    multi_coefs = {}
-    multi_se_default = {}
-    multi_se_robust = {}
-    multi_tstat_default = {}
-    multi_tstat_robust = {}
-    multi_pval_default = {}
-    multi_pval_robust = {}
-
-    all_vars = ["Intercept"] + vars_list
-    for v in all_vars:
-        multi_coefs[v] = round(float(model_default.params[v]), 4)
-        multi_se_default[v] = round(float(model_default.bse[v]), 4)
-        multi_se_robust[v] = round(float(model_robust.bse[v]), 4)
-        multi_tstat_default[v] = round(float(model_default.tvalues[v]), 4)
-        multi_tstat_robust[v] = round(float(model_robust.tvalues[v]), 4)
-        multi_pval_default[v] = round(float(model_default.pvalues[v]), 6)
-        multi_pval_robust[v] = round(float(model_robust.pvalues[v]), 6)
-
-    rmse_multi = round(float(np.sqrt(model_default.mse_resid)), 4)
-    r2_multi = round(float(model_default.rsquared), 4)
-
-    # Residuals for diagnostics
-    residuals_default = [round(float(v), 4) for v in model_default.resid]
-
-    return {
-        "price": price,
-        "size": size,
-        "bedrooms": bedrooms,
-        "bathrooms": bathrooms,
-        "lotsize": lotsize,
-        "age": age,
-        "monthsold": monthsold,
-        "n": len(df),
-        "simple": simple,
-        "vars": vars_list,
-        "allVars": all_vars,
-        "coefs": multi_coefs,
-        "seDefault": multi_se_default,
-        "seRobust": multi_se_robust,
-        "tstatDefault": multi_tstat_default,
-        "tstatRobust": multi_tstat_robust,
-        "pvalDefault": multi_pval_default,
-        "pvalRobust": multi_pval_robust,
-        "rmseMulti": rmse_multi,
-        "r2Multi": r2_multi,
-        "residuals": residuals_default,
-    }
+    cp = cross_products(df, "price", vars_list)
+
+    # Raw data for scatter plots comes from the shared AED_HOUSE bundle
+    return ref(
+        "aed_house", ["price"] + vars_list,
+        n=len(df),
+        simple=simple,
+        vars=vars_list,
+        ols=cp,
+    )
 
 
 def load_gdp_data() -> dict:
@@ -132,7 +84,7 @@ def load_gdp_data() -> dict:
 
     # Growth series (drop NaN)
     growth_series = df["growth"].dropna()
-    growth = [round(float(v), 4) for v in growth_series]
+    growth = col(growth_series, 4)
 
     # Corresponding quarter indices for time axis
     valid_idx = growth_series.index.tolist()
@@ -142,9 +94,8 @@ def load_gdp_data() -> dict:
     # Create date-like labels: year + quarter fraction
     time_vals = [round(y + (q % 4) * 0.25, 2) for y, q in zip(years, quarters)]
 
-    # ACF values
-    acf_vals = acf(growth_series, nlags=20, fft=False)
-    acf_list = [round(float(v), 6) for v in acf_vals]
+    # ACF, PACF, Bartlett bands and Ljung-Box Q up to lag 20
+    cg = correlogram({"growth": growth_series.to_numpy()}, nlags=20)["growth"]
 
     # Summary
     mean_growth = round(float(growth_series.mean()), 6)
@@ -152,9 +103,14 @@ def load_gdp_data() -> dict:
 
     return {
         "growth": growth,
-        "time": time_vals,
+        "axis": step_axis(time_vals, 0.25),
+        "lod": pyramid(time_vals, [growth_series.to_numpy()]),
         "n": len(growth),
-        "acf": acf_list,
+        "acf": col(cg["acf"], 6),
+        "pacf": col(cg["pacf"], 6),
+        "bartlett": col(cg["bartlett"], 6),
+        "ljungQ": col(cg["q"], 4),
+        "ljungP": [float(f"{v:.4g}") for v in cg["pvalue"]],
         "meanGrowth": mean_growth,
         "stdGrowth": std_growth,
     }
@@ -179,14 +135,11 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data, "lod", "ols"),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     h = data["house"]
@@ -197,11 +150,13 @@ def main() -> None:
         f"[check] simple regression: b0={h['simple']['b0']:.4f} "
         f"b1={h['simple']['b1']:.4f} R2={h['simple']['R2']:.4f}"
     )
+    multi = subset_ols(h["ols"], h["vars"])
     print(
-        f"[check] multi R2={h['r2Multi']:.4f} RMSE={h['rmseMulti']:.4f}"
+        f"[check] multi R2={multi['r2']:.4f} RMSE={multi['rmse']:.4f}"
     )
     print(f"[check] GDP growth: {g['n']} observations, mean={g['meanGrowth']:.4f}")
-    print(f"[check] ACF lag 1: {g['acf'][1]:.4f}")
+    print(f"[check] ACF lag 1: {g['acf'][1]:.4f}  PACF lag 2: {g['pacf'][2]:.4f}")
+    print(f"[check] Ljung-Box Q(12) = {g['ljungQ'][11]:.2f} (p = {g['ljungP'][11]:.3g})")
 
 
 if __name__ == "__main__":
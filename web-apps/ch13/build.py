@@ -7,7 +7,7 @@ pre-computes all regression results, and injects JSON into template.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -20,6 +20,19 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.memo import memoize  # noqa: E402
+from common.payload import col, iter_json  # noqa: E402
+from common.randinf import ClusterRandomization, randomization_test  # noqa: E402
+from common.rd import KERNELS, mse_bandwidth, rd_sweep  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+from common.simulate import SimulationRun, replicate_rng  # noqa: E402
+
+# Permutation runs are keyed on the engine's cross-products and the test settings;
+# their draws are checkpointed per engine so a tighter tol only adds draws
+randomization_test = memoize(randomization_test, deps=[ClusterRandomization, SimulationRun, replicate_rng])
+RANDINF_DIR = HERE.parent / ".cache" / "randinf"
+
 
 def r(v, d=4):
     return round(float(v), d)
@@ -36,10 +49,10 @@ def load_cobbdouglas() -> dict:
     pred_q = np.exp(pred_lnq) * np.exp(fit.resid.var() / 2)
     return {
         "year": [int(y) for y in df["year"]],
-        "q": [r(v, 2) for v in df["q"]],
-        "q_pred": [r(v, 2) for v in pred_q],
-        "lnk": [r(v) for v in df["lnk"]],
-        "lnl": [r(v) for v in df["lnl"]],
+        "q": col(df["q"], 2),
+        "q_pred": col(pred_q, 2),
+        "lnk": col(df["lnk"], 4),
+        "lnl": col(df["lnl"], 4),
         "alpha": r(fit.params["lnk"]), "beta": r(fit.params["lnl"]),
         "intercept": r(fit.params["const"]),
         "sum_ab": r(fit.params["lnk"] + fit.params["lnl"]),
@@ -60,10 +73,10 @@ def load_phillips() -> dict:
     fit_aux = sm.OLS(post["inflgdp1yr"], sm.add_constant(post[["urate"]])).fit()
     gamma = fit_aux.params["urate"]
     return {
-        "pre": {"urate": [r(v) for v in pre["urate"]], "inflgdp": [r(v) for v in pre["inflgdp"]],
+        "pre": {"urate": col(pre["urate"], 4), "inflgdp": col(pre["inflgdp"], 4),
                 "coef": r(fit_pre.params["urate"]), "intercept": r(fit_pre.params["const"]),
                 "r2": r(fit_pre.rsquared), "n": len(pre)},
-        "post": {"urate": [r(v) for v in post["urate"]], "inflgdp": [r(v) for v in post["inflgdp"]],
+        "post": {"urate": col(post["urate"], 4), "inflgdp": col(post["inflgdp"], 4),
                  "coef": r(fit_post.params["urate"]), "intercept": r(fit_post.params["const"]),
                  "r2": r(fit_post.rsquared), "n": len(post)},
         "augmented": {"coef_urate": r(fit_aug.params["urate"]), "coef_inflgdp1yr": r(fit_aug.params["inflgdp1yr"]),
@@ -85,8 +98,14 @@ def load_rand() -> dict:
     X = sm.add_constant(df1[["coins25", "coins50", "coins95", "coinsmixed", "coinsindiv"]])
     fit = sm.OLS(df1["spending"], X).fit(cov_type="cluster", cov_kwds={"groups": df1["idfamily"]})
     ftest = fit.f_test("coins25=coins50=coins95=coinsmixed=coinsindiv=0")
+    # Plans were assigned by family: permute family-level plans (one family
+    # switches plan within year 1; its first record's plan is used).
+    family_plan = df1.groupby("idfamily")[plans[1:]].transform("first")
+    engine = ClusterRandomization(df1["spending"], np.ones(len(df1)), family_plan, df1["idfamily"])
+    ri = randomization_test(engine, checkpoint=RANDINF_DIR)
     return {"plans": means, "f_stat": r(float(ftest.fvalue), 2), "f_p": r(float(ftest.pvalue)),
-            "r2": r(fit.rsquared), "n": len(df1)}
+            "r2": r(fit.rsquared), "n": len(df1),
+            "ri_p": r(ri["p"]), "ri_se": r(ri["mc_se"]), "ri_draws": ri["draws"], "ri_clusters": engine.G}
 
 
 def load_did() -> dict:
@@ -100,8 +119,14 @@ def load_did() -> dict:
     X = sm.add_constant(df[["hightreat", "post", "postXhigh"]])
     fit = sm.OLS(df["waz"], X).fit(cov_type="cluster", cov_kwds={"groups": df["idcommunity"]})
     ci = fit.conf_int().loc["postXhigh"]
+    # Clinic intensity is a community-level treatment: permute hightreat
+    # across communities, moving both hightreat and postXhigh.
+    base = np.column_stack([np.ones(len(df)), df["post"]])
+    engine = ClusterRandomization(df["waz"], base, df["hightreat"], df["idcommunity"], interact=base, test=[1])
+    ri = randomization_test(engine, checkpoint=RANDINF_DIR)
     return {"table": table, "coef": r(fit.params["postXhigh"]), "se": r(fit.bse["postXhigh"]),
-            "p": r(fit.pvalues["postXhigh"]), "ci_lo": r(float(ci.iloc[0])), "ci_hi": r(float(ci.iloc[1])), "n": len(df)}
+            "p": r(fit.pvalues["postXhigh"]), "ci_lo": r(float(ci.iloc[0])), "ci_hi": r(float(ci.iloc[1])), "n": len(df),
+            "ri_p": r(ri["p"]), "ri_se": r(ri["mc_se"]), "ri_draws": ri["draws"], "ri_clusters": engine.G}
 
 
 def load_rd() -> dict:
@@ -114,15 +139,26 @@ def load_rd() -> dict:
     binned = df.groupby("margin_bin", observed=True).agg(
         margin_mid=("margin", "mean"), vote_mean=("vote", "mean"), n=("vote", "count")).reset_index(drop=True)
     binned = binned[binned["n"] >= 3]
+    # Local-linear RD at the MSE-optimal bandwidth, plus the estimate over a
+    # bandwidth grid; one sorted pass per kernel serves the whole sweep.
+    grid = np.arange(4, 60.5, 0.5)
+    local, sweep = {}, {"h": col(grid, 1)}
+    for kernel in KERNELS:
+        h_opt = mse_bandwidth(df["margin"], df["vote"], kernel=kernel)
+        fit_h = rd_sweep(df["margin"], df["vote"], np.append(grid, h_opt), kernel=kernel)
+        local[kernel] = {"h": r(h_opt, 2), "est": r(fit_h["est"][-1]), "se": r(fit_h["se"][-1]),
+                         "lo": r(fit_h["lo"][-1]), "hi": r(fit_h["hi"][-1]),
+                         "n": int(fit_h["n_left"][-1] + fit_h["n_right"][-1])}
+        sweep[kernel] = {k: col(fit_h[k][:-1], 3) for k in ("est", "lo", "hi")}
     return {
-        "margin": [r(v, 2) for v in df["margin"]], "vote": [r(v, 2) for v in df["vote"]],
+        "margin": col(df["margin"], 2), "vote": col(df["vote"], 2),
         "win": [int(v) for v in df["win"]],
-        "binned_margin": [r(v, 2) for v in binned["margin_mid"]],
-        "binned_vote": [r(v, 2) for v in binned["vote_mean"]],
+        "binned_margin": col(binned["margin_mid"], 2),
+        "binned_vote": col(binned["vote_mean"], 2),
         "coef_win": r(fit.params["win"]), "coef_margin": r(fit.params["margin"]),
         "intercept": r(fit.params["const"]), "se_win": r(fit.bse["win"]),
         "p_win": r(fit.pvalues["win"], 6), "ci_lo": r(float(ci.iloc[0])), "ci_hi": r(float(ci.iloc[1])),
-        "r2": r(fit.rsquared), "n": len(df),
+        "r2": r(fit.rsquared), "n": len(df), "local": local, "sweep": sweep,
     }
 
 
@@ -137,8 +173,8 @@ def load_iv() -> dict:
     X_iv = sm.add_constant(df[["avexpr_hat"]])
     iv = sm.OLS(df["logpgp95"], X_iv).fit()
     return {
-        "logpgp95": [r(v) for v in df["logpgp95"]], "avexpr": [r(v) for v in df["avexpr"]],
-        "logem4": [r(v) for v in df["logem4"]], "avexpr_hat": [r(v) for v in df["avexpr_hat"]],
+        "logpgp95": col(df["logpgp95"], 4), "avexpr": col(df["avexpr"], 4),
+        "logem4": col(df["logem4"], 4), "avexpr_hat": col(df["avexpr_hat"], 4),
         "ols": {"coef": r(ols.params["avexpr"]), "intercept": r(ols.params["const"]),
                 "se": r(ols.bse["avexpr"]), "r2": r(ols.rsquared)},
         "first_stage": {"coef": r(fs.params["logem4"]), "intercept": r(fs.params["const"]),
@@ -162,12 +198,10 @@ def main() -> None:
     if not TEMPLATE.exists():
         raise SystemExit(f"Template not found: {TEMPLATE}")
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+    })
     size_kb = OUT_FILE.stat().st_size / 1024
     print(f"[ok] wrote {OUT_FILE.relative_to(ROOT)} ({size_kb:.1f} KB)")
     cd, ph, rnd = data["cobbdouglas"], data["phillips"], data["rand"]
@@ -175,8 +209,12 @@ def main() -> None:
     print(f"[check] Cobb-Douglas: alpha={cd['alpha']}, beta={cd['beta']}, sum={cd['sum_ab']}, CRS p={cd['crs_p']}")
     print(f"[check] Phillips pre: coef={ph['pre']['coef']}, post: coef={ph['post']['coef']}")
     print(f"[check] RAND F={rnd['f_stat']}, p={rnd['f_p']}, n={rnd['n']}")
+    print(f"[check] RAND randomization p={rnd['ri_p']} (±{rnd['ri_se']}, {rnd['ri_draws']} draws)")
     print(f"[check] DiD coef={did['coef']}, p={did['p']}, CI=[{did['ci_lo']},{did['ci_hi']}]")
+    print(f"[check] DiD randomization p={did['ri_p']} (±{did['ri_se']}, {did['ri_draws']} draws)")
     print(f"[check] RD win={rd['coef_win']}, CI=[{rd['ci_lo']},{rd['ci_hi']}], n={rd['n']}")
+    tri = rd["local"]["triangular"]
+    print(f"[check] RD local-linear h={tri['h']}: {tri['est']}, robust CI=[{tri['lo']},{tri['hi']}], n={tri['n']}")
     print(f"[check] IV: OLS={iv['ols']['coef']}, IV={iv['iv']['coef']}, 1st F={iv['first_stage']['f_stat']}")
 
 
@@ -7,7 +7,7 @@ template.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -20,16 +20,20 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+
 
 def ols_result(y, X, var_names):
     """Run OLS with HC1 robust SEs; return serializable dict."""
     m = sm.OLS(y, X).fit(cov_type="HC1")
     return {
         "vars": var_names,
-        "coef": [round(float(c), 2) for c in m.params],
-        "se": [round(float(s), 2) for s in m.bse],
-        "t": [round(float(t), 4) for t in m.tvalues],
-        "p": [round(float(p), 6) for p in m.pvalues],
+        "coef": col(m.params, 2),
+        "se": col(m.bse, 2),
+        "t": col(m.tvalues, 4),
+        "p": col(m.pvalues, 6),
         "r2": round(float(m.rsquared), 4),
         "r2_adj": round(float(m.rsquared_adj), 4),
         "n": int(m.nobs),
@@ -42,8 +46,8 @@ def build_data() -> dict:
     n = len(y)
 
     # --- raw data for scatter plots (education, earnings, gender) ---
-    education = [round(float(x), 1) for x in df["education"]]
-    earnings = [round(float(x), 2) for x in df["earnings"]]
+    education = col(df["education"], 1)
+    earnings = col(df["earnings"], 2)
     gender = [int(x) for x in df["gender"]]
     age = [int(x) for x in df["age"]]
     hours = [int(x) for x in df["hours"]]
@@ -188,14 +192,10 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     m1 = data["models"][0]
@@ -7,7 +7,7 @@ results into template.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -20,19 +20,23 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.payload import col, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+
 
 def ols_result(y, X, var_names):
     m = sm.OLS(y, X).fit(cov_type="HC1")
     return {
         "vars": var_names,
-        "coef": [round(float(c), 6) for c in m.params],
-        "se": [round(float(s), 6) for s in m.bse],
-        "t": [round(float(t), 4) for t in m.tvalues],
-        "p": [round(float(p), 6) for p in m.pvalues],
+        "coef": col(m.params, 6),
+        "se": col(m.bse, 6),
+        "t": col(m.tvalues, 4),
+        "p": col(m.pvalues, 6),
         "r2": round(float(m.rsquared), 4),
         "n": int(m.nobs),
-        "resid": [round(float(r), 2) for r in m.resid],
-        "fitted": [round(float(f), 4) for f in m.fittedvalues],
+        "resid": col(m.resid, 2),
+        "fitted": col(m.fittedvalues, 4),
     }
 
 
@@ -46,9 +50,9 @@ def build_data() -> dict:
 
     # --- scatter data ---
     scatter = {
-        "education": [round(float(x), 1) for x in df["education"]],
-        "earnings": [round(float(x), 2) for x in df["earnings"]],
-        "lnearnings": [round(float(x), 4) for x in df["lnearnings"]],
+        "education": col(df["education"], 1),
+        "earnings": col(df["earnings"], 2),
+        "lnearnings": col(df["lnearnings"], 4),
         "age": [int(x) for x in df["age"]],
         "gender": [int(x) for x in df["gender"]],
     }
@@ -175,14 +179,10 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     ml = data["models"]["levels_educ"]
@@ -7,14 +7,14 @@ a compact JSON blob into template.html -> dashboard.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 from statsmodels.formula.api import ols
-from statsmodels.stats.outliers_influence import variance_inflation_factor, OLSInfluence
+from statsmodels.stats.outliers_influence import variance_inflation_factor
 
 HERE = Path(__file__).resolve().parent
 ROOT = HERE.parent.parent
@@ -24,6 +24,26 @@ OUT_FILE = HERE / "dashboard.html"
 
 GITHUB_DATA_URL = "https://raw.githubusercontent.com/quarcs-lab/data-open/master/AED/"
 
+sys.path.insert(0, str(HERE.parent))
+from common.binscatter import binscatter  # noqa: E402
+from common.jackknife import Downdater, jackknife  # noqa: E402
+from common.lowess import lowess_multi  # noqa: E402
+from common.payload import col, decode, iter_json, typed  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+
+
+def residual_smooth(yhat: np.ndarray, uhat: np.ndarray) -> dict:
+    """LOWESS (frac=0.3) of residuals on fitted values, as in the chapter.
+
+    No ``delta``: with ~130 countries every point gets its own local fit,
+    matching the book's ``lowess(uhat, yhat, frac=0.3)``.
+    """
+    res = lowess_multi(yhat, uhat, [0.3])
+    return {
+        "x": col(res["x"], 4),
+        "y": col(res["fits"][0], 4),
+    }
+
 
 def ols_fit_simple(x: np.ndarray, y: np.ndarray) -> dict:
     """Compute OLS y = b0 + b1*x and return stats."""
@@ -84,13 +104,19 @@ def load_earnings() -> dict:
         "matrix": [[round(corr.iloc[i, j], 4) for j in range(3)] for i in range(3)],
     }
 
-    # SE comparison (standard vs robust)
+    # Delete-state jackknife: one block downdate of the full fit per state
+    dd = Downdater(m_base.model.exog, m_base.model.endog)
+    states, beta_states = dd.drop_clusters(df["statefip"])
+    jk_state = jackknife(beta_states, dd.beta)
+
+    # SE comparison (standard vs robust vs delete-state jackknife)
     se_compare = {}
-    for var in ["Intercept", "age", "education"]:
+    for j, var in enumerate(m_base.model.exog_names):
         se_compare[var] = {
             "standard": round(float(m_base.bse[var]), 2),
             "robust": round(float(m_base_rob.bse[var]), 2),
             "ratio": round(float(m_base_rob.bse[var] / m_base.bse[var]), 4),
+            "jackknife": round(float(jk_state["se"][j]), 2),
         }
 
     # Residuals for heteroskedasticity visualization
@@ -99,10 +125,7 @@ def load_earnings() -> dict:
 
     return {
         "n": len(df),
-        "age": [round(float(v), 1) for v in df["age"]],
-        "education": [round(float(v), 1) for v in df["education"]],
-        "earnings": [round(float(v), 0) for v in df["earnings"]],
-        "agebyeduc": [round(float(v), 1) for v in df["agebyeduc"]],
+        "nStates": len(states),
         "baseModel": {
             "params": {k: round(float(v), 4) for k, v in m_base.params.items()},
             "se_standard": {k: round(float(v), 4) for k, v in m_base.bse.items()},
@@ -119,11 +142,18 @@ def load_earnings() -> dict:
         "vifCollinear": vif_coll,
         "correlation": corr_dict,
         "seCompare": se_compare,
-        "yhat": [round(float(v), 2) for v in yhat_base],
-        "residuals": [round(float(v), 2) for v in resid_base],
+        "yhat": typed(yhat_base, 2),
+        "residuals": typed(resid_base, 2),
+        "residBins": binned_abs_residuals(yhat_base, resid_base),
     }
 
 
+def binned_abs_residuals(yhat: np.ndarray, resid: np.ndarray, bins: int = 20) -> dict:
+    """Mean |residual| over quantile bins of the fitted value, with 95% CIs."""
+    bs = binscatter(yhat, np.abs(resid), bins=bins)
+    return {k: col(bs[k], 1) for k in ("x", "y", "lo", "hi")}
+
+
 def load_democracy() -> dict:
     """Load democracy data and compute regression + influence diagnostics."""
     df = pd.read_stata(DATA_DIR / "AED_DEMOCRACY.DTA")
@@ -143,10 +173,12 @@ def load_democracy() -> dict:
         data=df,
     ).fit()
 
-    # Influence diagnostics
-    influence = OLSInfluence(m_mult_std)
-    dfits_vals = influence.dffits[0]
-    dfbetas_vals = influence.dfbetas
+    # Influence diagnostics from delete-one downdates of the full fit
+    dd = Downdater(m_mult_std.model.exog, m_mult_std.model.endog)
+    loo = dd.drop_one()
+    s_i = np.sqrt(loo["s2"])
+    dfits_vals = dd.resid * np.sqrt(dd.hat) / (s_i * (1 - dd.hat))
+    dfbetas_vals = (dd.beta - loo["beta"]) / (s_i[:, None] * np.sqrt(np.diag(dd.XtX_inv)))
     n = len(df)
     k = len(m_mult.params)
     thresh_dfits = 2 * np.sqrt(k / n)
@@ -168,30 +200,32 @@ def load_democracy() -> dict:
         "n": n,
         "k": k,
         "countries": df["country"].tolist(),
-        "democracy": [round(float(v), 4) for v in df["democracy"]],
-        "growth": [round(float(v), 4) for v in df["growth"]],
+        "democracy": typed(df["democracy"], 4),
+        "growth": typed(df["growth"], 4),
         "bivariate": {
             "b0": round(float(m_biv.params["Intercept"]), 4),
             "b1": round(float(m_biv.params["growth"]), 4),
             "se": round(float(m_biv.bse["growth"]), 4),
             "R2": round(float(m_biv.rsquared), 4),
-            "yhat": [round(float(v), 4) for v in yhat_biv],
-            "resid": [round(float(v), 4) for v in uhat_biv],
+            "yhat": typed(yhat_biv, 4),
+            "resid": typed(uhat_biv, 4),
+            "lowess": residual_smooth(yhat_biv, uhat_biv),
         },
         "multiple": {
             "params": {k_: round(float(v), 6) for k_, v in m_mult.params.items()},
             "se": {k_: round(float(v), 6) for k_, v in m_mult.bse.items()},
             "R2": round(float(m_mult.rsquared), 4),
-            "yhat": [round(float(v), 4) for v in yhat],
-            "resid": [round(float(v), 4) for v in uhat],
+            "yhat": typed(yhat, 4),
+            "resid": typed(uhat, 4),
+            "lowess": residual_smooth(yhat, uhat),
         },
         "controlVars": ["constraint", "indcent", "catholic", "muslim", "protestant"],
         "controlData": {
-            col: [round(float(v), 4) for v in df[col]]
+            col: typed(df[col], 4)
             for col in ["constraint", "indcent", "catholic", "muslim", "protestant"]
         },
-        "dfits": [round(float(v), 4) for v in dfits_vals],
-        "dfbetasGrowth": [round(float(v), 4) for v in dfbetas_growth],
+        "dfits": typed(dfits_vals, 4),
+        "dfbetasGrowth": typed(dfbetas_growth, 4),
         "threshDfits": round(float(thresh_dfits), 4),
         "threshDfbetas": round(float(thresh_dfbetas), 4),
         "pctReduction": round(
@@ -222,14 +256,10 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     e = data["earnings"]
@@ -245,6 +275,10 @@ def main() -> None:
         f"[check] SE ratio (education): "
         f"{e['seCompare']['education']['ratio']:.4f}"
     )
+    print(
+        f"[check] SE(education) delete-state jackknife: "
+        f"{e['seCompare']['education']['jackknife']} ({e['nStates']} states)"
+    )
     print(f"[check] democracy: {d['n']} countries")
     print(
         f"[check] growth coef: bivariate={d['bivariate']['b1']:.4f}, "
@@ -253,7 +287,7 @@ def main() -> None:
     )
     print(
         f"[check] DFITS threshold: {d['threshDfits']:.4f}, "
-        f"influential: {sum(1 for v in d['dfits'] if abs(v) > d['threshDfits'])}"
+        f"influential: {int((np.abs(decode(d['dfits'])) > d['threshDfits']).sum())}"
     )
 
 
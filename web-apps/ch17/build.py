@@ -7,13 +7,12 @@ regressions, ACF values, and ADL model, then injects JSON into template.html.
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
-from statsmodels.tsa.stattools import acf
 
 HERE = Path(__file__).resolve().parent
 ROOT = HERE.parent.parent
@@ -21,6 +20,16 @@ DATA_DIR = ROOT / "data"
 TEMPLATE = HERE / "template.html"
 OUT_FILE = HERE / "dashboard.html"
 
+sys.path.insert(0, str(HERE.parent))
+from common.acf import correlogram  # noqa: E402
+from common.binscatter import binscatter  # noqa: E402
+from common.lags import lag_design  # noqa: E402
+from common.lttb import date_axis, pyramid  # noqa: E402
+from common.moments import Moments  # noqa: E402
+from common.payload import col, decode, iter_json  # noqa: E402
+from common.render import render_template, shared_js  # noqa: E402
+from common.sketch import QuantileSketch  # noqa: E402
+
 
 def r(v, d=4):
     return round(float(v), d)
@@ -37,8 +46,8 @@ def load_nba() -> dict:
 
     # Raw data for scatter
     nba = {
-        "lnrevenue": [r(v) for v in df["lnrevenue"]],
-        "wins": [r(v, 1) for v in df["wins"]],
+        "lnrevenue": col(df["lnrevenue"], 4),
+        "wins": col(df["wins"], 1),
         "teamid": [int(v) for v in df["teamid"]],
         "team": df["team"].tolist(),
         "season": [int(v) for v in df["season"]],
@@ -47,23 +56,29 @@ def load_nba() -> dict:
         "n_obs": len(df),
     }
 
-    # Variance decomposition
-    overall_mean = float(df["lnrevenue"].mean())
-    overall_std = float(df["lnrevenue"].std())
-    between_std = float(df.groupby("teamid")["lnrevenue"].mean().std())
-    within = df["lnrevenue"] - df.groupby("teamid")["lnrevenue"].transform("mean") + overall_mean
-    within_std = float(within.std())
-
-    # Same for wins
-    wins_overall = float(df["wins"].std())
-    wins_between = float(df.groupby("teamid")["wins"].mean().std())
-    wins_within_vals = df["wins"] - df.groupby("teamid")["wins"].transform("mean") + df["wins"].mean()
-    wins_within = float(wins_within_vals.std())
+    # Variance decomposition: one scan gives per-team moments of both
+    # variables; overall, between (SD of team means) and within SD follow.
+    codes = np.searchsorted(teams, df["teamid"])
+    acc = Moments(len(teams)).update(df[["lnrevenue", "wins"]].to_numpy(), groups=codes)
+    overall = acc.total().std()
+    between = Moments().update(acc.mean).std()
+    within = acc.within_std()
 
     nba["variance"] = {
-        "lnrevenue": {"overall": r(overall_std), "between": r(between_std), "within": r(within_std)},
-        "wins": {"overall": r(wins_overall, 2), "between": r(wins_between, 2), "within": r(wins_within, 2)},
+        "lnrevenue": {"overall": r(overall[0]), "between": r(between[0]), "within": r(within[0])},
+        "wins": {"overall": r(overall[1], 2), "between": r(between[1], 2), "within": r(within[1], 2)},
     }
+    # Robust counterpart: one quantile sketch per team, merged for the pooled
+    # quartiles; the spread of the team medians is the between part.
+    for name, d in (("lnrevenue", 4), ("wins", 2)):
+        values = df[name].to_numpy(dtype=float)
+        per_team = [QuantileSketch().update(values[codes == g]) for g in range(len(teams))]
+        pooled = QuantileSketch()
+        for sketch in per_team:
+            pooled.merge(sketch)
+        q1, q3 = pooled.quantile([0.25, 0.75])
+        m1, m3 = np.quantile([sketch.median() for sketch in per_team], [0.25, 0.75])
+        nba["variance"][name].update(iqr=r(q3 - q1, d), iqr_between=r(m3 - m1, d))
 
     # Pooled OLS with 3 SE types
     X = sm.add_constant(df[["wins"]])
@@ -104,8 +119,17 @@ def load_nba() -> dict:
     }
 
     # De-meaned data for FE scatter
-    nba["demeaned_lnrev"] = [r(v) for v in df["lnrev_dm"]]
-    nba["demeaned_wins"] = [r(v, 1) for v in df["wins_dm"]]
+    nba["demeaned_lnrev"] = col(df["lnrev_dm"], 4)
+    nba["demeaned_wins"] = col(df["wins_dm"], 1)
+
+    # Binned scatters (15 quantile bins of wins, 95% CIs) for both views
+    nba["bins"] = {
+        view: {k: col(bs[k], 4) for k in ("x", "y", "lo", "hi")}
+        for view, bs in (
+            ("pooled", binscatter(df["wins"], df["lnrevenue"], bins=15)),
+            ("fe", binscatter(df["wins_dm"], df["lnrev_dm"], bins=15)),
+        )
+    }
 
     return nba
 
@@ -117,15 +141,20 @@ def load_nba() -> dict:
 def load_interest_rates() -> dict:
     df = pd.read_stata(DATA_DIR / "AED_INTERESTRATES.DTA")
 
-    # Time series data
-    dates = [str(d.date()) if hasattr(d, "date") else str(d)[:10] for d in pd.to_datetime(df["date"])]
-    gs10 = [r(v) for v in df["gs10"]]
-    gs1 = [r(v) for v in df["gs1"]]
-    dgs10 = [None if pd.isna(v) else r(v) for v in df["dgs10"]]
-    dgs1 = [None if pd.isna(v) else r(v) for v in df["dgs1"]]
+    # Time series data: month offsets, plus LTTB levels for each view of the chart
+    axis = date_axis(df["date"], "month")
+    months = decode(axis["offset"])
+    gs10 = col(df["gs10"], 4)
+    gs1 = col(df["gs1"], 4)
+    dgs10 = col(df["dgs10"], 4)
+    dgs1 = col(df["dgs1"], 4)
 
     ts = {
-        "dates": dates,
+        "axis": axis,
+        "lod": {
+            "levels": pyramid(months, [df["gs10"], df["gs1"]]),
+            "changes": pyramid(months, [df["dgs10"], df["dgs1"]]),
+        },
         "gs10": gs10,
         "gs1": gs1,
         "dgs10": dgs10,
@@ -137,7 +166,6 @@ def load_interest_rates() -> dict:
     X_lev = sm.add_constant(df[["gs1"]])
     lev = sm.OLS(df["gs10"], X_lev).fit()
     lev_hac = sm.OLS(df["gs10"], X_lev).fit(cov_type="HAC", cov_kwds={"maxlags": 24})
-    resid_acf_lev = acf(lev.resid, nlags=24)
 
     ts["levels"] = {
         "coef": r(lev.params["gs1"]),
@@ -146,33 +174,27 @@ def load_interest_rates() -> dict:
         "se_default": r(lev.bse["gs1"]),
         "se_hac": r(lev_hac.bse["gs1"]),
         "se_ratio": r(lev_hac.bse["gs1"] / lev.bse["gs1"], 2),
-        "acf": [r(v) for v in resid_acf_lev],
     }
 
     # Changes regression
     df_ch = df.dropna(subset=["dgs10", "dgs1"]).copy()
     X_ch = sm.add_constant(df_ch[["dgs1"]])
     chg = sm.OLS(df_ch["dgs10"], X_ch).fit()
-    resid_acf_ch = acf(chg.resid, nlags=24)
 
     ts["changes"] = {
         "coef": r(chg.params["dgs1"]),
         "intercept": r(chg.params["const"]),
         "r2": r(chg.rsquared),
         "se_default": r(chg.bse["dgs1"]),
-        "acf": [r(v) for v in resid_acf_ch],
     }
 
-    # ADL(2,2) model
-    df_ch["dgs10_L1"] = df_ch["dgs10"].shift(1)
-    df_ch["dgs10_L2"] = df_ch["dgs10"].shift(2)
-    df_ch["dgs1_L1"] = df_ch["dgs1"].shift(1)
-    df_ch["dgs1_L2"] = df_ch["dgs1"].shift(2)
-    df_adl = df_ch.dropna().copy()
-    adl_vars = ["dgs10_L1", "dgs10_L2", "dgs1", "dgs1_L1", "dgs1_L2"]
-    X_adl = sm.add_constant(df_adl[adl_vars])
-    adl = sm.OLS(df_adl["dgs10"], X_adl).fit()
-    resid_acf_adl = acf(adl.resid, nlags=24)
+    # ADL(2,2) model, on the months where every series in the file is
+    # observed (2006 on), the sample of the chapter's reported estimates
+    design = lag_design(df, {"dgs10": [1, 2], "dgs1": [0, 1, 2]}, y="dgs10",
+                        mask=df.notna().all(axis=1).to_numpy())
+    adl_vars = design["names"]
+    X_adl = sm.add_constant(pd.DataFrame(design["X"], columns=adl_vars))
+    adl = sm.OLS(design["y"], X_adl).fit()
 
     ts["adl"] = {
         "coefs": {v: r(adl.params[v]) for v in adl_vars},
@@ -180,9 +202,16 @@ def load_interest_rates() -> dict:
         "se": {v: r(adl.bse[v]) for v in adl_vars},
         "pvals": {v: r(adl.pvalues[v]) for v in adl_vars},
         "r2": r(adl.rsquared),
-        "acf": [r(v) for v in resid_acf_adl],
     }
 
+    # Residual correlograms for all three models in one batched FFT
+    resid = {"levels": lev.resid, "changes": chg.resid, "adl": adl.resid}
+    for name, cg in correlogram(resid, nlags=24).items():
+        ts[name]["acf"] = col(cg["acf"], 4)
+        ts[name]["acf_band"] = r(cg["band"])
+        ts[name]["ljung_q12"] = r(cg["q"][11], 2)
+        ts[name]["ljung_p12"] = float(f"{cg['pvalue'][11]:.4g}")
+
     # Cumulative multipliers for ADL
     gamma = [adl.params["dgs1"], adl.params["dgs1_L1"], adl.params["dgs1_L2"]]
     cumulative = [r(sum(gamma[:i+1])) for i in range(len(gamma))]
@@ -217,14 +246,10 @@ def main() -> None:
         raise SystemExit(f"Template not found: {TEMPLATE}")
 
     data = build_data()
-    data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-    template = TEMPLATE.read_text(encoding="utf-8")
-    if "{{DATA_JSON}}" not in template:
-        raise SystemExit("Placeholder {{DATA_JSON}} not found in template")
-
-    rendered = template.replace("{{DATA_JSON}}", data_json)
-    OUT_FILE.write_text(rendered, encoding="utf-8")
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "SHARED_JS": shared_js(data, "lod"),
+    })
 
     size_kb = OUT_FILE.stat().st_size / 1024
     print(f"[ok] wrote {OUT_FILE.relative_to(ROOT)} ({size_kb:.1f} KB)")
@@ -0,0 +1,7 @@
+"""Shared helpers for the chapter dashboard builds.
+
+Each ``web-apps/chNN/build.py`` stays a standalone script; modules in this
+package hold the numerical engines several chapters reuse. Build scripts put
+``web-apps/`` on ``sys.path`` and import the submodule they need, e.g.
+``from common.randinf import ClusterRandomization``.
+"""
@@ -0,0 +1,164 @@
+"""Datasets shared by several dashboards, shipped once as content-hashed files.
+
+AED_HOUSE, AED_EARNINGS, AED_REALGDPPC and the 2014 convergence-clubs
+cross-section each feed several chapters. Rather than embed the same
+columns in every dashboard, a build refers to a bundle:
+
+    data = {"house": ref("aed_house", ["price", "size"], regression=reg)}
+
+``bundle_scripts(data, out_dir)`` then writes each referenced bundle to
+``web-apps/bundles/<name>.<hash>.js`` (a script that registers its columns
+on ``window.METRICSAI_BUNDLES``) and returns the ``<script src>`` tags for
+the template's ``{{DATA_BUNDLES}}`` placeholder. The hash is of the file's
+content, so a browser can cache it indefinitely and a student opening
+several chapters downloads and parses each dataset once.
+
+``decodeTyped`` (``common/js/decode.js``) replaces a reference with the picked
+columns (copies, so charts can sort them in place) plus the reference's
+other keys. ``ref(name, "price")`` resolves to the bare column instead.
+
+With ``METRICSAI_INLINE_BUNDLES=1`` the same scripts are written inline,
+which gives a self-contained single-file dashboard for offline use.
+
+Builds compute their statistics from ``frame(name)``, the unrounded rows
+the bundle ships, so results do not depend on the shipped precision.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .payload import col, to_json
+
+WEB_APPS = Path(__file__).resolve().parent.parent
+DATA_DIR = WEB_APPS.parent / "data"
+BUNDLE_DIR = WEB_APPS / "bundles"
+
+CONVERGENCE_URL = (
+    "https://raw.githubusercontent.com/quarcs-lab/mendez2020-convergence-clubs-code-data"
+    "/master/assets/dat.csv"
+)
+CONVERGENCE_CACHE = DATA_DIR / "mendez2020_convergence.csv"
+
+
+def _realgdppc(path: Path) -> pd.DataFrame:
+    df = pd.read_stata(path)
+    df = df.dropna(subset=["realgdppc"]).reset_index(drop=True)
+    df["dates"] = pd.to_datetime(df["daten"]).dt.strftime("%Y-%m-%d")
+    return df
+
+
+def _convergence_2014(path: Path) -> pd.DataFrame:
+    if path.exists():
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_csv(CONVERGENCE_URL)
+        df.to_csv(path, index=False)
+        print(f"[cache] saved {path.relative_to(WEB_APPS.parent)}")
+    df = df[df["year"] == 2014].dropna(subset=["GDPpc", "lp", "kl", "h"])
+    return df.reset_index(drop=True)
+
+
+# name -> (loader, file under data/, {column: decimals}); None ships a column
+# as is. build_all.py reads the file names to know which chapters a dataset
+# feeds, so a loader must read only its own file.
+BUNDLES = {
+    "aed_house": (pd.read_stata, "AED_HOUSE.DTA",
+                  {"price": None, "size": None, "bedrooms": None, "bathrooms": 1,
+                   "lotsize": None, "age": 0, "monthsold": None}),
+    "aed_earnings": (pd.read_stata, "AED_EARNINGS.DTA",
+                     {"earnings": None, "education": None, "age": None, "gender": 0}),
+    "aed_realgdppc": (_realgdppc, "AED_REALGDPPC.DTA", {"dates": None, "realgdppc": 2, "growth": 4}),
+    "convergence_2014": (_convergence_2014, CONVERGENCE_CACHE.name,
+                         {"country": None, "GDPpc": 2, "lp": 2, "kl": 2, "h": 4}),
+}
+
+
+def source(name: str) -> Path:
+    """The ``data/`` file bundle ``name`` is built from."""
+    return DATA_DIR / BUNDLES[name][1]
+
+
+@functools.lru_cache(maxsize=None)
+def _frame(name: str) -> pd.DataFrame:
+    loader, _, decimals = BUNDLES[name]
+    return loader(source(name))[list(decimals)]
+
+
+def frame(name: str) -> pd.DataFrame:
+    """The rows and columns bundle ``name`` ships, at full precision."""
+    return _frame(name).copy()
+
+
+@functools.lru_cache(maxsize=None)
+def _script(name: str) -> str:
+    """The bundle's registration script."""
+    df = _frame(name)
+    columns = {}
+    for c, d in BUNDLES[name][2].items():
+        columns[c] = df[c].tolist() if d is None else col(df[c], d)
+    body = to_json(columns).replace("</", "<\\/")
+    return f'(window.METRICSAI_BUNDLES = window.METRICSAI_BUNDLES || {{}})["{name}"] = {body};\n'
+
+
+def ref(name: str, pick=None, **extra) -> dict:
+    """A payload node the template resolves to columns of bundle ``name``.
+
+    ``pick`` is a column name (the node becomes that array), a list of
+    columns, or a mapping from payload key to column; None picks them all.
+    ``extra`` keys are carried alongside the picked columns.
+    """
+    if name not in BUNDLES:
+        raise KeyError(f"Unknown data bundle: {name!r}")
+    if pick is None:
+        pick = list(BUNDLES[name][2])
+    if isinstance(pick, (list, tuple)):
+        pick = {c: c for c in pick}
+    wanted = [pick] if isinstance(pick, str) else list(pick.values())
+    missing = sorted(set(wanted) - set(BUNDLES[name][2]))
+    if missing:
+        raise KeyError(f"Bundle {name!r} has no column(s) {missing}")
+    return {"$bundle": name, "pick": pick, **extra}
+
+
+def _refs(obj, found: set) -> set:
+    if isinstance(obj, dict):
+        if "$bundle" in obj:
+            found.add(obj["$bundle"])
+        for v in obj.values():
+            _refs(v, found)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            _refs(v, found)
+    return found
+
+
+def bundle_scripts(data: dict, out_dir: Path, inline: bool | None = None) -> str:
+    """``<script>`` tags for every bundle ``data`` refers to, writing the files.
+
+    ``inline`` defaults to the ``METRICSAI_INLINE_BUNDLES`` environment variable.
+    """
+    if inline is None:
+        inline = os.environ.get("METRICSAI_INLINE_BUNDLES") == "1"
+    tags = []
+    for name in sorted(_refs(data, set())):
+        script = _script(name)
+        if inline:
+            tags.append(f"<script>{script.rstrip()}</script>")
+            continue
+        digest = hashlib.sha256(script.encode("utf-8")).hexdigest()[:10]
+        path = BUNDLE_DIR / f"{name}.{digest}.js"
+        if not path.exists():
+            # Chapters build in parallel; publish each file atomically.
+            BUNDLE_DIR.mkdir(exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(script, encoding="utf-8")
+            os.replace(tmp, path)
+        src = Path(os.path.relpath(path, out_dir)).as_posix()
+        tags.append(f'<script src="{src}"></script>')
+    return "\n".join(tags)
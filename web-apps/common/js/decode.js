@@ -0,0 +1,31 @@
+// Shared datasets arrive as references to a bundle script (see common/bundles.py)
+function resolveBundle(node) {
+  var bundle = (window.METRICSAI_BUNDLES || {})[node.$bundle];
+  if (!bundle) throw new Error("Data bundle '" + node.$bundle + "' did not load");
+  if (typeof node.pick === "string") return bundle[node.pick].slice();
+  var out = {};
+  for (var key in node.pick) out[key] = bundle[node.pick[key]].slice();
+  for (var k in node) if (k !== "$bundle" && k !== "pick") out[k] = decodeTyped(node[k]);
+  return out;
+}
+
+// Numeric columns may arrive as base64 typed arrays (see common/payload.py)
+function decodeTyped(node) {
+  if (Array.isArray(node)) return node.map(decodeTyped);
+  if (node === null || typeof node !== "object") return node;
+  if (node.$bundle) return resolveBundle(node);
+  if (!node.$typed) { for (var k in node) node[k] = decodeTyped(node[k]); return node; }
+  var bin = atob(node.b64), bytes = new Uint8Array(bin.length);
+  for (var i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+  var T = { i8: Int8Array, i16: Int16Array, i32: Int32Array, f32: Float32Array, f64: Float64Array }[node.$typed];
+  var raw = new T(bytes.buffer), isInt = node.$typed.charAt(0) === "i";
+  var f = Math.pow(10, node.p || 0), o = node.o || 0, out = new Array(raw.length);
+  for (var j = 0; j < raw.length; j++) {
+    var q = raw[j];
+    out[j] = isInt ? (q === node.miss ? null : (o + q) / f) : (q === q ? q : null);
+  }
+  if (!node.cols) return out;
+  var rows = [];
+  for (var r = 0; r < out.length; r += node.cols) rows.push(out.slice(r, r + node.cols));
+  return rows;
+}
@@ -0,0 +1,6 @@
+// The payload in <script id="...">, parsed. decode.js is shipped only when
+// it holds typed arrays or bundle references (see common/scripts.py).
+function loadData(id) {
+  var data = JSON.parse(document.getElementById(id).textContent);
+  return typeof decodeTyped === "function" ? decodeTyped(data) : data;
+}
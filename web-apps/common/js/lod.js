@@ -0,0 +1,64 @@
+// Port of common/lttb.py's axes and levels. x values travel as integer
+// offsets from axis.start, in calendar units (axis.unit) or a numeric step.
+function axisValues(axis) {
+  var months = { month: 1, quarter: 3, year: 12 }[axis.unit];
+  return axis.offset.map(function(k) {
+    if (axis.step !== undefined) return axis.start + k * axis.step;
+    var d = new Date(axis.start + "T00:00:00Z");
+    if (months) d.setUTCMonth(d.getUTCMonth() + k * months);
+    else d.setUTCDate(d.getUTCDate() + k);
+    return d.toISOString().slice(0, 10);
+  });
+}
+
+// Offset of a Plotly axis range end: a number or a "YYYY-MM-DD hh:mm" string.
+function axisOffset(axis, v) {
+  if (axis.step !== undefined) return (v - axis.start) / axis.step;
+  var t = Date.parse(String(v).replace(" ", "T").slice(0, 19) + "Z"), s = new Date(axis.start + "T00:00:00Z");
+  if (!axis.unit || axis.unit === "day") return (t - s.getTime()) / 864e5;
+  var d = new Date(t);
+  var m = (d.getUTCFullYear() - s.getUTCFullYear()) * 12 + d.getUTCMonth() - s.getUTCMonth() + (d.getUTCDate() - 1) / 31;
+  return m / { month: 1, quarter: 3, year: 12 }[axis.unit];
+}
+
+// A level's indices from its shipped gaps (first index, then differences),
+// summed once and kept on the array.
+function lodLevel(gaps) {
+  if (!gaps.idx) {
+    var s = 0;
+    gaps.idx = gaps.map(function(g) { return s += g; });
+  }
+  return gaps.idx;
+}
+
+// Indices to draw: the coarsest LTTB level with at least one point per two
+// pixels of `el` between offsets lo and hi, or null for the full series.
+function lodIndices(levels, offsets, el, lo, hi) {
+  var budget = Math.max(100, Math.round((el.clientWidth || 700) / 2));
+  for (var i = 0; i < levels.length; i++) {
+    var idx = lodLevel(levels[i]), count = 0;
+    for (var j = 0; j < idx.length; j++) {
+      var o = offsets[idx[j]];
+      if (o >= lo && o <= hi) count++;
+    }
+    if (count >= budget) return idx;
+  }
+  return null;
+}
+
+function lodPick(values, idx) {
+  return idx ? idx.map(function(i) { return values[i]; }) : values;
+}
+
+// Calls onZoom([lo, hi]) in offsets when `el`'s x axis is zoomed or panned,
+// and onZoom(null) when it is reset, so the chart can redraw another level.
+// Call it after drawing `el`; it binds once.
+function lodOnZoom(el, axis, onZoom) {
+  if (el.__lodZoom || !el.on) return;
+  el.__lodZoom = true;
+  el.on("plotly_relayout", function(ev) {
+    var r = ev["xaxis.range"] || (ev["xaxis.range[0]"] !== undefined && [ev["xaxis.range[0]"], ev["xaxis.range[1]"]]);
+    if (r) onZoom([axisOffset(axis, r[0]), axisOffset(axis, r[1])]);
+    else if (ev["xaxis.autorange"]) onZoom(null);
+  });
+}
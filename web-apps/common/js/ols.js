@@ -0,0 +1,90 @@
+// Port of common/suffstats.py: y on a constant and any subset of the shipped
+// regressors, from their means and centred cross-products (`ss`, e.g.
+// DATA.ols). HC1 SEs, fitted values and residuals also use the rows in
+// `cols`. t and F p-values come from the page's betaInc and tQuantile.
+function invertMatrix(A) {
+  var n = A.length;
+  var M = A.map(function(row, i) { return row.concat(A.map(function(_, j) { return i === j ? 1 : 0; })); });
+  for (var c = 0; c < n; c++) {
+    var piv = c;
+    for (var r = c + 1; r < n; r++) if (Math.abs(M[r][c]) > Math.abs(M[piv][c])) piv = r;
+    var tmp = M[c]; M[c] = M[piv]; M[piv] = tmp;
+    var d = M[c][c];
+    for (var j = 0; j < 2 * n; j++) M[c][j] /= d;
+    for (r = 0; r < n; r++) {
+      var f = M[r][c];
+      if (r === c || f === 0) continue;
+      for (j = 0; j < 2 * n; j++) M[r][j] -= f * M[c][j];
+    }
+  }
+  return M.map(function(row) { return row.slice(n); });
+}
+
+function olsSubset(ss, vars, cols, alpha) {
+  alpha = alpha || 0.05;
+  var idx = vars.map(function(v) { return ss.x.indexOf(v); });
+  var yi = ss.x.length, n = ss.n, p = idx.length, k = p + 1, df = n - k;
+  var inv = invertMatrix(idx.map(function(i) { return idx.map(function(j) { return ss.cp[i][j]; }); }));
+  var sxy = idx.map(function(i) { return ss.cp[i][yi]; });
+  var syy = ss.cp[yi][yi];
+  var xbar = idx.map(function(i) { return ss.mean[i]; });
+  function dot(a, b) { var s = 0; for (var i = 0; i < a.length; i++) s += a[i] * b[i]; return s; }
+  var slope = inv.map(function(row) { return dot(row, sxy); });
+  var coef = [ss.mean[yi] - dot(slope, xbar)].concat(slope);
+  var rss = syy - dot(slope, sxy), s2 = rss / df;
+
+  // Covariances are for (mean of y, slopes) on centred data; the intercept's
+  // row is mapped back through b0 = a - xbar'b.
+  var bread = [];
+  for (var a = 0; a < k; a++) {
+    bread.push([]);
+    for (var b = 0; b < k; b++) bread[a].push(a === 0 || b === 0 ? (a === b ? 1 / n : 0) : inv[a - 1][b - 1]);
+  }
+  var tcrit = tQuantile(1 - alpha / 2, df);
+  function inference(V, out, suffix) {
+    var se = V.map(function(row, j) {
+      if (j > 0) return Math.sqrt(row[j]);
+      var v = V[0][0];
+      for (var i = 1; i < k; i++) {
+        v -= 2 * xbar[i - 1] * V[0][i];
+        for (var m = 1; m < k; m++) v += xbar[i - 1] * V[i][m] * xbar[m - 1];
+      }
+      return Math.sqrt(v);
+    });
+    var t = coef.map(function(c, j) { return c / se[j]; });
+    out["se" + suffix] = se;
+    out["t" + suffix] = t;
+    out["p" + suffix] = t.map(function(tj) { return betaInc(df / 2, 0.5, df / (df + tj * tj)); });
+  }
+
+  var r2 = 1 - rss / syy;
+  var llf = -n / 2 * (Math.log(2 * Math.PI) + Math.log(rss / n) + 1);
+  var F = p ? (syy - rss) / p / s2 : NaN;
+  var out = {
+    vars: ["const"].concat(vars), coef: coef,
+    r2: r2, adj_r2: 1 - (1 - r2) * (n - 1) / df, rss: rss, rmse: Math.sqrt(s2),
+    aic: -2 * llf + 2 * k, bic: -2 * llf + k * Math.log(n),
+    f_stat: F, f_pvalue: p ? betaInc(df / 2, p / 2, df / (df + p * F)) : NaN,
+    n: n, k: k, df_resid: df
+  };
+  inference(bread.map(function(row) { return row.map(function(v) { return v * s2; }); }), out, "");
+  out.ci_lo = coef.map(function(c, j) { return c - tcrit * out.se[j]; });
+  out.ci_hi = coef.map(function(c, j) { return c + tcrit * out.se[j]; });
+
+  if (cols) {
+    var y = cols[ss.y], fitted = [], resid = [], meat = bread.map(function(row) { return row.map(function() { return 0; }); });
+    for (var i = 0; i < n; i++) {
+      var z = [1], yhat = coef[0];
+      for (var j = 0; j < p; j++) { z.push(cols[vars[j]][i] - xbar[j]); yhat += slope[j] * cols[vars[j]][i]; }
+      var e = y[i] - yhat;
+      fitted.push(yhat); resid.push(e);
+      for (a = 0; a < k; a++) for (b = 0; b < k; b++) meat[a][b] += e * e * z[a] * z[b];
+    }
+    var mult = function(A, B) { return A.map(function(row) { return B[0].map(function(_, c) { return dot(row, B.map(function(r) { return r[c]; })); }); }); };
+    var V = mult(mult(bread, meat), bread).map(function(row) { return row.map(function(v) { return v * n / df; }); });
+    inference(V, out, "_hc1");
+    out.fitted = fitted;
+    out.resid = resid;
+  }
+  return out;
+}
@@ -0,0 +1,20 @@
+// Payload segments (see common/segments.py). loadSegment(index, key) resolves
+// to the item stored under `key`, parsing its segment from the inline
+// <script id="seg-..."> block, or fetching it from index.base, on first use.
+var SEGMENT_CACHE = {};
+function loadSegment(index, key) {
+  var id = index.ids[key];
+  if (id === undefined) return Promise.resolve(undefined);
+  if (!SEGMENT_CACHE[id]) {
+    var el = document.getElementById("seg-" + id);
+    var raw = el ? Promise.resolve(JSON.parse(el.textContent))
+      : fetch(index.base + id + ".json").then(function(r) {
+          if (!r.ok) throw new Error("Segment " + id + ": HTTP " + r.status);
+          return r.json();
+        });
+    SEGMENT_CACHE[id] = raw.then(function(seg) {
+      return typeof decodeTyped === "function" ? decodeTyped(seg) : seg;
+    });
+  }
+  return SEGMENT_CACHE[id].then(function(seg) { return seg[key]; });
+}
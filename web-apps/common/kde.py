@@ -0,0 +1,125 @@
+"""Binned FFT Gaussian kernel density estimation for many series at once.
+
+Each series is linearly binned onto its own equally spaced grid (see
+``common/kernel.py``) and the density on that grid is the convolution of
+the bin counts with the sampled Gaussian kernel. Because every grid has the
+same number of points, the counts of all series stack into one (S, G)
+array: a single forward FFT of the stack, one of the stacked kernels and a
+single inverse transform give every density, O(S·G log G) after the O(n)
+binning instead of O(n·G) per series.
+
+Bandwidths follow Silverman's rule of thumb or the Sheather–Jones
+solve-the-equation plug-in, whose density-derivative functionals are
+estimated from the same binned counts. ``log=True`` estimates on ln(x) and
+maps the density back, f(x) = g(ln x) / x, which keeps the mass of skewed,
+positive variables such as earnings off the negative axis.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from scipy.optimize import brentq
+
+from .kernel import linear_bin
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def _scale(x: np.ndarray) -> float:
+    q1, q3 = np.quantile(x, [0.25, 0.75])
+    sd = float(np.std(x, ddof=1))
+    iqr = (q3 - q1) / 1.349
+    return min(sd, iqr) if iqr > 0 else sd
+
+
+def silverman_bandwidth(x) -> float:
+    """Silverman's rule of thumb, 0.9 · min(sd, IQR/1.349) · n^(-1/5)."""
+    x = np.asarray(x, dtype=float)
+    return 0.9 * _scale(x) * len(x) ** -0.2
+
+
+def _psi(counts: np.ndarray, delta: float, g: float, r: int) -> float:
+    """Binned Σ_i Σ_j φ_g^(r)(x_i - x_j) / (n (n - 1)) for r = 4 or 6."""
+    n = counts.sum()
+    G = len(counts)
+    reach = min(G - 1, int(np.ceil(6 * g / delta)))
+    z = np.arange(-reach, reach + 1) * delta / g
+    z2 = z * z
+    herm = z2 * z2 - 6 * z2 + 3 if r == 4 else z2 ** 3 - 15 * z2 * z2 + 45 * z2 - 15
+    kern = herm * np.exp(-0.5 * z2) / (_SQRT_2PI * g ** (r + 1))
+    smooth = np.convolve(counts, kern)[reach:reach + G]
+    return float(counts @ smooth) / (n * (n - 1))
+
+
+def sheather_jones_bandwidth(x, grid_size: int = 1024) -> float:
+    """Sheather–Jones solve-the-equation bandwidth (as R's ``bw.SJ``, method "ste")."""
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    lo, hi = float(x.min()), float(x.max())
+    delta = (hi - lo) / (grid_size - 1)
+    counts = linear_bin(x, grid_size, lo, hi)
+    scale = _scale(x)
+    a = 1.24 * scale * n ** (-1 / 7)
+    b = 1.23 * scale * n ** (-1 / 9)
+    alpha2 = 1.357 * (_psi(counts, delta, a, 4) / -_psi(counts, delta, b, 6)) ** (1 / 7)
+    c1 = 1 / (2 * np.sqrt(np.pi) * n)
+
+    def equation(h: float) -> float:
+        return (c1 / _psi(counts, delta, alpha2 * h ** (5 / 7), 4)) ** 0.2 - h
+
+    upper = 1.144 * scale * n ** -0.2
+    lower = 0.1 * upper
+    while equation(lower) * equation(upper) > 0 and lower > 1e-3 * upper:
+        lower /= 2
+        upper *= 1.2
+    return float(brentq(equation, lower, upper, xtol=1e-4 * lower))
+
+
+BANDWIDTHS = {"silverman": silverman_bandwidth, "sj": sheather_jones_bandwidth}
+
+
+def kde(series: dict, bw="silverman", grid_size: int = 512,
+        log: bool = False, cut: float = 3.0) -> dict:
+    """Gaussian KDE of every series in ``{name: values}`` in one batched FFT.
+
+    ``bw`` is a rule name from ``BANDWIDTHS`` or a number (on the ln scale
+    when ``log``). Each grid spans the data plus ``cut`` bandwidths on each
+    side. Returns ``{name: {"grid", "density", "bw"}}`` with ``grid`` in the
+    original units.
+    """
+    names = list(series)
+    data = []
+    for name in names:
+        v = np.asarray(series[name], dtype=float)
+        v = v[np.isfinite(v)]
+        if log:
+            if (v <= 0).any():
+                raise ValueError(f"log-scale KDE needs positive values: {name}")
+            v = np.log(v)
+        data.append(v)
+    hs = np.array([BANDWIDTHS[bw](v) if isinstance(bw, str) else float(bw) for v in data])
+    los = np.array([v.min() for v in data]) - cut * hs
+    his = np.array([v.max() for v in data]) + cut * hs
+    deltas = (his - los) / (grid_size - 1)
+    counts = np.vstack([linear_bin(v, grid_size, lo, hi) for v, lo, hi in zip(data, los, his)])
+
+    # Kernel in grid steps: series differ only through h / delta.
+    ratio = hs / deltas
+    reach = np.minimum(grid_size - 1, np.ceil(4 * ratio)).astype(int)
+    size = 1 << int(np.ceil(np.log2(grid_size + reach.max())))
+    lags = np.arange(size)
+    lags = np.where(lags <= size // 2, lags, lags - size)
+    kern = np.exp(-0.5 * (lags / ratio[:, None]) ** 2)
+    kern[np.abs(lags) > reach[:, None]] = 0.0
+    conv = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kern, size), size)[:, :grid_size]
+    dens = np.maximum(conv, 0.0) / (counts.sum(axis=1) * hs * _SQRT_2PI)[:, None]
+
+    out = {}
+    for i, name in enumerate(names):
+        grid = np.linspace(los[i], his[i], grid_size)
+        if log:
+            grid = np.exp(grid)
+            out[name] = {"grid": grid, "density": dens[i] / grid, "bw": float(hs[i])}
+        else:
+            out[name] = {"grid": grid, "density": dens[i], "bw": float(hs[i])}
+    return out
@@ -0,0 +1,77 @@
+"""Binned FFT Nadaraya-Watson kernel regression over a bandwidth vector.
+
+The observations are linearly binned once onto an equally spaced grid:
+each x splits its weight (and its y) between the two nearest grid points.
+The Gaussian-weighted sums the estimator needs are then convolutions of the
+binned counts and binned y-sums with the sampled kernel, done by FFT. The
+binned data are transformed once; every extra bandwidth costs one kernel
+transform and two inverse transforms, O(G log G) regardless of n.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def linear_bin(x: np.ndarray, grid_size: int, lo: float, hi: float,
+               weights: np.ndarray | None = None) -> np.ndarray:
+    """Linear-binning counts (or weight sums) of x on ``grid_size`` points over [lo, hi]."""
+    x = np.asarray(x, dtype=float)
+    w = np.ones_like(x) if weights is None else np.asarray(weights, dtype=float)
+    delta = (hi - lo) / (grid_size - 1)
+    pos = np.clip((x - lo) / delta, 0, grid_size - 1)
+    left = np.minimum(pos.astype(int), grid_size - 2)
+    frac = pos - left
+    out = np.bincount(left, w * (1 - frac), minlength=grid_size)
+    out += np.bincount(left + 1, w * frac, minlength=grid_size)
+    return out
+
+
+def gaussian_convolve(binned: np.ndarray, bandwidths, delta: float) -> np.ndarray:
+    """Convolve each row of ``binned`` (..., G) with N(0, h) sampled at spacing delta.
+
+    The kernel is left unnormalised (K(0) = 1). Returns (len(bandwidths), ..., G).
+    """
+    bandwidths = np.atleast_1d(np.asarray(bandwidths, dtype=float))
+    G = binned.shape[-1]
+    reach = min(G - 1, int(np.ceil(4 * bandwidths.max() / delta)))
+    size = 1 << int(np.ceil(np.log2(G + reach)))
+    data_f = np.fft.rfft(binned, size)
+    lags = np.arange(size)
+    lags = np.where(lags <= size // 2, lags, lags - size) * delta
+    out = np.empty((len(bandwidths),) + binned.shape)
+    for i, h in enumerate(bandwidths):
+        kern = np.exp(-0.5 * (lags / h) ** 2)
+        kern[np.abs(lags) > reach * delta] = 0.0
+        out[i] = np.fft.irfft(data_f * np.fft.rfft(kern), size)[..., :G]
+    return out
+
+
+def nw_smooth(x, y, bandwidths, grid_size: int = 401,
+              lo: float | None = None, hi: float | None = None) -> dict:
+    """Gaussian Nadaraya-Watson fits on a grid for every bandwidth at once.
+
+    Returns ``grid`` (G,), ``fit`` (H, G) and ``cv`` (H,), the leave-one-out
+    cross-validation sum of squared errors for bandwidth selection. The
+    leave-one-out fit at x_i drops the observation's own K(0) = 1 weight
+    from the binned sums interpolated at x_i.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    lo = x.min() if lo is None else lo
+    hi = x.max() if hi is None else hi
+    grid = np.linspace(lo, hi, grid_size)
+    delta = grid[1] - grid[0]
+    binned = np.vstack([linear_bin(x, grid_size, lo, hi),
+                        linear_bin(x, grid_size, lo, hi, weights=y)])
+    conv = gaussian_convolve(binned, bandwidths, delta)
+    den, num = conv[:, 0], conv[:, 1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fit = np.where(den > 1e-12, num / den, np.nan)
+        cv = np.empty(len(conv))
+        for i in range(len(conv)):
+            d_i = np.interp(x, grid, den[i]) - 1.0
+            n_i = np.interp(x, grid, num[i]) - y
+            loo = np.where(d_i > 1e-12, n_i / d_i, np.nan)
+            cv[i] = np.nansum((y - loo) ** 2)
+    return {"grid": grid, "fit": fit, "cv": cv}
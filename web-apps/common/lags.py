@@ -0,0 +1,95 @@
+"""Lag, lead and difference designs as strided views over one buffer.
+
+``lag_design`` copies the series it needs into a single (k, n) buffer, once.
+Differenced terms are computed straight into their row of that buffer.
+Every term's block of lags is then a read-only ``sliding_window_view`` of
+its row, so no lag is ever copied on its own. For lags lo..hi of a series
+the view has shape (windows, hi - lo + 1), with column j holding lag lo + j.
+
+All blocks share one trimmed sample. It keeps the rows from the largest lag
+(the differencing order counts as extra lags) up to the last row that the
+largest lead allows, then drops any row where a term is missing. The
+regressor matrix is filled from the views in a single allocation, so ADL
+and distributed-lag models with dozens of lags cost one pass over the data
+rather than a column copy per lag and a frame copy per ``dropna``.
+"""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+_TERM = re.compile(r"^(?:D(\d*)\.)?(.+)$")
+
+
+def _parse(term: str) -> tuple[str, int]:
+    """``"D2.gs10"`` -> ("gs10", 2); ``"D.gs10"`` -> ("gs10", 1); ``"gs10"`` -> ("gs10", 0)."""
+    m = _TERM.match(term)
+    d = m.group(1)
+    return m.group(2), (0 if d is None else int(d or 1))
+
+
+def _name(term: str, lag: int) -> str:
+    if lag == 0:
+        return term
+    return f"{term}_L{lag}" if lag > 0 else f"{term}_F{-lag}"
+
+
+def lag_design(data, terms: dict, y: str | None = None, mask=None) -> dict:
+    """Lag/lead/difference regressors on one consistently trimmed sample.
+
+    ``data`` is a DataFrame or a mapping of equal-length 1-D arrays.
+    ``terms`` maps a column name, optionally prefixed ``D.`` or ``Dk.`` for
+    the k-th difference, to the lags wanted: 0 is the current value,
+    positive numbers are lags and negative numbers are leads. ``y`` names an
+    optional dependent term (taken at lag 0), and ``mask`` optionally
+    restricts the sample to rows where it is True.
+
+    Returns ``X`` (T, K) with columns named in ``names`` (``x_F1``, ``x``,
+    ``x_L2``: terms in the order given, leads before lags), ``y`` (T,) or None, ``rows`` (the
+    positions of the kept rows in ``data``) and ``blocks``: per term, the
+    strided view of lags min..max over the whole series.
+    """
+    wanted = {term: sorted({int(v) for v in np.atleast_1d(lags)}) for term, lags in terms.items()}
+    specs = dict(wanted)
+    if y is not None:
+        specs[y] = sorted(set(specs.get(y, [])) | {0})
+    n = len(next(iter(data.values())) if isinstance(data, dict) else data)
+
+    buf = np.empty((len(specs), n))
+    for i, term in enumerate(specs):
+        col, d = _parse(term)
+        x = np.asarray(data[col], dtype=float)
+        buf[i, :d] = np.nan
+        buf[i, d:] = np.diff(x, d) if d else x
+
+    # Row t is kept if every lag and lead of every term stays inside 0..n-1.
+    hi = {t: max(lags) for t, lags in specs.items()}
+    lo = {t: min(lags) for t, lags in specs.items()}
+    start = max(0, *hi.values())
+    stop = n + min(0, *lo.values())
+    blocks, aligned = {}, {}
+    for i, term in enumerate(specs):
+        # Window s covers buf[s .. s + span - 1]; reversed, column j is lag lo + j at row s + hi.
+        view = sliding_window_view(buf[i], hi[term] - lo[term] + 1)[:, ::-1]
+        blocks[term] = view
+        aligned[term] = view[start - hi[term]:stop - hi[term]]
+
+    keep = np.ones(stop - start, dtype=bool)
+    for block in aligned.values():
+        keep &= np.isfinite(block).all(axis=1)
+    if mask is not None:
+        keep &= np.asarray(mask, dtype=bool)[start:stop]
+    rows = np.arange(start, stop)[keep]
+
+    names = [_name(term, lag) for term, lags in wanted.items() for lag in lags]
+    X = np.empty((len(rows), len(names)))
+    j = 0
+    for term, lags in wanted.items():
+        for lag in lags:
+            X[:, j] = aligned[term][keep, lag - lo[term]]
+            j += 1
+    yv = None if y is None else aligned[y][keep, -lo[y]]
+    return {"X": X, "names": names, "y": yv, "rows": rows, "blocks": blocks}
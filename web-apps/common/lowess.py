@@ -0,0 +1,108 @@
+"""LOWESS for several spans at once, matching ``statsmodels`` lowess.
+
+The data are sorted once and the fit anchors are chosen once: with
+``delta > 0`` only points more than ``delta`` beyond the previous anchor
+are fitted and the rest are linearly interpolated, exactly as statsmodels
+does. For a span of k points the statsmodels neighbourhood of an anchor is
+the contiguous sorted window ``[l, l + k)`` with the smallest ``l`` such
+that ``x[l] + x[l + k] >= 2 * x0``, so all windows for a span come from one
+``searchsorted`` on a shared pairwise-sum array. The local linear fits and
+the bisquare robustness iterations are then vectorized over anchors, and
+the windows' tricube weights are reused across robustness iterations.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+_BLOCK = 1 << 22  # gathered window elements per chunk
+
+
+def _anchors(x: np.ndarray, delta: float) -> np.ndarray:
+    """Indices of sorted x that statsmodels fits; the rest are interpolated."""
+    n = len(x)
+    out = []
+    i = 0
+    while True:
+        out.append(i)
+        last = int(np.searchsorted(x, x[i], side="right")) - 1  # ties share the fit
+        if last >= n - 1:
+            break
+        beyond = int(np.searchsorted(x, x[i] + delta, side="right"))
+        i = max(n - 2 if beyond >= n else beyond - 1, last + 1)
+    return np.asarray(out)
+
+
+def _windows(x: np.ndarray, anchors: np.ndarray, k: int):
+    """Yield (slice, idx, centred x, tricube weights) for chunks of anchors."""
+    n = len(x)
+    x0 = x[anchors]
+    if k < n:
+        pair = x[:n - k] + x[k:]
+        left = np.minimum(np.searchsorted(pair, 2 * x0, side="left"), n - k)
+    else:
+        left = np.zeros(len(anchors), dtype=int)
+    step = max(1, _BLOCK // k)
+    cols = np.arange(k)
+    for a in range(0, len(anchors), step):
+        b = min(a + step, len(anchors))
+        idx = left[a:b, None] + cols
+        xc = x[idx] - x0[a:b, None]  # window centred on the anchor
+        radius = np.maximum(-xc[:, 0], xc[:, -1])
+        tri = np.abs(xc)
+        tri /= np.where(radius > 0, radius, np.inf)[:, None]
+        tri **= 3
+        np.subtract(1.0, tri, out=tri)
+        tri **= 3
+        yield slice(a, b), idx, xc, tri
+
+
+def _local_fit(chunks, y: np.ndarray, rw: np.ndarray, anchors: np.ndarray) -> np.ndarray:
+    fit = np.empty(len(anchors))
+    for sl, idx, xc, tri in chunks:
+        w = tri * rw[idx]
+        yw = y[idx]
+        ok = (w > 1e-12).sum(axis=1) >= 2
+        s0 = np.where(ok, w.sum(axis=1), 1.0)
+        mx = np.einsum("ij,ij->i", w, xc) / s0
+        wxc = w * xc
+        var = np.maximum(np.einsum("ij,ij->i", wxc, xc) / s0 - mx ** 2, 1e-12)
+        my = np.einsum("ij,ij->i", w, yw) / s0
+        mxy = np.einsum("ij,ij->i", wxc, yw) / s0
+        fit[sl] = np.where(ok, my - mx * (mxy - mx * my) / var, y[anchors[sl]])
+    return fit
+
+
+def _bisquare(resid: np.ndarray) -> np.ndarray:
+    med = np.median(resid)
+    u = (resid > 0).astype(float) if med == 0 else np.minimum(resid / (6.0 * med), 1.0)
+    return (1 - u ** 2) ** 2
+
+
+def lowess_multi(x, y, fracs, it: int = 3, delta: float = 0.0) -> dict:
+    """LOWESS fits for every span in ``fracs``.
+
+    Returns ``x`` (sorted, n) and ``fits`` (len(fracs), n), the smoothed
+    values at each sorted x, equal to ``statsmodels`` ``lowess(y, x, frac,
+    it, delta)[:, 1]`` for each frac.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    order = np.argsort(x, kind="mergesort")
+    x, y = x[order], y[order]
+    n = len(x)
+    anchors = _anchors(x, delta)
+    fits = np.empty((len(fracs), n))
+    for s, frac in enumerate(fracs):
+        k = min(max(int(frac * n + 1e-10), 2), n)
+        rw = np.ones(n)
+        # Windows and tricube weights do not change across robustness
+        # iterations; keep them when they fit in one chunk.
+        cached = list(_windows(x, anchors, k)) if len(anchors) * k <= _BLOCK else None
+        for r in range(it + 1):
+            chunks = cached if cached is not None else _windows(x, anchors, k)
+            fit = np.interp(x, x[anchors], _local_fit(chunks, y, rw, anchors))
+            if r < it:
+                rw = _bisquare(np.abs(y - fit))
+        fits[s] = fit
+    return {"x": x, "fits": fits}
@@ -0,0 +1,120 @@
+"""Multi-resolution line charts: LTTB index pyramids and integer x axes.
+
+A line chart needs about one point per pixel or two of its width; a longer
+series only costs Plotly drawing time. ``lttb`` picks ``n_out`` points of a
+series with Largest-Triangle-Three-Buckets (Steinarsson, 2013): the first and
+last points are kept, the rest are split into ``n_out - 2`` equal buckets, and
+from each bucket the point forming the largest triangle with the point kept
+before it and the mean of the next bucket is kept. Peaks, troughs and turning
+points survive, which a stride or a bucket mean would smooth away.
+
+``pyramid`` stacks LTTB selections of ``coarsest``, ``factor`` times as many,
+... points, coarse to fine, for the series drawn on one chart. Each level is
+the union of the selections of those series, as indices into the full
+series, which the dashboards need anyway for their regressions and moving
+averages. A level ships as the gaps between successive indices, so it costs
+one byte per point until the gaps pass 127. Levels stop once one would keep
+more than ``keep`` of the points, so short series have none. A dashboard
+(``common/js/lod.js``) draws the coarsest level with enough points in the visible x range for the
+chart's width (``lodIndices``), and on zoom switches to a finer level or the
+full series already in memory.
+
+The x axes travel as integer offsets (``typed``, so one or two bytes each):
+``date_axis`` for ISO dates on a day, month, quarter or year grid and
+``step_axis`` for numbers on a regular step, such as fractional years. The
+templates' ``axisValues`` rebuilds the dates or numbers.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .payload import typed
+
+_MONTHS = {"month": 1, "quarter": 3, "year": 12}
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points of the line (x, y) that keep its shape.
+
+    Points with a missing ``y`` are skipped. All points are returned when the
+    series has no more than ``n_out``.
+    """
+    if n_out < 3:
+        raise ValueError(f"n_out must be at least 3: {n_out}")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    ok = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    n = len(ok)
+    if n_out >= n:
+        return ok
+    xs, ys = x[ok], y[ok]
+    every = (n - 2) / (n_out - 2)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nxt = slice(hi, min(int((i + 2) * every) + 1, n))
+        cx, cy = xs[nxt].mean(), ys[nxt].mean()
+        area = np.abs((xs[a] - cx) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (cy - ys[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return ok[out]
+
+
+def pyramid(x, series, coarsest: int = 128, factor: int = 2, keep: float = 0.6) -> list[dict]:
+    """LTTB levels, coarse to fine, for ``series`` drawn against ``x``.
+
+    Each level is the union of ``lttb`` with ``coarsest * factor**k`` points
+    for every series, as a ``typed`` array of index gaps: the first index,
+    then the difference to each next one (the templates' ``lodLevel`` sums
+    them back). Only levels with at most ``keep`` of the points are
+    returned; the full series is the finest level and is not repeated.
+    """
+    n = len(x)
+    levels = []
+    size = coarsest
+    while size < n:
+        idx = np.unique(np.concatenate([lttb(x, y, size) for y in series]))
+        if len(idx) > keep * n:
+            break
+        levels.append(typed(np.diff(idx, prepend=0), 0))
+        size *= factor
+    return levels
+
+
+def date_axis(dates, unit: str = "month") -> dict:
+    """ISO dates as integer offsets from the first, counted in ``unit``.
+
+    ``unit`` is ``"day"``, ``"month"``, ``"quarter"`` or ``"year"``; the dates
+    must fall on that grid (e.g. first days of months). Returns ``start``
+    (ISO date), ``unit`` and ``offset``.
+    """
+    d = pd.DatetimeIndex(pd.to_datetime(dates))
+    d0 = d[0]
+    if unit == "day":
+        offset = np.asarray((d - d0).days)
+    elif unit in _MONTHS:
+        months = np.asarray((d.year - d0.year) * 12 + (d.month - d0.month))
+        offset = months // _MONTHS[unit]
+        rebuilt = pd.DatetimeIndex([d0 + pd.DateOffset(months=int(m) * _MONTHS[unit]) for m in offset])
+        if not rebuilt.equals(d):
+            raise ValueError(f"dates are not on a {unit} grid starting {d0.date()}")
+    else:
+        raise ValueError(f"unit must be day, month, quarter or year: {unit!r}")
+    return {"start": str(d0.date()), "unit": unit, "offset": typed(offset, 0)}
+
+
+def step_axis(values, step: float) -> dict:
+    """Numbers on a regular ``step`` as integer offsets from the first.
+
+    Returns ``start``, ``step`` and ``offset``; the values need not be
+    contiguous, only on the grid.
+    """
+    v = np.asarray(values, dtype=float)
+    offset = np.rint((v - v[0]) / step)
+    if not np.allclose(v[0] + offset * step, v, rtol=0, atol=1e-9 * max(1.0, abs(step))):
+        raise ValueError(f"values are not on a grid of step {step} from {v[0]}")
+    return {"start": float(v[0]), "step": step, "offset": typed(offset, 0)}
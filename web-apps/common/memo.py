@@ -0,0 +1,159 @@
+"""Disk memoization for expensive build computations.
+
+``@memoize`` caches a function's return value on disk under a key built
+from
+
+- the function's identity (source file and qualified name),
+- the source files of the modules defining it and its ``deps``, and of
+  every web-apps module those import, followed transitively (so an edit to
+  any helper they can reach, e.g. ``lowess._windows`` or ``payload.col``,
+  changes the key),
+- every argument after defaults are applied (seeds included), with arrays,
+  DataFrames and dataset paths (``Path`` or ``str`` naming a file) hashed
+  by content.
+
+Change any of these and the key changes, so only invalidated results are
+recomputed. Entries are compressed pickles in ``web-apps/.cache/memo``;
+once the directory exceeds ``max_bytes`` the least recently used entries are
+evicted. Set ``METRICSAI_NO_CACHE=1`` to bypass the cache entirely.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+WEB_APPS = Path(__file__).resolve().parent.parent
+CACHE_DIR = WEB_APPS / ".cache" / "memo"
+MAX_BYTES = 256 * 2**20
+
+
+def _feed(h, obj) -> None:
+    """Update hash ``h`` with a content fingerprint of ``obj``."""
+    if isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        h.update(f"nd{arr.dtype.str}{arr.shape}".encode())
+        if arr.dtype.hasobject:
+            h.update(pickle.dumps(arr.tolist()))
+        else:
+            h.update(arr.view(np.uint8).ravel())
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(f"pd{type(obj).__name__}".encode())
+        _feed(h, np.asarray(pd.util.hash_pandas_object(obj, index=True)))
+        if isinstance(obj, pd.DataFrame):
+            _feed(h, list(map(str, obj.columns)))
+    elif isinstance(obj, Path) or (isinstance(obj, str) and os.path.isfile(obj)):
+        # Dataset paths, given as Path or str, are keyed by the file's bytes
+        obj = Path(obj)
+        h.update(b"path")
+        h.update(obj.read_bytes() if obj.is_file() else str(obj).encode())
+    elif isinstance(obj, dict):
+        h.update(f"dict{len(obj)}".encode())
+        for k in sorted(obj, key=repr):
+            _feed(h, k)
+            _feed(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for v in obj:
+            _feed(h, v)
+    elif obj is None or isinstance(obj, (bool, int, float, str, bytes, np.generic)):
+        h.update(repr(obj).encode())
+    elif hasattr(obj, "__dict__"):
+        h.update(type(obj).__qualname__.encode())
+        _feed(h, vars(obj))
+    else:
+        h.update(pickle.dumps(obj))
+
+
+def _module_of(obj):
+    name = getattr(obj, "__module__", None)
+    return sys.modules.get(name) if isinstance(name, str) else None
+
+
+def _source_files(objs) -> list[Path]:
+    """Files of the web-apps modules defining ``objs`` and everything they import.
+
+    Follows module globals that are modules, or functions and classes
+    defined in another module, and keeps only files under ``web-apps/``.
+    """
+    stack = [m for m in map(_module_of, objs) if m is not None]
+    seen: set[Path] = set()
+    while stack:
+        module = stack.pop()
+        path = getattr(module, "__file__", None)
+        if path is None:
+            continue
+        path = Path(path).resolve()
+        if path in seen or WEB_APPS not in path.parents:
+            continue
+        seen.add(path)
+        for value in list(vars(module).values()):
+            found = value if inspect.ismodule(value) else _module_of(value)
+            if found is not None:
+                stack.append(found)
+    return sorted(seen)
+
+
+def _evict(directory: Path, max_bytes: int) -> None:
+    entries = sorted(directory.glob("*.pkl.z"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in entries)
+    for p in entries:
+        if total <= max_bytes:
+            break
+        total -= p.stat().st_size
+        p.unlink(missing_ok=True)
+
+
+def memoize(fn=None, *, deps=(), cache_dir: Path | None = None, max_bytes: int = MAX_BYTES):
+    """Cache ``fn``'s results on disk; usable as ``@memoize`` or ``@memoize(deps=[...])``."""
+    def wrap(fn):
+        directory = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+        signature = inspect.signature(fn)
+
+        # Built on first use: at decoration time the defining module has not
+        # finished importing, so its later imports would be missed.
+        @functools.lru_cache(maxsize=None)
+        def base():
+            h = hashlib.sha256()
+            h.update(f"{inspect.getsourcefile(fn)}:{fn.__qualname__}".encode())
+            for path in _source_files((fn, *deps)):
+                h.update(str(path.relative_to(WEB_APPS)).encode())
+                h.update(path.read_bytes())
+            return h
+
+        def key(*args, **kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            h = base().copy()
+            _feed(h, dict(bound.arguments))
+            return h.hexdigest()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if os.environ.get("METRICSAI_NO_CACHE"):
+                return fn(*args, **kwargs)
+            path = directory / f"{fn.__name__}-{key(*args, **kwargs)[:32]}.pkl.z"
+            if path.exists():
+                os.utime(path)
+                return pickle.loads(zlib.decompress(path.read_bytes()))
+            result = fn(*args, **kwargs)
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), 6))
+            os.replace(tmp, path)
+            _evict(directory, max_bytes)
+            return result
+
+        wrapper.cache_key = key
+        return wrapper
+
+    return wrap(fn) if fn is not None else wrap
@@ -0,0 +1,125 @@
+"""One-pass, mergeable weighted moments (mean through kurtosis), per group.
+
+A ``Moments`` state holds, for every group and column, the weight sum W,
+the mean and the central moment sums M2, M3, M4 (Σ w (x - mean)^k). Each
+chunk is summarised with ``np.bincount`` and folded in with the exact
+shift-of-centre identities (Chan et al.; Pébay 2008): with δ = mean_part -
+mean_new,
+
+    M2 = Σ M2_p + W_p δ²
+    M3 = Σ M3_p + 3 δ M2_p + W_p δ³
+    M4 = Σ M4_p + 4 δ M3_p + 6 δ² M2_p + W_p δ⁴
+
+which never subtract large uncentred sums, so results stay stable on data
+far from zero. The same identities merge states built on other chunks or
+threads (``merge``) and collapse the groups into one (``total``). Weights
+are frequency weights: ``var`` divides M2 by W - ddof.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _combine(w, mean, m2, m3, m4, axis: int = 0):
+    """Pool the states stacked along ``axis`` into one."""
+    W = w.sum(axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mu = np.where(W > 0, (w * mean).sum(axis=axis) / W, 0.0)
+    d = np.where(w > 0, mean - np.expand_dims(mu, axis), 0.0)
+    M2 = (m2 + w * d ** 2).sum(axis=axis)
+    M3 = (m3 + 3 * d * m2 + w * d ** 3).sum(axis=axis)
+    M4 = (m4 + 4 * d * m3 + 6 * d ** 2 * m2 + w * d ** 4).sum(axis=axis)
+    return W, mu, M2, M3, M4
+
+
+class Moments:
+    """Running weighted moments for ``groups`` groups (None: a single group).
+
+    Data passed to ``update`` may be 1-D or (n, p); with p columns every
+    statistic has a trailing axis of length p, and with groups a leading
+    axis of length ``groups``.
+    """
+
+    def __init__(self, groups: int | None = None):
+        self.groups = groups
+        self._state = None  # (W, mean, M2, M3, M4), each (G, ...)
+
+    def update(self, x, weights=None, groups=None) -> Moments:
+        """Fold in a chunk; ``groups`` holds integer codes 0..groups-1."""
+        x = np.asarray(x, dtype=float)
+        cols = x.reshape(len(x), -1)
+        G = 1 if self.groups is None else self.groups
+        g = np.zeros(len(x), dtype=int) if groups is None else np.asarray(groups)
+        w = np.ones(len(x)) if weights is None else np.asarray(weights, dtype=float)
+        W = np.bincount(g, w, minlength=G)
+        part = np.empty((4, G, cols.shape[1]))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for j in range(cols.shape[1]):
+                mu = np.bincount(g, w * cols[:, j], minlength=G) / W
+                part[0, :, j] = np.where(W > 0, mu, 0.0)
+                c = cols[:, j] - part[0, g, j]
+                c2 = w * c * c
+                part[1, :, j] = np.bincount(g, c2, minlength=G)
+                part[2, :, j] = np.bincount(g, c2 * c, minlength=G)
+                part[3, :, j] = np.bincount(g, c2 * c * c, minlength=G)
+        W = np.repeat(W[:, None], cols.shape[1], axis=1)
+        if x.ndim == 1:
+            W, part = W[:, 0], part[..., 0]
+        return self._fold((W, *part))
+
+    def _fold(self, state) -> Moments:
+        if self._state is None:
+            self._state = tuple(np.array(a, dtype=float) for a in state)
+        else:
+            self._state = _combine(*(np.stack([a, b]) for a, b in zip(self._state, state)))
+        return self
+
+    def merge(self, other: Moments) -> Moments:
+        """Fold in a state accumulated elsewhere over the same groups."""
+        return self._fold(other._state)
+
+    def total(self) -> Moments:
+        """Moments of all groups pooled together."""
+        out = Moments()
+        out._state = tuple(a[None] for a in _combine(*self._state))
+        return out
+
+    def _out(self, a):
+        if self.groups is not None:
+            return a
+        return float(a[0]) if a.ndim == 1 else a[0]
+
+    @property
+    def n(self):
+        return self._out(self._state[0])
+
+    @property
+    def mean(self):
+        return self._out(self._state[1])
+
+    def central(self, k: int):
+        """k-th central moment, M_k / W (k = 2, 3, 4)."""
+        return self._out(self._state[k] / self._state[0])
+
+    def var(self, ddof: int = 1):
+        return self._out(self._state[2] / (self._state[0] - ddof))
+
+    def std(self, ddof: int = 1):
+        return self._out(np.sqrt(self._state[2] / (self._state[0] - ddof)))
+
+    def within_std(self, ddof: int = 1):
+        """SD of deviations from group means, pooled over groups (the panel "within" SD)."""
+        W, _, m2, _, _ = self._state
+        out = np.sqrt(m2.sum(axis=0) / (W.sum(axis=0) - ddof))
+        return float(out) if out.ndim == 0 else out
+
+    def skew(self):
+        """Moment skewness m3 / m2^1.5."""
+        W, _, m2, m3, _ = self._state
+        return self._out(m3 / W / (m2 / W) ** 1.5)
+
+    def kurt(self):
+        """Excess kurtosis m4 / m2^2 - 3."""
+        W, _, m2, _, m4 = self._state
+        return self._out(m4 / W / (m2 / W) ** 2 - 3)
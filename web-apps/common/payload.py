@@ -0,0 +1,216 @@
+"""Compact binary encoding for the numeric columns of a dashboard payload.
+
+A JSON list of decimals costs about one byte per digit, and the browser
+has to parse every one. ``typed`` instead packs a column into a
+little-endian typed array, base64-encoded inside the JSON:
+
+    {"$typed": "i16", "b64": "...", "p": 2, "o": 5210, "miss": -32768}
+
+For a column with ``decimals`` = p, each value is stored as the integer
+q = round(v, p) · 10^p - o, with o the midpoint of the column's range. The
+smallest of Int8, Int16 and Int32 that holds the centred integers is used,
+and the dtype's minimum is reserved for missing values. The loader rebuilds
+v = (o + q) / 10^p, an exact division of two integers. It therefore yields
+the same double that parsing the rounded decimal would. Without ``decimals``
+a column is stored as Int32 if it is integral, else as Float64 (or Float32
+with ``float32=True``), with NaN for missing values. 2-D input is stored
+row-major with ``cols``.
+
+``decodeTyped`` (``common/js/decode.js``, shipped by
+``common/render.py``'s ``shared_js`` on pages whose payload holds typed
+arrays) walks the parsed payload and turns these objects back into plain
+arrays (``null`` for missing), so chart code is unchanged.
+
+``to_json`` writes a whole payload, and ``iter_json`` the same text one
+top-level section at a time. Columns marked with ``col(values, d)``,
+or matched by a ``precision`` map, are rounded as arrays and converted with
+one ``tolist`` rather than a Python ``round`` per element.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+
+_INTS = [("i8", "<i1"), ("i16", "<i2"), ("i32", "<i4")]
+
+
+def _encode(a: np.ndarray, code: str, dtype: str, **meta) -> dict:
+    out = {"$typed": code, "b64": base64.b64encode(a.astype(dtype).tobytes()).decode("ascii")}
+    out.update(meta)
+    return out
+
+
+def typed(values, decimals: int | None = None, float32: bool = False) -> dict:
+    """Encode a numeric column (or 2-D block) as a base64 typed array."""
+    a = np.asarray(values, dtype=float)
+    meta = {"cols": int(a.shape[1])} if a.ndim == 2 else {}
+    a = a.ravel()
+    missing = ~np.isfinite(a)
+    finite = a[~missing]
+    if decimals is None and np.array_equal(finite, np.round(finite)):
+        decimals = 0
+    if decimals is not None and decimals >= 0:
+        q = np.rint(_round(a, decimals) * 10.0 ** decimals)
+        qf = q[~missing]
+        lo, hi = (qf.min(), qf.max()) if len(qf) else (0.0, 0.0)
+        o = int((lo + hi) // 2)
+        span = max(hi - o, o - lo)
+        for code, dtype in _INTS:
+            info = np.iinfo(dtype)
+            if span <= info.max:
+                q = np.where(missing, info.min + o, q) - o
+                if missing.any():
+                    meta["miss"] = int(info.min)
+                return _encode(q, code, dtype, p=int(decimals), o=o, **meta)
+        a = np.where(missing, np.nan, q / 10.0 ** decimals)
+    if float32:
+        return _encode(a, "f32", "<f4", **meta)
+    return _encode(a, "f64", "<f8", **meta)
+
+
+def decode(obj: dict) -> np.ndarray:
+    """Inverse of ``typed`` (NaN for missing values), for checks and tests."""
+    code = obj["$typed"]
+    dtype = {"i8": "<i1", "i16": "<i2", "i32": "<i4", "f32": "<f4", "f64": "<f8"}[code]
+    raw = np.frombuffer(base64.b64decode(obj["b64"]), dtype=dtype)
+    if code.startswith("f"):
+        out = raw.astype(float)
+    else:
+        out = (obj["o"] + raw.astype(float)) / 10.0 ** obj["p"]
+        if "miss" in obj:
+            out[raw == obj["miss"]] = np.nan
+    return out.reshape(-1, obj["cols"]) if "cols" in obj else out
+
+
+class Column:
+    """A numeric column with the decimals it is to be written at (see ``col``).
+
+    It reads as the list it will be written as, so build checks can index,
+    iterate or ``np.asarray`` it. That list is converted once, on first use.
+    """
+
+    __slots__ = ("values", "decimals", "_list")
+
+    def __init__(self, values, decimals: int | None = None):
+        self.values = values
+        self.decimals = decimals
+        self._list = None
+
+    def tolist(self) -> list:
+        if self._list is None:
+            self._list = _column(self.values, self.decimals)
+        return self._list
+
+    def __len__(self) -> int:
+        return len(self.tolist())
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, i):
+        return self.tolist()[i]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.tolist(), dtype=dtype if dtype is not None else float)
+
+
+def col(values, decimals: int | None = None) -> Column:
+    """Mark an array, Series or list to be written rounded to ``decimals``."""
+    return Column(values, decimals)
+
+
+def _lookup(precision: dict, path: tuple) -> int | None:
+    """Decimals for ``path``: the longest matching dotted suffix of it or of an ancestor."""
+    for depth in range(len(path), 0, -1):
+        for start in range(depth):
+            key = ".".join(path[start:depth])
+            if key in precision:
+                return precision[key]
+    return None
+
+
+def _round(a: np.ndarray, decimals: int) -> np.ndarray:
+    """``round(v, decimals)`` for every element, vectorized.
+
+    ``np.round`` scales by 10^decimals before rounding, which can tip values
+    within an ulp of a half either way. Only those near-ties are redone with
+    Python's correctly rounded ``round``, so output matches the old loops.
+    """
+    out = np.round(a, decimals)
+    scaled = a * 10.0 ** decimals
+    near = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near):
+        out[i] = round(float(a[i]), decimals)
+    return out
+
+
+def _column(a, decimals: int | None):
+    a = np.asarray(a)
+    if a.dtype.kind in "biu" and decimals is None:
+        return a.tolist()
+    if a.dtype.kind not in "biuf":
+        return [encode(v) for v in a.tolist()]
+    a = a.astype(float)
+    if decimals is not None:
+        a = _round(a, decimals)
+    missing = ~np.isfinite(a)
+    if missing.any():
+        return np.where(missing, None, a).tolist()
+    return a.tolist()
+
+
+def encode(obj, precision: dict | None = None, _path: tuple = ()):
+    """Turn a nested payload into JSON-ready Python objects, column by column.
+
+    Arrays, Series and ``col`` columns are rounded in one vectorized step
+    and converted in bulk. ``precision`` maps a key, or a dotted key path
+    such as ``"democracy.bivariate.yhat"``, to decimals for the arrays and
+    floats below it. The longest matching path wins, and a ``col``'s own
+    decimals override the map. NaN and inf become null.
+    """
+    precision = precision or {}
+    if isinstance(obj, dict):
+        return {k: encode(v, precision, _path + (str(k),)) for k, v in obj.items()}
+    if isinstance(obj, Column):
+        if obj.decimals is None:
+            return _column(obj.values, _lookup(precision, _path))
+        return obj.tolist()
+    if isinstance(obj, (np.ndarray, pd.Series, pd.Index)):
+        return _column(obj, _lookup(precision, _path))
+    if isinstance(obj, (list, tuple)):
+        return [encode(v, precision, _path) for v in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float):
+        if not np.isfinite(obj):
+            return None
+        d = _lookup(precision, _path)
+        return round(obj, d) if d is not None else obj
+    return obj
+
+
+def to_json(obj, precision: dict | None = None) -> str:
+    """Compact JSON for a dashboard payload (see ``encode``)."""
+    return json.dumps(encode(obj, precision), separators=(",", ":"), ensure_ascii=False)
+
+
+def iter_json(obj, precision: dict | None = None):
+    """``to_json`` in pieces, one top-level key of a dict payload at a time.
+
+    Each section is encoded and serialized only when the previous one has
+    been consumed, so a streaming writer (``common/render.py``) never holds
+    the whole JSON string. Joined, the pieces equal ``to_json(obj)``.
+    """
+    if not isinstance(obj, dict):
+        yield to_json(obj, precision)
+        return
+    yield "{"
+    for i, (k, v) in enumerate(obj.items()):
+        yield ("," if i else "") + json.dumps(str(k), ensure_ascii=False) + ":"
+        yield json.dumps(encode(v, precision, (str(k),)), separators=(",", ":"),
+                         ensure_ascii=False)
+    yield "}"
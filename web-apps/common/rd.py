@@ -0,0 +1,164 @@
+"""Sharp regression discontinuity by local polynomials, over a bandwidth grid.
+
+On each side of the cutoff y is regressed on (1, d, ..., d^p), d = |x - c|,
+with kernel weights w = K(d / h); the discontinuity is the difference of
+the two intercepts. Standard errors are HC1 sandwiches, and the robust
+bias-corrected interval of Calonico, Cattaneo and Titiunik is taken with
+pilot bandwidth b = h, where it reduces to the order p + 1 fit and its own
+variance (so it is centred on that estimate, not on the order p one).
+
+Every quantity a fit needs is a weighted sum Σ w^a d^k y^j over the window
+d ≤ h. Sorting each side by d once makes every window a prefix, and for
+the triangular kernel w = 1 - d/h is itself a polynomial in d, so each sum
+is a combination of prefix sums of d^k y^j. ``rd_sweep`` therefore costs
+one sort plus O(1) per bandwidth: a whole sensitivity curve for about the
+price of one fit. The squared residuals in the sandwich are expanded the
+same way, (y - z'β)² = y² - 2y z'β + (z'β)², so no bandwidth touches the
+data again.
+
+``mse_bandwidth`` is the Imbens–Kalyanaraman (2012) MSE-optimal plug-in
+for the local-linear estimator.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from scipy import stats
+
+KERNELS = ("triangular", "uniform")
+
+# IK constant C_K for the local-linear fit at a boundary point.
+_IK_CONSTANT = {"triangular": 3.4375, "uniform": 5.4}
+
+
+def _prefix_sums(d: np.ndarray, y: np.ndarray, K: int) -> np.ndarray:
+    """(3, K + 1, n + 1) prefix sums of d^k y^j for j = 0, 1, 2, d sorted."""
+    out = np.zeros((3, K + 1, len(d) + 1))
+    dk = np.ones_like(d)
+    for k in range(K + 1):
+        out[0, k, 1:] = np.cumsum(dk)
+        out[1, k, 1:] = np.cumsum(dk * y)
+        out[2, k, 1:] = np.cumsum(dk * y * y)
+        dk = dk * d
+    return out
+
+
+def _window(P: np.ndarray, m: np.ndarray, t: np.ndarray, kernel: str) -> tuple:
+    """Σ w d^k y^j and Σ w² d^k y^j over each window, d in units of t.
+
+    ``m`` counts the points with d ≤ t; returns two (3, K - 1, H) arrays.
+    """
+    K = P.shape[1] - 1
+    raw = P[:, :, m] / t ** np.arange(K + 1)[:, None]
+    if kernel == "uniform":
+        return raw[:, :K - 1], raw[:, :K - 1]
+    w1 = raw[:, :-1] - raw[:, 1:]
+    w2 = raw[:, :-2] - 2 * raw[:, 1:-1] + raw[:, 2:]
+    return w1[:, :K - 1], w2
+
+
+def _side(P: np.ndarray, m: np.ndarray, t: np.ndarray, kernel: str, p: int) -> tuple:
+    """Intercepts and their HC1 variances of the order-p fit, per bandwidth."""
+    S1, S2 = _window(P, m, t, kernel)
+    q = p + 1
+    a = np.arange(q)
+    bread = np.moveaxis(S1[0][a[:, None] + a], -1, 0)         # (H, q, q)
+    rhs = np.moveaxis(S1[1][a], -1, 0)                        # (H, q)
+    ok = m > q
+    bread[~ok] = np.eye(q)
+    beta = np.linalg.solve(bread, rhs[..., None])[..., 0]
+    ab = a[:, None] + a
+    meat = (np.moveaxis(S2[2][ab], -1, 0)
+            - 2 * np.einsum("hc,abch->hab", beta, S2[1][ab[:, :, None] + a])
+            + np.einsum("hc,hd,abcdh->hab", beta, beta,
+                        S2[0][ab[:, :, None, None] + a[:, None] + a]))
+    inv = np.linalg.inv(bread)
+    var = np.einsum("hj,hjk,hk->h", inv[:, 0], meat, inv[:, 0])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = var * m / (m - q)
+    beta0 = np.where(ok, beta[:, 0], np.nan)
+    return beta0, np.where(ok, np.maximum(var, 0.0), np.nan)
+
+
+def rd_sweep(x, y, bandwidths, cutoff: float = 0.0, kernel: str = "triangular",
+             p: int = 1, alpha: float = 0.05) -> dict:
+    """Order-p RD estimates and robust CIs for every bandwidth in ``bandwidths``.
+
+    Treatment is x ≥ cutoff. Returns arrays over the grid: ``h``, ``est``
+    and ``se`` (conventional), ``robust`` and ``robust_se`` (bias-corrected
+    centre and its standard error, b = h), ``lo``/``hi`` (robust 1 - alpha
+    interval) and ``n_left``/``n_right`` (observations in the window).
+    Bandwidths with no more than p + 2 points on a side give NaN.
+    """
+    if kernel not in KERNELS:
+        raise ValueError(f"kernel must be one of {KERNELS}: {kernel!r}")
+    x = np.asarray(x, dtype=float) - cutoff
+    y = np.asarray(y, dtype=float)
+    h = np.atleast_1d(np.asarray(bandwidths, dtype=float))
+    scale = float(np.abs(x).max())
+    t = h / scale
+    K = 4 * (p + 1) + 2
+    fits = {}
+    for name, mask in (("left", x < 0), ("right", x >= 0)):
+        order = np.argsort(-x[mask] if name == "left" else x[mask], kind="stable")
+        d = np.abs(x[mask])[order] / scale
+        P = _prefix_sums(d, y[mask][order], K)
+        m = np.searchsorted(d, t, side="right")
+        fits[name] = (m, _side(P, m, t, kernel, p), _side(P, m, t, kernel, p + 1))
+    (mL, convL, robL), (mR, convR, robR) = fits["left"], fits["right"]
+    z = stats.norm.ppf(1 - alpha / 2)
+    robust = robR[0] - robL[0]
+    robust_se = np.sqrt(robR[1] + robL[1])
+    return {
+        "h": h,
+        "est": convR[0] - convL[0],
+        "se": np.sqrt(convR[1] + convL[1]),
+        "robust": robust,
+        "robust_se": robust_se,
+        "lo": robust - z * robust_se,
+        "hi": robust + z * robust_se,
+        "n_left": mL,
+        "n_right": mR,
+    }
+
+
+def mse_bandwidth(x, y, cutoff: float = 0.0, kernel: str = "triangular") -> float:
+    """Imbens–Kalyanaraman MSE-optimal bandwidth for the local-linear RD."""
+    x = np.asarray(x, dtype=float) - cutoff
+    y = np.asarray(y, dtype=float)
+    N = len(x)
+    left, right = x < 0, x >= 0
+
+    # Step 1: density and conditional variances at the cutoff, uniform pilot.
+    h1 = 1.84 * np.std(x, ddof=1) * N ** -0.2
+    inL, inR = left & (x >= -h1), right & (x <= h1)
+    f = (inL.sum() + inR.sum()) / (2 * N * h1)
+    s2L, s2R = np.var(y[inL], ddof=1), np.var(y[inR], ddof=1)
+
+    # Step 2: third derivative from a global cubic with a jump, between the side medians.
+    mid = (x >= np.median(x[left])) & (x <= np.median(x[right]))
+    xm = x[mid]
+    X = np.column_stack([np.ones(mid.sum()), xm >= 0, xm, xm ** 2, xm ** 3])
+    m3 = 6 * np.linalg.lstsq(X, y[mid], rcond=None)[0][4]
+
+    # Step 3: second derivatives on each side from local quadratics, with regularisation.
+    curv, reg = {}, 0.0
+    for name, side, s2 in (("left", left, s2L), ("right", right, s2R)):
+        h2 = 3.56 * (s2 / (f * m3 ** 2)) ** (1 / 7) * side.sum() ** (-1 / 7)
+        win = side & (np.abs(x) <= h2)
+        xs = x[win]
+        X = np.column_stack([np.ones(win.sum()), xs, xs ** 2])
+        curv[name] = 2 * np.linalg.lstsq(X, y[win], rcond=None)[0][2]
+        reg += 2160 * s2 / (win.sum() * h2 ** 4)
+
+    bias2 = (curv["right"] - curv["left"]) ** 2 + reg
+    return float(_IK_CONSTANT[kernel] * ((s2L + s2R) / (f * bias2)) ** 0.2 * N ** -0.2)
+
+
+def rd_estimate(x, y, h: float | None = None, cutoff: float = 0.0,
+                kernel: str = "triangular", p: int = 1, alpha: float = 0.05) -> dict:
+    """One RD fit at bandwidth ``h`` (default: ``mse_bandwidth``), as scalars."""
+    if h is None:
+        h = mse_bandwidth(x, y, cutoff, kernel)
+    out = rd_sweep(x, y, [h], cutoff, kernel, p, alpha)
+    return {k: (int(v[0]) if k.startswith("n_") else float(v[0])) for k, v in out.items()}
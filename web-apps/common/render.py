@@ -0,0 +1,323 @@
+"""Write a dashboard from its template without holding the page in memory.
+
+A template is split once at its ``{{NAME}}`` placeholders into literal
+parts and slot names. ``render_template`` then streams the parts to the
+output file, filling each slot from a string or an iterable of chunks:
+
+    render_template(TEMPLATE, OUT_FILE, {
+        "DATA_JSON": iter_json(data),
+        "DATA_BUNDLES": bundle_scripts(data, HERE),
+    })
+
+With ``iter_json`` (``common/payload.py``) the payload is serialized one
+top-level section at a time and written as it goes, so a build never holds
+the template, the whole JSON string and the rendered page at once. The file
+is written next to its target and moved into place, so a failed build never
+leaves a half-written dashboard.
+
+The literal parts are minified: comments and indentation are dropped from
+the markup, inline ``<style>`` blocks and inline ``<script>`` code (not
+JSON data blocks, ``<pre>`` or ``<textarea>``). The JavaScript minifier
+only removes comments and whitespace, keeps a line break wherever the
+source had one that could end a statement, and copies strings, template
+literals and regular expressions verbatim. The split template is cached in
+``web-apps/.cache/templates`` under a hash of the template and of this
+module, so a rebuild after a data change does not minify again.
+``METRICSAI_MINIFY=0`` writes the template as is.
+
+Browser code that several dashboards share lives once, in ``common/js/``.
+``shared_js(data, "lod")`` returns the ``<script>`` for a template's
+``{{SHARED_JS}}`` placeholder: ``load.js`` (``loadData(id)``, which parses
+the payload), ``decode.js`` (``decodeTyped``) only if ``data`` holds typed
+arrays or bundle references, then the named files — ``lod.js`` for LTTB
+levels (``common/lttb.py``), ``ols.js`` for ``olsSubset``
+(``common/suffstats.py``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "templates"
+JS_DIR = Path(__file__).resolve().parent / "js"
+
+_PLACEHOLDER = re.compile(r"\{\{([A-Z][A-Z0-9_]*)\}\}")
+_BLOCK = re.compile(
+    r"(<script\b[^>]*>)(.*?)(</script>)|(<style\b[^>]*>)(.*?)(</style>)"
+    r"|<pre\b.*?</pre>|<textarea\b.*?</textarea>",
+    re.S | re.I,
+)
+_JS_TYPE = re.compile(r"""\btype\s*=\s*["']?(?:text/javascript|module)\b""", re.I)
+_HTML_COMMENT = re.compile(r"<!--(?!\[).*?-->", re.S)
+_INDENT = re.compile(r"\n[ \t]+")
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+_IDENT = re.compile(r"[\w$\u0080-\uffff]")
+_WORD = re.compile(r"[\w$\u0080-\uffff]+")
+# A "/" after one of these characters or words starts a regular expression.
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_WORDS = {"return", "typeof", "case", "do", "else", "in", "of", "delete", "void",
+                "throw", "new", "instanceof", "yield", "await"}
+
+
+def _is_ident(ch: str) -> bool:
+    return bool(ch) and _IDENT.match(ch) is not None
+
+
+def minify_js(src: str) -> str:
+    """Drop comments and redundant whitespace from JavaScript source."""
+    out: list[str] = []
+    n = len(src)
+    i = 0
+    gap = ""          # whitespace seen since the last token: "", " " or "\n"
+    last_word = ""    # the previous token, if it was a word, for regex detection
+    braces: list[int] = []   # open "{" count inside each enclosing "${ }"
+
+    def last_char() -> str:
+        return out[-1][-1] if out else ""
+
+    def emit(text: str) -> None:
+        nonlocal gap
+        prev = last_char()
+        if gap and prev:
+            nxt = text[0]
+            if gap == "\n" and prev not in "{;,([" and nxt not in "});,]":
+                out.append("\n")
+            elif ((_is_ident(prev) and _is_ident(nxt)) or (prev == nxt and prev in "+-")
+                  or (prev.isdigit() and nxt == ".")):
+                out.append(" ")
+        gap = ""
+        out.append(text)
+
+    def copy_quoted(start: int, quote: str) -> int:
+        j = start + 1
+        while j < n and src[j] != quote:
+            j += 2 if src[j] == "\\" else 1
+        emit(src[start:j + 1])
+        return j + 1
+
+    def copy_template(start: int) -> int:
+        """Copy template-literal text from ``start`` (just after ` or })."""
+        j = start
+        while j < n:
+            if src[j] == "\\":
+                j += 2
+            elif src[j] == "`":
+                out.append(src[start:j + 1])
+                return j + 1
+            elif src.startswith("${", j):
+                out.append(src[start:j + 2])
+                braces.append(0)
+                return j + 2
+            else:
+                j += 1
+        out.append(src[start:])
+        return n
+
+    while i < n:
+        ch = src[i]
+        if ch in " \t\r\n":
+            if ch == "\n" or gap == "\n":
+                gap = "\n"
+            else:
+                gap = " "
+            i += 1
+            continue
+        if src.startswith("//", i):
+            end = src.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            gap = "\n" if "\n" in src[i:end] or gap == "\n" else (gap or " ")
+            i = end
+            continue
+
+        if _is_ident(ch):
+            last_word = _WORD.match(src, i).group(0)
+            emit(last_word)
+            i += len(last_word)
+            continue
+
+        if ch in "'\"":
+            i = copy_quoted(i, ch)
+            last_word = ""
+            continue
+        if ch == "`":
+            emit("`")
+            i = copy_template(i + 1)
+            last_word = ""
+            continue
+        if ch == "/":
+            prev = last_char()
+            if not prev or prev in _REGEX_AFTER or last_word in _REGEX_WORDS:
+                j, in_class = i + 1, False
+                while j < n and (in_class or src[j] != "/"):
+                    if src[j] == "\\":
+                        j += 1
+                    elif src[j] == "[":
+                        in_class = True
+                    elif src[j] == "]":
+                        in_class = False
+                    j += 1
+                emit(src[i:j + 1])
+                i = j + 1
+                last_word = ""
+                continue
+        if braces:
+            if ch == "{":
+                braces[-1] += 1
+            elif ch == "}":
+                if braces[-1] == 0:
+                    braces.pop()
+                    emit("}")
+                    i = copy_template(i + 1)
+                    continue
+                braces[-1] -= 1
+        emit(ch)
+        last_word = ""
+        i += 1
+    return "".join(out)
+
+
+def minify_css(src: str) -> str:
+    """Drop comments and redundant whitespace from a style sheet."""
+    out: list[str] = []
+    i, n = 0, len(src)
+    gap = False
+    while i < n:
+        ch = src[i]
+        if src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            gap = True
+            continue
+        if ch.isspace():
+            gap = True
+            i += 1
+            continue
+        prev = out[-1][-1] if out else ""
+        if gap and prev and prev not in "{};,>:" and ch not in "{};,>":
+            out.append(" ")
+        gap = False
+        if ch in "'\"":
+            j = i + 1
+            while j < n and src[j] != ch:
+                j += 2 if src[j] == "\\" else 1
+            out.append(src[i:j + 1])
+            i = j + 1
+            continue
+        if ch == "}" and prev == ";":
+            out.pop()
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _minify_markup(html: str) -> str:
+    html = _HTML_COMMENT.sub("", html)
+    return _BLANK_LINES.sub("\n", _INDENT.sub("\n", html))
+
+
+def minify_html(html: str) -> str:
+    """Minify a page's markup and its inline style sheets and scripts."""
+    out, pos = [], 0
+    for m in _BLOCK.finditer(html):
+        out.append(_minify_markup(html[pos:m.start()]))
+        pos = m.end()
+        if m.group(1):
+            open_tag, body = m.group(1), m.group(2)
+            code = "src=" not in open_tag.lower() and (
+                "type" not in open_tag.lower() or _JS_TYPE.search(open_tag))
+            out.append(open_tag + (minify_js(body) if code and not _PLACEHOLDER.search(body) else body)
+                       + m.group(3))
+        elif m.group(4):
+            out.append(m.group(4) + minify_css(m.group(5)) + m.group(6))
+        else:
+            out.append(m.group(0))
+    out.append(_minify_markup(html[pos:]))
+    return "".join(out)
+
+
+def _split(text: str) -> list[str]:
+    """Literal parts at even indices, placeholder names at odd indices."""
+    return _PLACEHOLDER.split(text)
+
+
+def compile_template(template: Path, minify: bool | None = None) -> list[str]:
+    """The template split at its placeholders, minified and cached."""
+    if minify is None:
+        minify = os.environ.get("METRICSAI_MINIFY", "1") != "0"
+    source = template.read_bytes()
+    if not minify:
+        return _split(source.decode("utf-8"))
+    key = hashlib.sha256(source + Path(__file__).read_bytes()).hexdigest()[:16]
+    stem = f"{template.parent.name}-{template.stem}"
+    path = CACHE_DIR / f"{stem}.{key}.json"
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    parts = _split(minify_html(source.decode("utf-8")))
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for old in CACHE_DIR.glob(f"{stem}.*.json"):
+        old.unlink()
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(parts, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+    return parts
+
+
+def _encoded(obj) -> bool:
+    """Whether a payload holds a typed array or a bundle reference."""
+    if isinstance(obj, dict):
+        return "$typed" in obj or "$bundle" in obj or any(_encoded(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_encoded(v) for v in obj)
+    return False
+
+
+def shared_js(data, *names: str, minify: bool | None = None) -> str:
+    """The ``<script>`` of shared browser code for ``{{SHARED_JS}}``."""
+    if minify is None:
+        minify = os.environ.get("METRICSAI_MINIFY", "1") != "0"
+    files = ["load", *(["decode"] if _encoded(data) else []), *names]
+    src = "\n".join((JS_DIR / f"{name}.js").read_text(encoding="utf-8") for name in files)
+    return f"<script>\n{minify_js(src) if minify else src}</script>"
+
+
+def render_template(template: Path, out: Path, slots: dict, minify: bool | None = None) -> None:
+    """Stream ``template`` to ``out`` with each ``{{NAME}}`` filled from ``slots``.
+
+    A slot value is a string or an iterable of strings. Every placeholder in
+    the template needs a slot and every slot a placeholder.
+    """
+    parts = compile_template(template, minify)
+    names = set(parts[1::2])
+    missing = sorted(set(slots) - names)
+    if missing:
+        raise ValueError(f"Placeholder(s) {', '.join('{{' + s + '}}' for s in missing)} "
+                         f"not found in {template.name}")
+    unfilled = sorted(names - set(slots))
+    if unfilled:
+        raise ValueError(f"No value for placeholder(s) {', '.join(unfilled)} in {template.name}")
+    for name in names:
+        if not isinstance(slots[name], str) and parts[1::2].count(name) > 1:
+            slots = {**slots, name: "".join(slots[name])}
+    tmp = out.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            for i, part in enumerate(parts):
+                if i % 2 == 0:
+                    f.write(part)
+                elif isinstance(slots[part], str):
+                    f.write(slots[part])
+                else:
+                    for chunk in slots[part]:
+                        f.write(chunk)
+        os.replace(tmp, out)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,88 @@
+"""Rolling- and expanding-window OLS for many series from running cross-products.
+
+A window's fit needs only its count and the sums Σx, Σy, Σxx', Σxy' and Σy².
+They are kept as running sums. A row enters when the window reaches it and
+leaves w rows later, so each slide is one add and one subtract, O(p² + m·p).
+The whole path therefore costs O(n) in the series length, whatever the
+window. The running sums are taken as differences of prefix sums, computed
+after centring the data on their full-sample means. Without the centring,
+the differences would cancel badly on long series.
+
+Every dependent series shares the regressors, so all m columns of y reuse
+the same Σxx' and its inverse: one batched p × p solve per window.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _prefix(a: np.ndarray) -> np.ndarray:
+    """Prefix sums along axis 0 with a leading zero slice."""
+    out = np.zeros((len(a) + 1,) + a.shape[1:])
+    np.cumsum(a, axis=0, out=out[1:])
+    return out
+
+
+def rolling_ols(x, y, window: int | None = None, min_obs: int | None = None) -> dict:
+    """OLS of every column of y on a constant and x over sliding windows.
+
+    ``x`` is (n,) or (n, p) and ``y`` is (n,) or (n, m). The window for row t
+    ends at t and holds ``window`` rows; ``window=None`` gives expanding
+    windows from the first row. Rows whose window has fewer than ``min_obs``
+    observations are NaN. ``min_obs`` defaults to ``window``, or to p + 2
+    for expanding windows.
+
+    Returns ``nobs`` (n,), ``coef`` and ``se`` (n, [m,] p + 1; intercept
+    first; classical standard errors), ``r2`` and ``rmse`` (n[, m]).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    X = x.reshape(n, -1)
+    Y = y.reshape(n, -1)
+    p = X.shape[1]
+    if min_obs is None:
+        min_obs = window if window is not None else p + 2
+    cx, cy = X.mean(axis=0), Y.mean(axis=0)
+    X, Y = X - cx, Y - cy
+
+    hi = np.arange(1, n + 1)
+    lo = np.zeros(n, dtype=int) if window is None else np.maximum(hi - window, 0)
+    N = (hi - lo).astype(float)
+
+    def window_sums(a):
+        P = _prefix(a)
+        return P[hi] - P[lo]
+
+    Sx = window_sums(X)                                   # (n, p)
+    Sy = window_sums(Y)                                   # (n, m)
+    Sxx = window_sums(X[:, :, None] * X[:, None, :])      # (n, p, p)
+    Sxy = window_sums(X[:, :, None] * Y[:, None, :])      # (n, p, m)
+    Syy = window_sums(Y * Y)                              # (n, m)
+
+    mx, my = Sx / N[:, None], Sy / N[:, None]
+    Cxx = Sxx - N[:, None, None] * mx[:, :, None] * mx[:, None, :]
+    Cxy = Sxy - N[:, None, None] * mx[:, :, None] * my[:, None, :]
+    Cyy = Syy - N[:, None] * my * my
+    ok = N >= max(min_obs, p + 2)
+    Cxx[~ok] = np.eye(p)
+
+    inv = np.linalg.inv(Cxx)
+    b = inv @ Cxy                                         # (n, p, m)
+    rss = np.maximum(Cyy - np.einsum("tpm,tpm->tm", b, Cxy), 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s2 = rss / (N - p - 1)[:, None]
+        r2 = 1 - rss / Cyy
+    xbar = mx + cx
+    intercept = my + cy - np.einsum("tp,tpm->tm", xbar, b)
+    var_a = s2 * (1 / N + np.einsum("tp,tpq,tq->t", xbar, inv, xbar))[:, None]
+    var_b = s2[:, None, :] * np.diagonal(inv, axis1=1, axis2=2)[:, :, None]
+
+    coef = np.concatenate([intercept[:, None, :], b], axis=1).transpose(0, 2, 1)
+    se = np.sqrt(np.concatenate([var_a[:, None, :], var_b], axis=1)).transpose(0, 2, 1)
+    rmse = np.sqrt(s2)
+    coef[~ok], se[~ok], r2[~ok], rmse[~ok] = np.nan, np.nan, np.nan, np.nan
+    if y.ndim == 1:
+        coef, se, r2, rmse = coef[:, 0], se[:, 0], r2[:, 0], rmse[:, 0]
+    return {"nobs": (hi - lo), "coef": coef, "se": se, "r2": r2, "rmse": rmse}
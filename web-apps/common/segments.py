@@ -0,0 +1,98 @@
+"""Payload segments that a dashboard loads only when it needs them.
+
+Some payloads carry a lot of per-item detail of which a user looks at a
+little: ch05 has a 30-point dataset for each of the 41 target correlations
+on its slider, and shows one at a time. ``Segments`` takes that detail out
+of the main payload. Each item is added under a key, and items are grouped
+``chunk`` at a time into numbered segments:
+
+    segs = Segments("synthetic_r", chunk=5)
+    for key, detail in datasets.items():
+        segs.add(key, detail)
+    data["synthetic_r"] = segs.index()   # {"base": ..., "ids": {key: "synthetic_r-0", ...}}
+    render_template(TEMPLATE, OUT_FILE, {..., "DATA_SEGMENTS": segs.render(HERE)})
+
+The segments are written in one of two modes:
+
+- ``inline`` (the default): one ``<script type="application/json"
+  id="seg-models-0">`` per segment. The bytes travel with the page, but
+  they are not parsed until the segment is requested, so start-up cost
+  does not grow with the number of items, and the file stays self-contained.
+- ``fetch``: one ``<out_dir>/segments/models-0.json`` file per segment,
+  fetched over HTTP on first use. The HTML then holds only the index.
+
+The mode comes from ``METRICSAI_SEGMENTS`` unless given. In the browser,
+``loadSegment(index, key)`` (``common/js/segments.js``, shipped with
+``shared_js(data, "segments")``) looks the key up in ``index["ids"]``,
+parses the inline block if there is one and otherwise fetches
+``base + id + ".json"``, once per segment, and resolves to the item.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from .payload import to_json
+
+MODES = ("inline", "fetch")
+
+
+class Segments:
+    """Per-key payload detail, grouped into lazily loaded segments."""
+
+    def __init__(self, name: str, chunk: int = 1):
+        if chunk < 1:
+            raise ValueError(f"chunk must be at least 1: {chunk}")
+        self.name = name
+        self.chunk = chunk
+        self._items: dict = {}
+
+    def add(self, key: str, value) -> None:
+        if key in self._items:
+            raise KeyError(f"Duplicate segment key: {key!r}")
+        self._items[key] = value
+
+    def __getitem__(self, key: str):
+        return self._items[key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _groups(self) -> list[tuple[str, dict]]:
+        keys = list(self._items)
+        return [(f"{self.name}-{i // self.chunk}",
+                 {k: self._items[k] for k in keys[i:i + self.chunk]})
+                for i in range(0, len(keys), self.chunk)]
+
+    def index(self, mode: str | None = None) -> dict:
+        """Key -> segment id map, plus the URL prefix for fetched segments."""
+        mode = _mode(mode)
+        ids = {key: seg_id for seg_id, group in self._groups() for key in group}
+        return {"base": "segments/" if mode == "fetch" else None, "ids": ids}
+
+    def render(self, out_dir: Path, mode: str | None = None) -> str:
+        """Inline ``<script>`` blocks, or write the segment files and return ""."""
+        mode = _mode(mode)
+        seg_dir = Path(out_dir) / "segments"
+        for old in seg_dir.glob(f"{self.name}-*.json") if seg_dir.is_dir() else []:
+            old.unlink()
+        blocks = []
+        for seg_id, group in self._groups():
+            body = to_json(group)
+            if mode == "inline":
+                body = body.replace("</", "<\\/")
+                blocks.append(f'<script type="application/json" id="seg-{seg_id}">{body}</script>')
+            else:
+                seg_dir.mkdir(exist_ok=True)
+                (seg_dir / f"{seg_id}.json").write_text(body, encoding="utf-8")
+        if seg_dir.is_dir() and not any(seg_dir.iterdir()):
+            seg_dir.rmdir()
+        return "\n".join(blocks)
+
+
+def _mode(mode: str | None) -> str:
+    mode = mode or os.environ.get("METRICSAI_SEGMENTS", "inline")
+    if mode not in MODES:
+        raise ValueError(f"segment mode must be one of {MODES}: {mode!r}")
+    return mode
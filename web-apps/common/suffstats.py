@@ -0,0 +1,120 @@
+"""OLS on any subset of regressors from one matrix of cross-products.
+
+Every OLS fit of y on a constant and some of the columns x_1..x_k is a
+function of the means and the centred cross-products C = Z'Z of
+Z = [x_1 - x̄_1, ..., x_k - x̄_k, y - ȳ]. For a subset S the slopes are
+C_SS⁻¹ C_Sy, the intercept is ȳ - x̄_S'β, and RSS = C_yy - β'C_Sy. So
+``cross_products`` is all a dashboard needs to fit every one of the 2^k - 1
+models: a (k + 1) × (k + 1) matrix, whatever the number of models. The
+dashboards ship ``olsSubset`` (``common/js/ols.js``), a JavaScript port of
+``subset_ols``, and solve whichever model a student picks in the browser. HC1 standard errors,
+fitted values and residuals also need the rows themselves, which the
+dashboards already have in their data bundles.
+
+The slopes are solved on centred data, where the intercept is ȳ with
+variance σ²/n and no covariance with the slopes; the covariance of
+(intercept, slopes) is then mapped back with T = [[1, -x̄'], [0, I]].
+Centring keeps C well conditioned where the raw Σxx' would mix prices in
+the hundreds of thousands with counts of bedrooms.
+
+``subset_ols`` is the reference the build scripts check against; it
+matches ``statsmodels`` OLS to rounding. HC1 tests use the t(n - k)
+distribution, as Stata's ``vce(robust)`` and ``statsmodels`` with
+``use_t=True`` do.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from scipy import stats
+
+
+def cross_products(columns, y: str, x: list[str]) -> dict:
+    """Sufficient statistics for OLS of ``y`` on any subset of ``x``.
+
+    ``columns`` maps names to equal-length arrays (a DataFrame works). The
+    values must be the ones the dashboard ships, so that fits from these
+    statistics and from the shipped rows agree. Returns ``y``, ``x``, ``n``,
+    ``mean`` (x then y) and ``cp``, the centred cross-product matrix in the
+    same order.
+    """
+    Z = np.column_stack([np.asarray(columns[c], dtype=float) for c in [*x, y]])
+    mean = Z.mean(axis=0)
+    Zc = Z - mean
+    return {"y": y, "x": list(x), "n": len(Z), "mean": mean, "cp": Zc.T @ Zc}
+
+
+def subset_ols(ss: dict, vars: list[str], columns=None, alpha: float = 0.05) -> dict:
+    """OLS of ``ss["y"]`` on a constant and ``vars``, from ``cross_products``.
+
+    Coefficient arrays are ordered ``["const", *vars]``: ``coef``, ``se``,
+    ``t``, ``p``, ``ci_lo``/``ci_hi`` (1 - alpha), plus ``r2``, ``adj_r2``,
+    ``rss``, ``rmse``, ``aic``, ``bic``, ``f_stat``, ``f_pvalue``, ``n``,
+    ``k`` and ``df_resid``. With ``columns`` (the rows), also ``se_hc1``,
+    ``t_hc1``, ``p_hc1``, ``fitted`` and ``resid``.
+    """
+    names = ss["x"]
+    idx = [names.index(v) for v in vars]
+    yi = len(names)
+    n, p = ss["n"], len(idx)
+    k = p + 1
+    df = n - k
+    C = np.asarray(ss["cp"], dtype=float)
+    mean = np.asarray(ss["mean"], dtype=float)
+
+    inv = np.linalg.inv(C[np.ix_(idx, idx)]) if p else np.zeros((0, 0))
+    sxy = C[idx, yi]
+    syy = C[yi, yi]
+    slope = inv @ sxy
+    xbar = mean[idx]
+    coef = np.r_[mean[yi] - slope @ xbar, slope]
+    rss = float(syy - slope @ sxy)
+    s2 = rss / df
+
+    T = np.eye(k)
+    T[0, 1:] = -xbar
+    bread = np.zeros((k, k))
+    bread[0, 0] = 1 / n
+    bread[1:, 1:] = inv
+    tcrit = stats.t.ppf(1 - alpha / 2, df)
+
+    def inference(cov: np.ndarray) -> tuple:
+        se = np.sqrt(np.diag(T @ cov @ T.T))
+        t = coef / se
+        return se, t, 2 * stats.t.sf(np.abs(t), df)
+
+    se, t, pval = inference(bread * s2)
+    r2 = 1 - rss / syy
+    llf = -n / 2 * (np.log(2 * np.pi) + np.log(rss / n) + 1)
+    f_stat = (syy - rss) / p / s2 if p else np.nan
+    out = {
+        "vars": ["const", *vars],
+        "coef": coef,
+        "se": se,
+        "t": t,
+        "p": pval,
+        "ci_lo": coef - tcrit * se,
+        "ci_hi": coef + tcrit * se,
+        "r2": float(r2),
+        "adj_r2": float(1 - (1 - r2) * (n - 1) / df),
+        "rss": rss,
+        "rmse": float(np.sqrt(s2)),
+        "aic": float(-2 * llf + 2 * k),
+        "bic": float(-2 * llf + k * np.log(n)),
+        "f_stat": float(f_stat),
+        "f_pvalue": float(stats.f.sf(f_stat, p, df)) if p else np.nan,
+        "n": n,
+        "k": k,
+        "df_resid": df,
+    }
+    if columns is not None:
+        Xc = np.column_stack([np.asarray(columns[v], dtype=float) - mean[i]
+                              for v, i in zip(vars, idx)]) if p else np.zeros((n, 0))
+        yc = np.asarray(columns[ss["y"]], dtype=float) - mean[yi]
+        resid = yc - Xc @ slope
+        Zc = np.column_stack([np.ones(n), Xc])
+        meat = (Zc * resid[:, None] ** 2).T @ Zc
+        se_hc1, t_hc1, p_hc1 = inference(bread @ meat @ bread * n / df)
+        out.update(se_hc1=se_hc1, t_hc1=t_hc1, p_hc1=p_hc1,
+                   fitted=np.asarray(columns[ss["y"]], dtype=float) - resid, resid=resid)
+    return out